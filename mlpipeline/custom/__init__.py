@@ -1 +1,2 @@
 from .user_components import ImagePreprocessor, OCRModel2, ExtractionModel, EmptyComponent  # noqa: F401, E501
+from .synthetic_components import SleepComponent, CpuSpinComponent, AllocateComponent, MatmulComponent, ModelLoadComponent  # noqa: F401, E501
@@ -0,0 +1,114 @@
+import abc
+import logging
+import time
+import numpy as np
+from mlpipeline.pipeline import Component
+
+##
+L = logging.getLogger(__name__)
+##
+
+
+class SyntheticComponent(Component):
+    """
+    Configurable load for benchmarking executors. Every output is passed through from the input of the same name,
+    other outputs are set to the result of the load. Cancellable loads get the CancellationToken of the execution.
+    """
+
+    def process(self, inputs: dict, token=None) -> dict:
+        value = self.load() if token is None else self.load(token)
+        outputs = {}
+        for output_key in self.outputs:
+            outputs[output_key] = inputs.get(output_key, value)
+        return outputs
+
+    @abc.abstractmethod
+    def load(self):
+        raise NotImplementedError()
+
+
+class SleepComponent(SyntheticComponent):
+    """Sleeps for `duration` seconds, simulating I/O, wakes up early when the execution is cancelled
+    """
+
+    CANCELLABLE = True
+
+    def __init__(self, component_id: str, component_definition: dict):
+        super().__init__(component_id, component_definition)
+        self.duration = float(component_definition.get("duration", 0.01))
+
+    def load(self, token=None):
+        if token is None:
+            time.sleep(self.duration)
+        elif token.wait(self.duration):
+            token.check()
+        return self.duration
+
+
+class CpuSpinComponent(SyntheticComponent):
+    """Spins in pure Python for `duration` seconds, holding the GIL, stops early when the execution is cancelled
+    """
+
+    CANCELLABLE = True
+
+    def __init__(self, component_id: str, component_definition: dict):
+        super().__init__(component_id, component_definition)
+        self.duration = float(component_definition.get("duration", 0.01))
+
+    def load(self, token=None):
+        iterations = 0
+        end = time.perf_counter() + self.duration
+        while time.perf_counter() < end:
+            iterations += 1
+            if token is not None and iterations % 10000 == 0:
+                token.check()
+        return iterations
+
+
+class AllocateComponent(SyntheticComponent):
+    """Allocates and touches `megabytes` MB of memory
+    """
+
+    def __init__(self, component_id: str, component_definition: dict):
+        super().__init__(component_id, component_definition)
+        self.megabytes = float(component_definition.get("megabytes", 16))
+
+    def load(self):
+        buffer = np.ones(int(self.megabytes * 1024 * 1024), dtype=np.uint8)
+        return int(buffer[::4096].sum())
+
+
+class MatmulComponent(SyntheticComponent):
+    """Multiplies two `size` x `size` matrices `repeat` times, NumPy releases the GIL meanwhile
+    """
+
+    def __init__(self, component_id: str, component_definition: dict):
+        super().__init__(component_id, component_definition)
+        self.size = int(component_definition.get("size", 256))
+        self.repeat = int(component_definition.get("repeat", 1))
+        rng = np.random.default_rng(component_definition.get("seed"))
+        self._matrix = rng.standard_normal((self.size, self.size))
+
+    def load(self):
+        product = self._matrix
+        for _ in range(self.repeat):
+            product = self._matrix @ product
+            product /= np.abs(product).max()
+        return float(product.trace())
+
+
+class ModelLoadComponent(SyntheticComponent):
+    """Sleeps for `setup_duration` seconds when set up, simulating model loading, then passes inputs through
+    """
+
+    def __init__(self, component_id: str, component_definition: dict):
+        super().__init__(component_id, component_definition)
+        self.setup_duration = float(component_definition.get("setup_duration", 0.1))
+        self.model = None
+
+    def setup(self):
+        time.sleep(self.setup_duration)
+        self.model = self.setup_duration
+
+    def load(self):
+        return self.model
@@ -7,14 +7,31 @@ L = logging.getLogger(__name__)
 ##
 
 
-class ImagePreprocessor(Component):
-    RANDOM_VALUES = ["A", "B", "C"]
+class RandomComponent(Component):
+    """Component drawing its outputs from RANDOM_VALUES with its own generator, seeded by the optional `seed` config key
+    """
+
+    RANDOM_VALUES = []
+
+    def __init__(self, component_id: str, component_definition: dict):
+        super().__init__(component_id, component_definition)
+        self.rng = np.random.default_rng(component_definition.get("seed"))
+        self._random_values = np.array(self.RANDOM_VALUES)
+        self._output_keys = sorted(self.outputs)
 
     def process(self, inputs: dict) -> dict:
-        outputs = {}
-        for output_key in self.outputs:
-            outputs[output_key] = np.random.choice(self.RANDOM_VALUES)
-        return outputs
+        return self.process_batch([inputs])[0]
+
+    def process_batch(self, inputs_list: list) -> list:
+        """Draws outputs of all records in one call
+        """
+
+        values = self._random_values[self.rng.integers(len(self._random_values), size=(len(inputs_list), len(self._output_keys)))]
+        return [dict(zip(self._output_keys, row)) for row in values.tolist()]
+
+
+class ImagePreprocessor(RandomComponent):
+    RANDOM_VALUES = ["A", "B", "C"]
 
 
 class OCRModel2(Component):
@@ -28,14 +45,8 @@ class OCRModel2(Component):
         return outputs
 
 
-class ExtractionModel(Component):
-    RANDOM_VALUES = [1, 2, 3]
-
-    def process(self, inputs: dict) -> dict:
-        outputs = {}
-        for output_key in self.outputs:
-            outputs[output_key] = "A" + str(np.random.choice(self.RANDOM_VALUES))
-        return outputs
+class ExtractionModel(RandomComponent):
+    RANDOM_VALUES = ["A1", "A2", "A3"]
 
 
 class EmptyComponent(Component):
@@ -4,3 +4,19 @@ from .pipeline import Pipeline  # noqa: F401
 from .component_abc import ComponentABC  # noqa: F401
 from .config_parser import ConfigParser  # noqa: F401
 from .graph_utils import GraphUtils  # noqa: F401
+from .checkpoint import CheckpointStore, DirectoryCheckpointStore, SqliteCheckpointStore, Serializer, NumpySerializer, PickleSerializer, open_checkpoint_store  # noqa: F401, E501
+from .runtime_history import RuntimeHistory  # noqa: F401
+from .executor import ExecutorABC, SequentialExecutor, ParallelExecutor  # noqa: F401
+from .port_type import PortType, parse_ports  # noqa: F401
+from .builtin_components import SubPipelineOutputs, Router  # noqa: F401
+from .condition import Condition, SKIPPED  # noqa: F401
+from .pipeline_reloader import PipelineReloader  # noqa: F401
+from .trace import TraceRecorder, TraceReplayer  # noqa: F401
+from .worker_pool import PipelineWorkerPool  # noqa: F401
+from .concurrency_controller import ConcurrencyController  # noqa: F401
+from .graph_analysis import GraphAnalysis  # noqa: F401
+from .frozen import FrozenDict, FrozenList, freeze, thaw  # noqa: F401
+from .fusion import FusedComponent, ComponentFuser  # noqa: F401
+from .sink import ColumnarSink, read_columns  # noqa: F401
+from .single_flight import SingleFlight  # noqa: F401
+from .deadline import CancellationToken, Cancelled, DeadlineExceeded  # noqa: F401
@@ -0,0 +1,72 @@
+import logging
+from .component import Component
+from .condition import Condition
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class SubPipelineOutputs(Component):
+    """Collects outputs of a flattened sub-pipeline under the id of the SubPipeline component
+    """
+
+    def process(self, inputs: dict) -> dict:
+        outputs = {}
+        for output_key in self.outputs:
+            outputs[output_key] = inputs[output_key]
+        return outputs
+
+
+class Router(Component):
+    """
+    Switch component. Config key `routes` maps route names to conditions over the local input names,
+    every route is an output set to whether its condition holds. The optional `default` route holds when no other does.
+    Downstream components select a branch with e.g. `when: router.extract`.
+    """
+
+    def __init__(self, component_id: str, component_definition: dict):
+        """
+        Parameters
+        ----------
+        component_id : str
+            name of the component from config
+        component_definition : dict
+            raw info about the component from config
+
+        Raises
+        ------
+        RuntimeError
+            If a route condition references an unknown input
+        """
+
+        routes = component_definition.get("routes") or {}
+        self.routes = {route: Condition(condition) for route, condition in routes.items()}
+        self.default_route = component_definition.get("default")
+
+        outputs = list(self.routes)
+        if self.default_route is not None:
+            outputs.append(self.default_route)
+        super().__init__(component_id, dict(component_definition, outputs=outputs))
+        self.definition = component_definition
+
+        input_names = set(input_key.split(".")[-1] for input_key in self.inputs)
+        for route, condition in self.routes.items():
+            if not condition.inputs <= input_names:
+                raise RuntimeError("Route {} of {} references unknown inputs {}".format(route, component_id, condition.inputs - input_names))
+
+    def process(self, inputs: dict) -> dict:
+        outputs = {}
+        for route, condition in self.routes.items():
+            outputs[route] = condition.evaluate(inputs.__getitem__)
+
+        if self.default_route is not None:
+            outputs[self.default_route] = not any(outputs.values())
+        return outputs
+
+
+BUILTIN_COMPONENTS = {
+    "SubPipelineOutputs": SubPipelineOutputs,
+    "Router": Router,
+}
@@ -0,0 +1,284 @@
+import abc
+import io
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import typing
+import urllib.parse
+import numpy as np
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class Serializer(abc.ABC):
+    """
+    Converts a single output value to and from its stored form. Should be extended
+    """
+
+    name = None
+    suffix = None
+
+    @abc.abstractmethod
+    def can_serialize(self, value) -> bool:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def save(self, value, path: str):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def load(self, path: str):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def to_bytes(self, value) -> bytes:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def from_bytes(self, data: bytes):
+        raise NotImplementedError()
+
+
+class NumpySerializer(Serializer):
+    """Stores NumPy arrays as .npy files and memory-maps them back read-only
+    """
+
+    name = "npy"
+    suffix = ".npy"
+
+    def can_serialize(self, value) -> bool:
+        return isinstance(value, np.ndarray) and value.dtype != object
+
+    def save(self, value, path: str):
+        np.save(path, value, allow_pickle=False)
+
+    def load(self, path: str):
+        return np.load(path, mmap_mode="r", allow_pickle=False)
+
+    def to_bytes(self, value) -> bytes:
+        buffer = io.BytesIO()
+        np.save(buffer, value, allow_pickle=False)
+        return buffer.getvalue()
+
+    def from_bytes(self, data: bytes):
+        return np.load(io.BytesIO(data), allow_pickle=False)
+
+
+class PickleSerializer(Serializer):
+    """Fallback serializer for any picklable value
+    """
+
+    name = "pickle"
+    suffix = ".pkl"
+
+    def can_serialize(self, value) -> bool:
+        return True
+
+    def save(self, value, path: str):
+        with open(path, "wb") as fp:
+            pickle.dump(value, fp, protocol=4)
+
+    def load(self, path: str):
+        with open(path, "rb") as fp:
+            return pickle.load(fp)
+
+    def to_bytes(self, value) -> bytes:
+        return pickle.dumps(value, protocol=4)
+
+    def from_bytes(self, data: bytes):
+        return pickle.loads(data)
+
+
+class CheckpointStore(abc.ABC):
+    """
+    Persists component outputs keyed by run id, component id and input hash. Should be extended
+
+    ...
+
+    Methods
+    -------
+    has(run_id: str, component_id: str, input_hash: str)
+        whether outputs are stored
+    save(run_id: str, component_id: str, input_hash: str, outputs: dict)
+        stores outputs of a finished component, None for components returning nothing
+    load(run_id: str, component_id: str, input_hash: str)
+        loads stored outputs
+    """
+
+    def __init__(self, serializers: typing.Optional[list] = None):
+        """
+        Parameters
+        ----------
+        serializers : list
+            serializers in order of preference, the first one able to handle a value is used
+        """
+
+        if not serializers:
+            serializers = [NumpySerializer(), PickleSerializer()]
+        self._serializers = serializers
+        self._serializers_by_name = {serializer.name: serializer for serializer in serializers}
+
+    def _get_serializer(self, value) -> Serializer:
+        for serializer in self._serializers:
+            if serializer.can_serialize(value):
+                return serializer
+        raise RuntimeError("No serializer for value of type {}".format(type(value).__name__))
+
+    def _get_serializer_by_name(self, name: str) -> Serializer:
+        if name not in self._serializers_by_name:
+            raise RuntimeError("Checkpoint was written with unknown serializer {}".format(name))
+        return self._serializers_by_name[name]
+
+    @abc.abstractmethod
+    def has(self, run_id: str, component_id: str, input_hash: str) -> bool:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def save(self, run_id: str, component_id: str, input_hash: str, outputs: dict):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def load(self, run_id: str, component_id: str, input_hash: str) -> dict:
+        raise NotImplementedError()
+
+
+class DirectoryCheckpointStore(CheckpointStore):
+    """
+    Stores every output value as a separate file under <root>/<run_id>/<component_id>/<input_hash>/.
+    An index file written last marks the checkpoint as complete.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, root: str, serializers: typing.Optional[list] = None):
+        """
+        Parameters
+        ----------
+        root : str
+            checkpoint directory
+        serializers : list
+            serializers in order of preference
+        """
+
+        super().__init__(serializers)
+        self.root = root
+
+    def _get_path(self, run_id: str, component_id: str, input_hash: str) -> str:
+        return os.path.join(
+            self.root,
+            urllib.parse.quote(run_id, safe=""),
+            urllib.parse.quote(component_id, safe=""),
+            input_hash
+        )
+
+    def has(self, run_id: str, component_id: str, input_hash: str) -> bool:
+        return os.path.exists(os.path.join(self._get_path(run_id, component_id, input_hash), self.INDEX_FILE))
+
+    def save(self, run_id: str, component_id: str, input_hash: str, outputs: dict):
+        path = self._get_path(run_id, component_id, input_hash)
+        os.makedirs(path, exist_ok=True)
+
+        index = None if outputs is None else {}
+        for number, (output_key, value) in enumerate((outputs or {}).items()):
+            serializer = self._get_serializer(value)
+            file_name = "{}{}".format(number, serializer.suffix)
+            serializer.save(value, os.path.join(path, file_name))
+            index[output_key] = {"serializer": serializer.name, "file": file_name}
+
+        index_path = os.path.join(path, self.INDEX_FILE)
+        with open(index_path + ".tmp", "w") as fp:
+            json.dump(index, fp)
+        os.replace(index_path + ".tmp", index_path)
+
+    def load(self, run_id: str, component_id: str, input_hash: str) -> dict:
+        path = self._get_path(run_id, component_id, input_hash)
+        with open(os.path.join(path, self.INDEX_FILE)) as fp:
+            index = json.load(fp)
+        if index is None:
+            return None
+
+        outputs = {}
+        for output_key, entry in index.items():
+            serializer = self._get_serializer_by_name(entry["serializer"])
+            outputs[output_key] = serializer.load(os.path.join(path, entry["file"]))
+        return outputs
+
+
+class SqliteCheckpointStore(CheckpointStore):
+    """
+    Stores serialized output values as blobs in a single sqlite database
+    """
+
+    def __init__(self, database_path: str, serializers: typing.Optional[list] = None):
+        """
+        Parameters
+        ----------
+        database_path : str
+            sqlite database file
+        serializers : list
+            serializers in order of preference
+        """
+
+        super().__init__(serializers)
+        self.database_path = database_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "run_id TEXT, component_id TEXT, input_hash TEXT, outputs BLOB, "
+                "PRIMARY KEY (run_id, component_id, input_hash))"
+            )
+
+    def has(self, run_id: str, component_id: str, input_hash: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM checkpoints WHERE run_id = ? AND component_id = ? AND input_hash = ?",
+                (run_id, component_id, input_hash)
+            ).fetchone()
+        return row is not None
+
+    def save(self, run_id: str, component_id: str, input_hash: str, outputs: dict):
+        serialized = None if outputs is None else {}
+        for output_key, value in (outputs or {}).items():
+            serializer = self._get_serializer(value)
+            serialized[output_key] = (serializer.name, serializer.to_bytes(value))
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+                (run_id, component_id, input_hash, pickle.dumps(serialized, protocol=4))
+            )
+
+    def load(self, run_id: str, component_id: str, input_hash: str) -> dict:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT outputs FROM checkpoints WHERE run_id = ? AND component_id = ? AND input_hash = ?",
+                (run_id, component_id, input_hash)
+            ).fetchone()
+        if row is None:
+            raise RuntimeError("No checkpoint for {} in run {}".format(component_id, run_id))
+
+        serialized = pickle.loads(row[0])
+        if serialized is None:
+            return None
+
+        outputs = {}
+        for output_key, (serializer_name, data) in serialized.items():
+            outputs[output_key] = self._get_serializer_by_name(serializer_name).from_bytes(data)
+        return outputs
+
+
+def open_checkpoint_store(path: str) -> CheckpointStore:
+    """Opens sqlite store for .db/.sqlite/.sqlite3 files, directory store otherwise
+    """
+
+    if os.path.splitext(path)[1] in (".db", ".sqlite", ".sqlite3"):
+        return SqliteCheckpointStore(path)
+    return DirectoryCheckpointStore(path)
@@ -1,6 +1,12 @@
 import logging
-from ..utils import get_component_message
+import math
+import threading
+import numpy as np
+from ..utils import get_component_message, get_batch_message, get_inputs_hash
 from .component_abc import ComponentABC
+from .condition import SKIPPED
+from .frozen import freeze
+from .single_flight import SingleFlight
 
 ##
 L = logging.getLogger(__name__)
@@ -18,8 +24,18 @@ class Component(ComponentABC):
     execute(result: dict)
         computes outputs of the processing of components
 
+    execute_batch(results: list)
+        computes outputs for a batch of records
+
     process(inputs: dict)
-        component logic, should be defined
+        component logic, should be defined. Components with CANCELLABLE = True get the CancellationToken
+        of the execution as the second argument and may stop early when it's cancelled
+
+    process_batch(inputs_list: list)
+        batch component logic, calls process for every record by default
+
+    setup()
+        expensive initialization like model loading, runs once before the first call or at build time
     """
 
     def __init__(self, component_id: str, component_definition: dict):
@@ -33,9 +49,14 @@ class Component(ComponentABC):
         """
         super().__init__(component_id, component_definition)
         self.dependencies = self._get_dependencies()
+        self.required_dependencies = self._get_required_dependencies()
+        self._calls = 0
+        self._is_setup = False
+        self._setup_lock = threading.Lock()
+        self.single_flight = SingleFlight()
 
     def _get_dependencies(self) -> set:
-        """Parses inputs and extracts dependencies
+        """Parses inputs and the when condition and extracts dependencies
 
         Returns
         -------
@@ -49,7 +70,7 @@ class Component(ComponentABC):
         """
 
         dependencies = set()
-        for input_ in self.inputs:
+        for input_ in self.inputs | self.get_condition_inputs():
             split_input = input_.split(".")
             if len(split_input) == 1:
                 dependencies.add("inputs")
@@ -59,13 +80,35 @@ class Component(ComponentABC):
                 raise RuntimeError("Incorrect input {}, should be <component_id>.<input_name>".format(input_))
         return dependencies
 
-    def execute(self, result: dict) -> dict:
+    def _get_required_dependencies(self) -> set:
+        """Dependencies whose skip skips the component, inputs with defaults don't require their component
+
+        Returns
+        -------
+        set
+            component ids
+        """
+
+        keys = (self.inputs - set(self.defaults)) | self.get_condition_inputs()
+        return set(key.split(".")[0] if "." in key else "inputs" for key in keys)
+
+    def get_condition_inputs(self) -> set:
+        """Keys referenced by the when condition
+        """
+
+        if self.when is None:
+            return set()
+        return self.when.inputs
+
+    def execute(self, result: dict, token=None) -> dict:
         """Executes pipeline components one by one in topological order.
 
         Parameters
         ----------
         result : dict
             All inputs an outputs from processing
+        token : CancellationToken
+            optional token passed to cancellable components, coalesced calls aren't cancelled by a single caller
 
         Returns
         -------
@@ -73,11 +116,70 @@ class Component(ComponentABC):
             output results
         """
 
+        self.ensure_setup()
         inputs = self._extract_inputs(result)
-        outputs = self.process(inputs)
+        if not self.coalesce:
+            return self._execute_inputs(result, inputs, token)
+
+        try:
+            key = get_inputs_hash(inputs)
+        except Exception:
+            L.debug("Inputs of component {} can't be hashed, the call isn't coalesced".format(self.name))
+            return self._execute_inputs(result, inputs, token)
+
+        # outputs may be shared by several records, so every caller gets read-only views whatever the isolation
+        outputs = self.single_flight.do(key, self._execute_inputs, result, inputs)
+        return {key: freeze(value) for key, value in outputs.items()} if isinstance(outputs, dict) else outputs
+
+    def _execute_inputs(self, result: dict, inputs: dict, token=None) -> dict:
+        check_contracts = self._should_check_contracts()
+        if check_contracts:
+            self._check_contracts({key.split(".")[-1]: port_type for key, port_type in self.input_types.items()}, inputs, "input")
+
+        fingerprints = self._get_fingerprints(result) if self.isolation == "debug" else None
+        outputs = self.process(inputs, token) if token is not None and self.CANCELLABLE else self.process(inputs)
+        if fingerprints is not None:
+            self._check_mutations(result, fingerprints)
+        self._freeze_outputs(outputs)
+        if check_contracts:
+            self._check_contracts(self.output_types, outputs, "output")
         L.info(get_component_message(self.name, self.__class__.__name__, inputs, outputs))
         return outputs
 
+    def execute_batch(self, results: list) -> list:
+        """Executes the component for a batch of records at once
+
+        Parameters
+        ----------
+        results : list
+            All inputs an outputs from processing, one dict per record
+
+        Returns
+        -------
+        list
+            output results, one dict per record
+        """
+
+        self.ensure_setup()
+        inputs_list = [self._extract_inputs(result) for result in results]
+        check_contracts = self._should_check_contracts()
+        if check_contracts:
+            input_types = {key.split(".")[-1]: port_type for key, port_type in self.input_types.items()}
+            for inputs in inputs_list:
+                self._check_contracts(input_types, inputs, "input")
+
+        fingerprints_list = [self._get_fingerprints(result) for result in results] if self.isolation == "debug" else None
+        outputs_list = self.process_batch(inputs_list)
+        if fingerprints_list is not None:
+            for result, fingerprints in zip(results, fingerprints_list):
+                self._check_mutations(result, fingerprints)
+        for outputs in outputs_list:
+            self._freeze_outputs(outputs)
+            if check_contracts:
+                self._check_contracts(self.output_types, outputs, "output")
+        L.info(get_batch_message(self.name, self.__class__.__name__, len(inputs_list)))
+        return outputs_list
+
     def _extract_inputs(self, result: dict) -> dict:
         """Extracts inputs from the previous computation in a proper format
 
@@ -94,20 +196,137 @@ class Component(ComponentABC):
 
         inputs = {}
         for input_key in self.inputs:
-            input_key_split = input_key.split(".")
-            if len(input_key_split) == 1:
-                inputs[input_key_split[0]] = result[input_key_split[0]]
-            else:
-                inputs[input_key_split[1]] = result[input_key_split[0]][input_key_split[1]]
+            value = self._get_input(result, input_key)
+            if input_key in self.input_types:
+                value = self._pass_input(self.input_types[input_key], value)
+            elif self.isolation != "shared":
+                value = freeze(value)
+            inputs[input_key.split(".")[-1]] = value
 
         return inputs
 
+    def _get_input(self, result: dict, input_key: str):
+        input_key_split = input_key.split(".")
+        if len(input_key_split) == 1:
+            return result[input_key_split[0]]
+        if result[input_key_split[0]] is SKIPPED:
+            return self.defaults[input_key]
+        return result[input_key_split[0]][input_key_split[1]]
+
+    def _pass_input(self, port_type, value):
+        """Array inputs declared readonly get a read-only view, the other declared ones a copy only if the upstream array is frozen
+        or the component is isolated from upstream outputs. The copy is made eagerly, NumPy arrays can't be copied on write
+        and a port not declared readonly promises the component may write into the array
+        """
+
+        if port_type.kind != "array" or not isinstance(value, np.ndarray):
+            return value if self.isolation == "shared" else freeze(value)
+
+        if port_type.readonly:
+            return freeze(value)
+
+        if not value.flags.writeable or self.isolation != "shared":
+            return value.copy()
+        return value
+
+    def _get_fingerprints(self, result: dict) -> dict:
+        """Hashes of upstream values the component reads, values that can't be hashed are not checked
+        """
+
+        fingerprints = {}
+        for input_key in self.inputs:
+            try:
+                fingerprints[input_key] = get_inputs_hash({input_key: self._get_input(result, input_key)})
+            except Exception:
+                L.debug("Input {} of component {} can't be hashed, its mutations won't be detected".format(input_key, self.name))
+        return fingerprints
+
+    def _check_mutations(self, result: dict, fingerprints: dict):
+        """Compares upstream values with their hashes taken before processing
+
+        Raises
+        ------
+        RuntimeError
+            If the component mutated an upstream value in place
+        """
+
+        for input_key, fingerprint in fingerprints.items():
+            if get_inputs_hash({input_key: self._get_input(result, input_key)}) != fingerprint:
+                L.error("Component {} mutated input {} in place".format(self.name, input_key))
+                raise RuntimeError("Component {} mutated input {} in place, use thaw() to get a mutable copy".format(self.name, input_key))
+
+    def _freeze_outputs(self, outputs: dict):
+        """Marks array outputs declared readonly as not writeable, so they can be passed downstream without copies
+        """
+
+        for output_key, port_type in self.output_types.items():
+            value = (outputs or {}).get(output_key)
+            if port_type.readonly and isinstance(value, np.ndarray):
+                value.flags.writeable = False
+
+    def _should_check_contracts(self) -> bool:
+        """Samples calls at check_rate, the first call is always checked
+        """
+
+        self._calls += 1
+        return math.ceil(self._calls * self.check_rate) > math.ceil((self._calls - 1) * self.check_rate)
+
+    def _check_contracts(self, port_types: dict, values: dict, direction: str):
+        """Validates payloads against declared port types
+
+        Raises
+        ------
+        RuntimeError
+            If a value doesn't match its type
+        """
+
+        for port_name, port_type in port_types.items():
+            if port_name not in (values or {}):
+                raise RuntimeError("Missing {} {} of component {}".format(direction, port_name, self.name))
+
+            mismatch = port_type.validate(values[port_name])
+            if mismatch is not None:
+                raise RuntimeError("Incorrect {} {} of component {}: {}".format(direction, port_name, self.name, mismatch))
+
+    def setup(self):
+        """Expensive initialization, e.g. model loading. Runs in a build thread, or before the first call for lazy components
+        """
+
+        pass
+
+    def ensure_setup(self):
+        """Runs setup once, concurrent callers wait for it
+        """
+
+        if self._is_setup:
+            return
+
+        with self._setup_lock:
+            if not self._is_setup:
+                self.setup()
+                self._is_setup = True
+
     def process(self, inputs: dict):
         """To be defined
         """
 
         pass
 
+    def process_batch(self, inputs_list: list) -> list:
+        """Processes a batch of records, override with a vectorized implementation where possible
+        """
+
+        return [self.process(inputs) for inputs in inputs_list]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_setup_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup_lock = threading.Lock()
+
     def __str__(self):
         return "name: {}, inputs: {}, outputs: {}".format(self.name, self.inputs, self.outputs)
 
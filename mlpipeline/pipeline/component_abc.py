@@ -1,4 +1,8 @@
 import abc
+import inspect
+from ..utils import parse_resources
+from .condition import Condition
+from .port_type import parse_ports
 
 
 class ComponentABC(abc.ABC):
@@ -6,6 +10,10 @@ class ComponentABC(abc.ABC):
     Generic component class. Should be exetended
     """
 
+    ISOLATION_MODES = ("shared", "readonly", "debug")
+    LAZY = False
+    CANCELLABLE = False
+
     def __init__(self, component_id: str, component_definition: dict):
         """
         Parameters
@@ -17,21 +25,49 @@ class ComponentABC(abc.ABC):
         """
 
         self.name = component_id
+        self.definition = component_definition
+        # key of recorded runtimes and concurrency limits
+        self.runner = self.__class__.__name__
+
+        self.inputs, self.input_types = parse_ports(component_definition.get("inputs"))
+        self.outputs, self.output_types = parse_ports(component_definition.get("outputs"))
+        self.check_rate = float(component_definition.get("check_rate", 1.0))
+
+        self.resources = parse_resources(component_definition.get("resources"))
+        self.source = bool(component_definition.get("source", False))
+        self.fusable = bool(component_definition.get("fusable", False))
+        self.lazy = bool(component_definition.get("lazy", self.LAZY))
+        self.coalesce = bool(component_definition.get("coalesce", False))
 
-        inputs = component_definition.get("inputs")
-        if not inputs:
-            inputs = []
-        self.inputs = set(inputs)
+        self.isolation = component_definition.get("isolation", "shared")
+        if self.isolation not in self.ISOLATION_MODES:
+            raise RuntimeError("Unknown isolation {} of component {}, should be one of {}".format(self.isolation, component_id, self.ISOLATION_MODES))
 
-        outputs = component_definition.get("outputs")
-        if not outputs:
-            outputs = []
-        self.outputs = set(outputs)
+        when = component_definition.get("when")
+        self.when = Condition(when) if when is not None else None
+
+        # input key -> value used when the component providing the input is skipped
+        self.defaults = component_definition.get("defaults") or {}
+        for input_key in self.defaults:
+            if input_key not in self.inputs:
+                raise RuntimeError("Default for {}, which is not an input of component {}".format(input_key, component_id))
 
     @abc.abstractmethod
-    def execute(self, result):
+    def execute(self, result, token=None):
+        """Computes outputs of the component from the result of the upstream components.
+        The optional token is the CancellationToken of the execution, it's passed only if execute accepts it,
+        so components implementing execute(result) keep working when a deadline is set.
+        """
+
         raise NotImplementedError()
 
+    def accepts_token(self) -> bool:
+        """Returns if execute takes the cancellation token
+        """
+
+        parameters = inspect.signature(self.execute).parameters.values()
+        return any(parameter.name == "token" or parameter.kind == parameter.VAR_KEYWORD for parameter in parameters)
+
     @abc.abstractmethod
     def process(self, inputs):
         raise NotImplementedError()
@@ -0,0 +1,176 @@
+import collections
+import logging
+import os
+import threading
+import time
+import typing
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class ConcurrencyController:
+    """
+    Adaptive limit of concurrently running components per runner class (AIMD).
+
+    Every finished call reports its latency. While the latency stays within `tolerance` times the lowest latency
+    seen for the runner and the limit is in use, the limit grows by 1 / limit (one slot per round of calls).
+    When the latency degrades the limit is multiplied by `backoff`. While process CPU utilization is above
+    `cpu_target` limits don't grow, so native threads of models are not oversubscribed.
+
+    ...
+
+    Methods
+    -------
+    acquire(runner: str, blocking: bool, timeout: float)
+        takes a slot of the runner, returns if it was taken
+    release(runner: str, latency: float)
+        returns a slot, updates the limit with the latency of the finished call
+    get_limit(runner: str)
+        returns current limit of the runner
+    get_metrics()
+        returns limits, queue depths, latencies and decisions of all runners
+    """
+
+    def __init__(self, initial: int = 1, minimum: int = 1, maximum: int = 64, tolerance: float = 2.0, backoff: float = 0.9,
+                 cpu_target: typing.Optional[float] = 0.9, alpha: float = 0.3):
+        """
+        Parameters
+        ----------
+        initial : int
+            limit of runners without history
+        minimum : int
+            lowest limit
+        maximum : int
+            highest limit
+        tolerance : float
+            latency over tolerance * lowest latency is treated as overload
+        backoff : float
+            multiplicative decrease of the limit on overload
+        cpu_target : float
+            share of all cpus above which limits don't grow, None to ignore cpu utilization
+        alpha : float
+            weight of the newest latency in the reported average
+        """
+
+        if minimum < 1 or maximum < minimum:
+            raise RuntimeError("Concurrency limits should satisfy 1 <= minimum <= maximum")
+
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.cpu_target = cpu_target
+        self.alpha = alpha
+
+        self._condition = threading.Condition()
+        self._limits = {}
+        self._in_flight = collections.defaultdict(int)
+        self._waiting = collections.defaultdict(int)
+        self._baselines = {}
+        self._latencies = {}
+        self._decisions = {}
+        self._cpu_sample = (time.perf_counter(), time.process_time())
+        self._cpu_utilization = 0.0
+
+    def get_limit(self, runner: str) -> int:
+        return int(self._limits.get(runner, self.initial))
+
+    def acquire(self, runner: str, blocking: bool = True, timeout: typing.Optional[float] = None) -> bool:
+        with self._condition:
+            if self._in_flight[runner] >= self.get_limit(runner):
+                if not blocking:
+                    return False
+                self._waiting[runner] += 1
+                try:
+                    if not self._condition.wait_for(lambda: self._in_flight[runner] < self.get_limit(runner), timeout):
+                        return False
+                finally:
+                    self._waiting[runner] -= 1
+            self._in_flight[runner] += 1
+            return True
+
+    def release(self, runner: str, latency: typing.Optional[float] = None):
+        """Returns a slot of the runner
+
+        Parameters
+        ----------
+        runner : str
+            runner class name
+        latency : float
+            seconds the call took including queueing, None if it didn't finish normally
+        """
+
+        with self._condition:
+            saturated = self._in_flight[runner] >= self.get_limit(runner)
+            self._in_flight[runner] -= 1
+            if latency is not None:
+                self._update(runner, latency, saturated)
+            self._condition.notify_all()
+
+    def _sample_cpu(self) -> float:
+        now, cpu_time = time.perf_counter(), time.process_time()
+        start, start_cpu_time = self._cpu_sample
+        if now - start >= 0.1:
+            self._cpu_utilization = (cpu_time - start_cpu_time) / ((now - start) * (os.cpu_count() or 1))
+            self._cpu_sample = (now, cpu_time)
+        return self._cpu_utilization
+
+    def _update(self, runner: str, latency: float, saturated: bool):
+        baseline = min(latency, self._baselines.get(runner, latency))
+        self._baselines[runner] = baseline
+        self._latencies[runner] = latency if runner not in self._latencies else self.alpha * latency + (1 - self.alpha) * self._latencies[runner]
+
+        limit = self._limits.get(runner, float(self.initial))
+        decisions = self._decisions.setdefault(runner, {"increases": 0, "decreases": 0})
+        if latency > self.tolerance * baseline:
+            new_limit = max(float(self.minimum), limit * self.backoff)
+            decisions["decreases"] += 1
+        elif saturated and (self.cpu_target is None or self._sample_cpu() <= self.cpu_target):
+            new_limit = min(float(self.maximum), limit + 1.0 / limit)
+            decisions["increases"] += 1
+        else:
+            new_limit = limit
+        self._limits[runner] = new_limit
+
+        if int(new_limit) != int(limit):
+            L.debug("Concurrency limit of {} changed to {} (latency {:.6f}s, baseline {:.6f}s)".format(runner, int(new_limit), latency, baseline))
+
+    def get_metrics(self) -> dict:
+        """Current state and decisions of the controller
+
+        Returns
+        -------
+        dict
+            {"cpu_utilization": share, "runners": {runner: {"limit", "in_flight", "waiting", "latency", "baseline", "increases", "decreases"}}}
+        """
+
+        with self._condition:
+            runners = set(self._limits) | set(self._in_flight) | set(self._waiting)
+            return {
+                "cpu_utilization": self._cpu_utilization,
+                "runners": {
+                    runner: {
+                        "limit": self.get_limit(runner),
+                        "in_flight": self._in_flight[runner],
+                        "waiting": self._waiting[runner],
+                        "latency": self._latencies.get(runner),
+                        "baseline": self._baselines.get(runner),
+                        "increases": self._decisions.get(runner, {}).get("increases", 0),
+                        "decreases": self._decisions.get(runner, {}).get("decreases", 0),
+                    }
+                    for runner in sorted(runners)
+                },
+            }
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_condition"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._condition = threading.Condition()
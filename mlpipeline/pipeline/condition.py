@@ -0,0 +1,84 @@
+import operator
+import typing
+
+
+class Skipped:
+    """Marker stored in the result instead of outputs of a skipped component
+    """
+
+    def __repr__(self):
+        return "SKIPPED"
+
+
+SKIPPED = Skipped()
+
+
+class Condition:
+    """
+    Predicate over inputs or upstream outputs, parsed from config.
+
+    A condition is either a key (true when the value is truthy), a mapping with the key under "input"
+    and at most one operator, e.g. {"input": "classifier.label", "in": ["A", "B"]}, or a list of conditions which must all hold.
+
+    ...
+
+    Methods
+    -------
+    evaluate(get_value: callable)
+        returns if the condition holds, get_value(key) returns the value of a key
+    """
+
+    OPERATORS = {
+        "equals": operator.eq,
+        "not_equals": operator.ne,
+        "in": lambda value, operand: value in operand,
+        "not_in": lambda value, operand: value not in operand,
+        "gt": operator.gt,
+        "ge": operator.ge,
+        "lt": operator.lt,
+        "le": operator.le,
+    }
+
+    def __init__(self, definition):
+        """
+        Parameters
+        ----------
+        definition : str, dict or list
+            raw condition from config
+
+        Raises
+        ------
+        RuntimeError
+            If the condition is malformed
+        """
+
+        definitions = definition if isinstance(definition, list) else [definition]
+        self.clauses = [self._parse_clause(clause) for clause in definitions]
+        self.inputs = set(key for key, _, _ in self.clauses)
+
+    def _parse_clause(self, clause) -> tuple:
+        if isinstance(clause, str):
+            return clause, None, None
+
+        if not isinstance(clause, dict) or "input" not in clause:
+            raise RuntimeError("Incorrect condition {}, should be <input> or {{input: <input>, <operator>: <value>}}".format(clause))
+
+        operators = [key for key in clause if key != "input"]
+        if len(operators) > 1 or (operators and operators[0] not in self.OPERATORS):
+            raise RuntimeError("Incorrect condition {}, should have one operator of {}".format(clause, list(self.OPERATORS)))
+
+        if not operators:
+            return clause["input"], None, None
+        return clause["input"], operators[0], clause[operators[0]]
+
+    def evaluate(self, get_value: typing.Callable) -> bool:
+        for key, operator_name, operand in self.clauses:
+            value = get_value(key)
+            if operator_name is None:
+                holds = bool(value)
+            else:
+                holds = self.OPERATORS[operator_name](value, operand)
+
+            if not holds:
+                return False
+        return True
@@ -1,8 +1,14 @@
+import concurrent.futures
 import importlib
 import logging
+import os
+import threading
 import typing
 import yaml
+from .builtin_components import BUILTIN_COMPONENTS
 from .component import Component
+from .graph_utils import GraphUtils
+from .port_type import parse_ports
 
 ##
 L = logging.getLogger(__name__)
@@ -19,9 +25,30 @@ class ConfigParser:
     Methods
     -------
     parse_config(config_path: str, components_module: str)
-        returns name, inputs, outsputs, components for the pipeline
+        returns name, inputs, outsputs and components for the pipeline, output defaults are stored in `defaults`
     """
 
+    SUB_PIPELINE_RUNNER = "SubPipeline"
+    NAMESPACE_SEPARATOR = "/"
+
+    def __init__(self, sub_pipeline_cache: typing.Optional[dict] = None, max_workers: typing.Optional[int] = None):
+        """
+        Parameters
+        ----------
+        sub_pipeline_cache : dict
+            validated sub-pipeline configs by path with modification times of all files they were read from,
+            shared between parsers to build every embedded config once
+        max_workers : int
+            number of threads constructing components, ThreadPoolExecutor default if not given
+        """
+
+        self._max_workers = max_workers
+        self._sub_pipeline_cache = sub_pipeline_cache if sub_pipeline_cache is not None else {}
+        self._sub_pipeline_lock = threading.Lock()
+        self._loading = []
+        self._dependencies = []
+        self.defaults = {}
+
     def _read_config(self, config_path: str) -> dict:
         """ Reads config yaml file and creates a dictionary
 
@@ -39,13 +66,15 @@ class ConfigParser:
         with open(config_path) as fp:
             return yaml.safe_load(fp)
 
-    def _parse_components(self, components_definition: dict, components_module: str) -> dict:
-        """Creates componenents from configuration.
+    def _parse_components(self, components_definition: dict, components_module: str, reusable_components: typing.Optional[dict] = None) -> dict:
+        """Creates componenents from configuration, constructors run concurrently in a thread pool.
 
         Parameters
         ----------
         components_definition : dict
             A dictionary with raw components info from configuration
+        reusable_components : dict
+            Already built components, reused when their definition didn't change
 
         Returns
         -------
@@ -53,11 +82,24 @@ class ConfigParser:
             component_id -> component
         """
 
+        reusable_components = reusable_components or {}
+        importlib.import_module(components_module)
+
         components = {}
-        for component_name in components_definition:
-            components[component_name] = self._build_component(component_name, components_definition[component_name], components_module)
+        with concurrent.futures.ThreadPoolExecutor(self._max_workers, thread_name_prefix="build") as pool:
+            futures = {}
+            for component_name, component_definition in components_definition.items():
+                reusable = reusable_components.get(component_name)
+                if reusable is not None and reusable.definition == component_definition:
+                    components[component_name] = reusable
+                else:
+                    futures[component_name] = pool.submit(self._build_component, component_name, component_definition, components_module)
+
+            for component_name in components_definition:
+                if component_name in futures:
+                    components[component_name] = futures[component_name].result()
 
-        return components
+        return {component_name: components[component_name] for component_name in components_definition}
 
     def _build_component(self, component_name: str, component_definition: dict, components_module: str) -> Component:
         """Creates single component from its" configuration.
@@ -76,7 +118,11 @@ class ConfigParser:
         """
 
         module = importlib.import_module(components_module)
-        component_class = getattr(module, component_definition["runner"])
+        runner = component_definition["runner"]
+        if hasattr(module, runner):
+            component_class = getattr(module, runner)
+        else:
+            component_class = BUILTIN_COMPONENTS[runner]
         return component_class.construct(component_name, component_definition)
 
     def _verify_inputs(self, inputs: set) -> bool:
@@ -98,8 +144,9 @@ class ConfigParser:
                 return False
         return True
 
-    def parse_config(self, config_path: str, components_module: str) -> typing.Tuple[str, set, set, dict]:
-        """Parses the config
+    def parse_config(self, config_path: str, components_module: str,
+                     reusable_components: typing.Optional[dict] = None) -> typing.Tuple[str, set, set, dict]:
+        """Parses the config, output defaults used when their component is skipped are stored in `defaults`
 
         Parameters
         ----------
@@ -107,6 +154,8 @@ class ConfigParser:
             Path to yaml config
         components_module : str
             Module where user defined components are stored
+        reusable_components : dict
+            Already built components, reused when their definition didn't change
 
         Returns
         -------
@@ -118,6 +167,72 @@ class ConfigParser:
             outputs
         dict
             componets
+
+        Raises
+        ------
+        RuntimeError
+            If inputs are incorrect or an output that may be skipped has no default
+        """
+
+        name, inputs, outputs, components_definintion, defaults = self._read_pipeline_config(config_path)
+        components = self._parse_components(components_definintion, components_module, reusable_components)
+
+        if not self._verify_inputs(inputs):
+            L.error("Incorrect inputs, shutting down")
+            raise RuntimeError("Incorrect inputs")
+
+        self._verify_defaults(outputs, components, defaults)
+        self.defaults = defaults
+        return name, inputs, outputs, components
+
+    def _verify_defaults(self, outputs: set, components: dict, defaults: dict):
+        """Verifies that every output of a component which may be skipped (it has a when condition or requires one which has) has a default
+
+        Raises
+        ------
+        RuntimeError
+            If such an output has no default
+        """
+
+        skippable = set(component_id for component_id, component in components.items() if component.when is not None)
+        changed = True
+        while changed:
+            changed = False
+            for component_id, component in components.items():
+                if component_id not in skippable and component.required_dependencies & skippable:
+                    skippable.add(component_id)
+                    changed = True
+
+        for output_key in sorted(outputs):
+            if output_key.split(".")[0] in skippable and "." in output_key and output_key not in defaults:
+                L.error("Missing default, shutting down")
+                raise RuntimeError("Output {} may be skipped and needs a default".format(output_key))
+
+    def _read_pipeline_config(self, config_path: str) -> typing.Tuple[str, set, set, dict, dict]:
+        """Reads the config and flattens embedded sub-pipelines
+
+        Parameters
+        ----------
+        config_path : str
+            Path to yaml config
+
+        Returns
+        -------
+        str
+            name
+        set
+            inputs
+        set
+            outputs
+        dict
+            raw components info
+        dict
+            output defaults
+
+        Raises
+        ------
+        RuntimeError
+            If the name or components are missing or defaults are given for unknown outputs
         """
 
         config = self._read_config(config_path)["pipeline"]
@@ -142,11 +257,194 @@ class ConfigParser:
             L.error("No components, shutting down")
             raise RuntimeError("There are no components specified in config")
 
-        components_definintion = config["components"]
-        components = self._parse_components(components_definintion, components_module)
+        defaults = config.get("defaults") or {}
+        for output_key in defaults:
+            if output_key not in outputs:
+                L.error("Incorrect defaults, shutting down")
+                raise RuntimeError("Default for {}, which is not a pipeline output".format(output_key))
+
+        components_definintion = self._expand_sub_pipelines(config["components"], os.path.dirname(config_path))
+        return name, inputs, outputs, components_definintion, defaults
+
+    def _expand_sub_pipelines(self, components_definition: dict, config_dir: str) -> dict:
+        """Replaces every SubPipeline component with the namespaced components of the embedded config.
+        The component id itself is kept for a SubPipelineOutputs component collecting the embedded pipeline outputs,
+        it takes the embedded defaults for outputs of skipped embedded components.
+        A when condition of the SubPipeline component is added to the conditions of the embedded components and the collector.
+
+        Parameters
+        ----------
+        components_definition : dict
+            A dictionary with raw components info from configuration
+        config_dir : str
+            Directory of the config, relative sub-pipeline paths are resolved against it
+
+        Returns
+        -------
+        dict
+            raw components info without sub-pipelines
+
+        Raises
+        ------
+        RuntimeError
+            If a sub-pipeline input is not bound or an output is not provided by the embedded config
+        """
+
+        expanded = {}
+        for component_name, component_definition in components_definition.items():
+            if component_definition.get("runner") != self.SUB_PIPELINE_RUNNER:
+                expanded[component_name] = component_definition
+                continue
+
+            if "config" not in component_definition:
+                raise RuntimeError("Sub-pipeline {} has no config specified".format(component_name))
+
+            sub_config_path = os.path.join(config_dir, component_definition["config"])
+            sub_inputs, sub_outputs, sub_definitions, sub_defaults = self._load_sub_pipeline(sub_config_path)
+
+            bindings = {}
+            for input_key in parse_ports(component_definition.get("inputs"))[0]:
+                local_name = input_key.split(".")[-1]
+                if local_name in bindings:
+                    raise RuntimeError("Sub-pipeline {} input {} is bound twice".format(component_name, local_name))
+                bindings[local_name] = input_key
+
+            for sub_input in sub_inputs:
+                if sub_input not in bindings:
+                    raise RuntimeError("Sub-pipeline {} input {} is not bound".format(component_name, sub_input))
+
+            when = component_definition.get("when")
+            prefix = component_name + self.NAMESPACE_SEPARATOR
+            for sub_name, sub_definition in sub_definitions.items():
+                sub_definition = dict(sub_definition)
+                sub_definition["inputs"] = [self._rebind_port(port, prefix, bindings) for port in (sub_definition.get("inputs") or [])]
+                if sub_definition.get("when") is not None:
+                    sub_definition["when"] = self._rebind_condition(sub_definition["when"], prefix, bindings)
+                if when is not None:
+                    sub_definition["when"] = self._merge_conditions(when, sub_definition.get("when"))
+                expanded[prefix + sub_name] = sub_definition
+
+            collected = {}
+            defaults = {}
+            for sub_output in sub_outputs:
+                local_name = sub_output.split(".")[-1]
+                if local_name in collected:
+                    raise RuntimeError("Sub-pipeline {} has two outputs named {}".format(component_name, local_name))
+                collected[local_name] = self._rebind_key(sub_output, prefix, bindings)
+                if sub_output in sub_defaults:
+                    defaults[collected[local_name]] = sub_defaults[sub_output]
+
+            declared_outputs = parse_ports(component_definition.get("outputs"))[0] or set(collected)
+            for output in declared_outputs:
+                if output not in collected:
+                    raise RuntimeError("Sub-pipeline {} doesn't provide output {}".format(component_name, output))
+
+            expanded[component_name] = {
+                "runner": "SubPipelineOutputs",
+                "inputs": [collected[output] for output in sorted(declared_outputs)],
+                "outputs": sorted(declared_outputs),
+                "defaults": {collected[output]: defaults[collected[output]] for output in declared_outputs if collected[output] in defaults},
+            }
+            if when is not None:
+                expanded[component_name]["when"] = when
+
+        return expanded
+
+    def _rebind_key(self, key: str, prefix: str, bindings: dict) -> str:
+        if len(key.split(".")) == 1:
+            return bindings[key]
+        return prefix + key
+
+    def _rebind_port(self, port, prefix: str, bindings: dict):
+        if isinstance(port, dict):
+            return {self._rebind_key(key, prefix, bindings): definition for key, definition in port.items()}
+        return self._rebind_key(port, prefix, bindings)
+
+    def _rebind_condition(self, condition, prefix: str, bindings: dict):
+        if isinstance(condition, list):
+            return [self._rebind_condition(clause, prefix, bindings) for clause in condition]
+        if isinstance(condition, dict):
+            return dict(condition, input=self._rebind_key(condition["input"], prefix, bindings))
+        return self._rebind_key(condition, prefix, bindings)
+
+    def _merge_conditions(self, condition, other):
+        """Condition holding when both hold, conditions are lists of clauses which must all hold
+        """
+
+        if other is None:
+            return condition
+        return (condition if isinstance(condition, list) else [condition]) + (other if isinstance(other, list) else [other])
+
+    def _load_sub_pipeline(self, config_path: str) -> typing.Tuple[set, set, dict, dict]:
+        """Reads and validates an embedded config. The result is cached by path and reused while modification times
+        of the config and of all configs it embeds, directly or transitively, don't change
+
+        Parameters
+        ----------
+        config_path : str
+            Path to yaml config
+
+        Returns
+        -------
+        set
+            inputs
+        set
+            outputs
+        dict
+            raw components info without sub-pipelines
+        dict
+            output defaults
+
+        Raises
+        ------
+        RuntimeError
+            If configs embed each other or an output that may be skipped has no default
+        """
+
+        config_path = os.path.abspath(config_path)
+        with self._sub_pipeline_lock:
+            cached = self._sub_pipeline_cache.get(config_path)
+        if cached is not None and self._is_fresh(cached[0]):
+            self._add_dependencies(cached[0])
+            return cached[1:]
+
+        if config_path in self._loading:
+            L.error("Circular sub-pipelines, shutting down")
+            raise RuntimeError("Sub-pipeline {} embeds itself".format(config_path))
+
+        self._loading.append(config_path)
+        self._dependencies.append({config_path: os.path.getmtime(config_path)})
+        try:
+            _, inputs, outputs, components_definition, defaults = self._read_pipeline_config(config_path)
+        finally:
+            self._loading.pop()
+            mtimes = self._dependencies.pop()
 
         if not self._verify_inputs(inputs):
-            L.error("Incorrect inputs, shutting down")
-            raise RuntimeError("Incorrect inputs")
+            L.error("Incorrect sub-pipeline inputs, shutting down")
+            raise RuntimeError("Incorrect inputs of sub-pipeline {}".format(config_path))
 
-        return name, inputs, outputs, components
+        # user components aren't constructed here, builtin ones like Router derive their ports from the definition
+        components = {}
+        for name, definition in components_definition.items():
+            components[name] = BUILTIN_COMPONENTS.get(definition.get("runner"), Component)(name, definition)
+        GraphUtils().get_running_order(components, inputs, outputs)
+        self._verify_defaults(outputs, components, defaults)
+
+        with self._sub_pipeline_lock:
+            self._sub_pipeline_cache[config_path] = (mtimes, inputs, outputs, components_definition, defaults)
+        self._add_dependencies(mtimes)
+        return inputs, outputs, components_definition, defaults
+
+    def _is_fresh(self, mtimes: dict) -> bool:
+        for path, mtime in mtimes.items():
+            if not os.path.exists(path) or os.path.getmtime(path) != mtime:
+                return False
+        return True
+
+    def _add_dependencies(self, mtimes: dict):
+        """Records files of an embedded config for the config being loaded, which depends on them as well
+        """
+
+        if self._dependencies:
+            self._dependencies[-1].update(mtimes)
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+import typing
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class Cancelled(RuntimeError):
+    """Execution was cancelled by the caller
+    """
+
+
+class DeadlineExceeded(Cancelled):
+    """Deadline of the execution passed, or the predicted remaining work doesn't fit into the remaining budget
+    """
+
+
+class CancellationToken:
+    """
+    Deadline and cancellation flag of one execution. Executors check it between components and abandon
+    the components not started yet, components with CANCELLABLE = True receive it in process and may stop early.
+
+    With `shed` executors also give up as soon as the predicted duration of the remaining critical path
+    (from the runtime history) exceeds the remaining budget, instead of spending capacity on a result that comes too late.
+
+    ...
+
+    Methods
+    -------
+    cancel()
+        cancels the execution
+    get_remaining()
+        returns seconds until the deadline
+    is_cancelled()
+        returns if the execution was cancelled or its deadline passed
+    check(predicted: float)
+        raises if the execution was cancelled or can't finish in time
+    wait(timeout: float)
+        sleeps until the timeout, the deadline or cancellation
+    """
+
+    def __init__(self, timeout: typing.Optional[float] = None, shed: bool = True):
+        """
+        Parameters
+        ----------
+        timeout : float
+            budget in seconds from now, no deadline by default
+        shed : bool
+            give up early when the predicted remaining work exceeds the remaining budget
+        """
+
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.shed = shed
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def get_remaining(self) -> typing.Optional[float]:
+        """Seconds until the deadline, None without deadline
+        """
+
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def is_cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        remaining = self.get_remaining()
+        return remaining is not None and remaining <= 0.0
+
+    def check(self, predicted: float = 0.0):
+        """Raises if the execution was cancelled, its deadline passed or it's predicted to miss the deadline
+
+        Parameters
+        ----------
+        predicted : float
+            expected seconds of the remaining work
+
+        Raises
+        ------
+        Cancelled
+            If cancelled
+        DeadlineExceeded
+            If the deadline passed or the predicted work exceeds the remaining budget with shedding
+        """
+
+        if self._event.is_set():
+            raise Cancelled("Execution was cancelled")
+
+        remaining = self.get_remaining()
+        if remaining is None:
+            return
+        if remaining <= 0.0:
+            raise DeadlineExceeded("Deadline exceeded by {:.3f}s".format(-remaining))
+        if self.shed and predicted > remaining:
+            raise DeadlineExceeded("Shedding, predicted {:.3f}s of remaining work exceeds the remaining {:.3f}s".format(predicted, remaining))
+
+    def wait(self, timeout: float) -> bool:
+        """Sleeps for timeout seconds unless the execution is cancelled or its deadline passes sooner
+
+        Returns
+        -------
+        bool
+            if the execution was cancelled or its deadline passed
+        """
+
+        remaining = self.get_remaining()
+        if remaining is not None:
+            timeout = min(timeout, max(remaining, 0.0))
+        self._event.wait(timeout)
+        return self.is_cancelled()
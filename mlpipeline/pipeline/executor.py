@@ -0,0 +1,276 @@
+import abc
+import concurrent.futures
+import logging
+import os
+import time
+import typing
+from ..utils import parse_resources
+from .concurrency_controller import ConcurrencyController
+from .condition import SKIPPED
+from .deadline import CancellationToken
+from .runtime_history import RuntimeHistory
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class ExecutorABC(abc.ABC):
+    """
+    Decides when components are executed. Should be extended
+
+    ...
+
+    Methods
+    -------
+    run(components: dict, running_order: list, run_component: callable, token: CancellationToken)
+        runs all components, run_component(component_id) executes one of them, stores and returns its result.
+        Components not started yet are abandoned once the token is cancelled or can't meet its deadline
+    """
+
+    def __init__(self, runtime_history: typing.Optional[RuntimeHistory] = None):
+        """
+        Parameters
+        ----------
+        runtime_history : RuntimeHistory
+            optional history updated with measured durations
+        """
+
+        self.runtime_history = runtime_history
+
+    @abc.abstractmethod
+    def run(self, components: dict, running_order: list, run_component: typing.Callable, token: typing.Optional[CancellationToken] = None):
+        raise NotImplementedError()
+
+    def _get_expected(self, component) -> float:
+        """Expected duration of a component for load shedding, runners without recorded runtime aren't counted
+        """
+
+        runner = component.runner
+        if self.runtime_history is None or runner not in self.runtime_history:
+            return 0.0
+        return self.runtime_history.get(runner)
+
+    def _run_timed(self, component, component_id: str, run_component: typing.Callable) -> typing.Optional[float]:
+        """Runs a component and records its duration under its runner (class name, member runners of fused units),
+        skipped components are not recorded. When run_component executes a batch (returns a list of outputs) the duration
+        per record is recorded, so batches don't skew expected durations of single records
+
+        Returns
+        -------
+        float
+            duration in seconds, None for skipped components
+        """
+
+        start = time.perf_counter()
+        outputs = run_component(component_id)
+        if outputs is SKIPPED:
+            return None
+
+        duration = time.perf_counter() - start
+        if self.runtime_history is not None:
+            records = len(outputs) if isinstance(outputs, list) and outputs else 1
+            self.runtime_history.update(component.runner, duration / records)
+        return duration
+
+
+class SequentialExecutor(ExecutorABC):
+    """
+    Executes components one by one in topological order
+    """
+
+    def run(self, components: dict, running_order: list, run_component: typing.Callable, token: typing.Optional[CancellationToken] = None):
+        remaining_work = sum(self._get_expected(components[component_id]) for component_id in running_order) if token is not None else 0.0
+        for component_id in running_order:
+            if token is not None:
+                token.check(remaining_work)
+                remaining_work -= self._get_expected(components[component_id])
+            self._run_timed(components[component_id], component_id, run_component)
+
+        # the last component may have overrun the deadline
+        if token is not None:
+            token.check()
+
+
+class ParallelExecutor(ExecutorABC):
+    """
+    List scheduler running ready components in a thread pool.
+
+    With the "priority" policy ready components are started in order of their upward rank
+    (expected duration of the longest path to the end of the graph, HEFT-style), so the critical path starts first.
+    The "fifo" policy starts them in running order. A component is only started when its resource tags fit
+    into the remaining capacity, components without tags are only limited by the number of workers.
+    With a ConcurrencyController components are also limited by the adaptive limit of their runner class,
+    which may be shared with other executors and pipelines.
+    With a CancellationToken no component is started once it's cancelled, its deadline passed or the longest expected
+    path from a ready component exceeds the remaining budget; components still queued in the pool are cancelled
+    and the running ones are left to finish in background (or stop early if they are cancellable).
+    """
+
+    POLICIES = ("priority", "fifo")
+
+    def __init__(self, max_workers: typing.Optional[int] = None, capacity: typing.Optional[dict] = None,
+                 runtime_history: typing.Optional[RuntimeHistory] = None, policy: str = "priority",
+                 controller: typing.Optional[ConcurrencyController] = None):
+        """
+        Parameters
+        ----------
+        max_workers : int
+            number of threads, cpu count by default
+        capacity : dict
+            available resources like {"cpu": 8, "memory": "16G"}, cpu count and physical memory by default
+        runtime_history : RuntimeHistory
+            expected durations used for priorities, updated with measured ones
+        policy : str
+            "priority" or "fifo"
+        controller : ConcurrencyController
+            optional adaptive limit of concurrently running components per runner class
+        """
+
+        if runtime_history is None:
+            runtime_history = RuntimeHistory()
+        super().__init__(runtime_history)
+
+        if policy not in self.POLICIES:
+            raise RuntimeError("Unknown scheduling policy {}, should be one of {}".format(policy, self.POLICIES))
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.capacity = parse_resources(capacity) if capacity is not None else self._get_default_capacity()
+        self.policy = policy
+        self.controller = controller
+
+    def _get_default_capacity(self) -> dict:
+        capacity = {"cpu": float(os.cpu_count() or 1)}
+        try:
+            capacity["memory"] = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (AttributeError, ValueError, OSError):
+            pass
+        return capacity
+
+    def _get_successors(self, components: dict) -> dict:
+        successors = {component_id: set() for component_id in components}
+        for component_id, component in components.items():
+            for dependency in component.dependencies:
+                if dependency in successors:
+                    successors[dependency].add(component_id)
+        return successors
+
+    def get_priorities(self, components: dict, running_order: list) -> dict:
+        """Computes upward rank of every component
+
+        Parameters
+        ----------
+        components : dict
+            all components component_id -> component
+        running_order : list
+            component ids in topological order
+
+        Returns
+        -------
+        dict
+            component_id -> expected duration of the longest path starting with the component
+        """
+
+        return self._get_upward_ranks(components, running_order, lambda component: self.runtime_history.get(component.runner))
+
+    def _get_upward_ranks(self, components: dict, running_order: list, get_cost: typing.Callable) -> dict:
+        successors = self._get_successors(components)
+        ranks = {}
+        for component_id in reversed(running_order):
+            cost = get_cost(components[component_id])
+            ranks[component_id] = cost + max((ranks[successor] for successor in successors[component_id]), default=0.0)
+        return ranks
+
+    def _get_requirement(self, component) -> dict:
+        """Resources declared by a component, clamped to capacity so that every component can run alone
+        """
+
+        resources = getattr(component, "resources", {})
+        return {name: min(amount, self.capacity[name]) for name, amount in resources.items() if name in self.capacity}
+
+    def _fits(self, requirement: dict, available: dict) -> bool:
+        for name, amount in requirement.items():
+            if amount > available[name]:
+                return False
+        return True
+
+    def run(self, components: dict, running_order: list, run_component: typing.Callable, token: typing.Optional[CancellationToken] = None):
+        successors = self._get_successors(components)
+        remaining = {
+            component_id: len([dependency for dependency in components[component_id].dependencies if dependency in components])
+            for component_id in running_order
+        }
+
+        if self.policy == "priority":
+            priorities = self.get_priorities(components, running_order)
+            order = {component_id: (-priorities[component_id], index) for index, component_id in enumerate(running_order)}
+        else:
+            order = {component_id: (index, ) for index, component_id in enumerate(running_order)}
+
+        expected_paths = self._get_upward_ranks(components, running_order, self._get_expected) if token is not None else {}
+
+        ready = [component_id for component_id in running_order if remaining[component_id] == 0]
+        available = dict(self.capacity)
+        running = {}
+
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while ready or running:
+                if token is not None:
+                    token.check(max((expected_paths[component_id] for component_id in ready), default=0.0))
+
+                ready.sort(key=order.get)
+                for component_id in list(ready):
+                    if len(running) >= self.max_workers:
+                        break
+
+                    requirement = self._get_requirement(components[component_id])
+                    if not self._fits(requirement, available):
+                        continue
+
+                    runner = components[component_id].runner
+                    if self.controller is not None and not self.controller.acquire(runner, blocking=not running):
+                        continue
+
+                    for name, amount in requirement.items():
+                        available[name] -= amount
+                    ready.remove(component_id)
+                    future = pool.submit(self._run_timed, components[component_id], component_id, run_component)
+                    running[future] = (component_id, runner, requirement)
+
+                timeout = max(token.get_remaining(), 0.0) if token is not None and token.deadline is not None else None
+                done, _ = concurrent.futures.wait(running, timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    component_id, runner, requirement = running.pop(future)
+                    for name, amount in requirement.items():
+                        available[name] += amount
+                    if self.controller is not None:
+                        self.controller.release(runner, None if future.exception() else future.result())
+
+                    future.result()
+                    for successor in successors[component_id]:
+                        remaining[successor] -= 1
+                        if remaining[successor] == 0:
+                            ready.append(successor)
+        except BaseException:
+            self._abandon(running)
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+        # the last components may have finished just after the deadline
+        if token is not None:
+            token.check()
+
+    def _abandon(self, running: dict):
+        """Cancels components queued in the pool, slots of the running ones are released when they finish
+        """
+
+        for future, (component_id, runner, _) in running.items():
+            if future.cancel():
+                L.info("Cancelled {}".format(component_id))
+            else:
+                L.info("Abandoned running {}".format(component_id))
+            if self.controller is not None:
+                future.add_done_callback(lambda _, runner=runner: self.controller.release(runner))
@@ -0,0 +1,88 @@
+import collections.abc
+import numpy as np
+
+
+class FrozenDict(collections.abc.Mapping):
+    """
+    Read-only view of a dictionary, values are frozen when they are accessed. thaw() returns a shallow mutable copy.
+    """
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key):
+        return freeze(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return "FrozenDict({!r})".format(self._data)
+
+
+class FrozenList(collections.abc.Sequence):
+    """
+    Read-only view of a list, items are frozen when they are accessed. thaw() returns a shallow mutable copy.
+    """
+
+    def __init__(self, data: list):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenList(self._data[index])
+        return freeze(self._data[index])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenList):
+            other = other._data
+        return isinstance(other, (list, tuple)) and list(self._data) == list(other)
+
+    def __repr__(self):
+        return "FrozenList({!r})".format(self._data)
+
+
+def freeze(value):
+    """Read-only version of a value: arrays become not writeable views and dicts and lists FrozenDict and FrozenList, none of them
+    copying the data. Sets and bytearrays have no read-only view, they are copied into frozensets and bytes.
+    Other values are returned as they are.
+    """
+
+    if isinstance(value, np.ndarray):
+        if not value.flags.writeable:
+            return value
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, dict):
+        return FrozenDict(value)
+    if isinstance(value, list):
+        return FrozenList(value)
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, bytearray):
+        return bytes(value)
+    return value
+
+
+def thaw(value):
+    """Mutable copy of a frozen value (copy on write), nested values stay shared and frozen until they are thawed as well
+    """
+
+    if isinstance(value, FrozenDict):
+        return {key: value[key] for key in value}
+    if isinstance(value, FrozenList):
+        return list(value)
+    if isinstance(value, np.ndarray) and not value.flags.writeable:
+        return value.copy()
+    if isinstance(value, frozenset):
+        return set(value)
+    if isinstance(value, bytes):
+        return bytearray(value)
+    return value
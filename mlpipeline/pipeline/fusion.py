@@ -0,0 +1,151 @@
+import collections
+import logging
+import typing
+from .component import Component
+from .runtime_history import RuntimeHistory
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class FusedComponent(Component):
+    """
+    Cheap components executed as a single scheduled unit under the id of the last one. Intermediate outputs are kept
+    in a local result layered over the pipeline result, only outputs of the last component are stored in the pipeline.
+    """
+
+    def __init__(self, component_id: str, members: list):
+        """
+        Parameters
+        ----------
+        component_id : str
+            id of the last member, which produces the outputs of the unit
+        members : list
+            components in topological order
+        """
+
+        member_ids = set(member.name for member in members)
+        inputs = sorted(set(
+            input_key for member in members for input_key in member.inputs | member.get_condition_inputs()
+            if "." not in input_key or input_key.split(".")[0] not in member_ids
+        ))
+        super().__init__(component_id, {"inputs": inputs, "outputs": sorted(members[-1].outputs), "components": [member.name for member in members]})
+        self.members = members
+        self.lazy = any(member.lazy for member in members)
+        # members run one after another, so the unit needs the largest amount of every resource of its members
+        self.runner = "+".join(member.runner for member in members)
+        self.resources = {}
+        for member in members:
+            for name, amount in member.resources.items():
+                self.resources[name] = max(amount, self.resources.get(name, 0))
+
+    def setup(self):
+        for member in self.members:
+            member.ensure_setup()
+
+    def execute(self, result: dict, token=None) -> dict:
+        local_result = collections.ChainMap({}, result)
+        for member in self.members:
+            if token is None:
+                local_result[member.name] = member.execute(local_result)
+                continue
+            token.check()
+            local_result[member.name] = member.execute(local_result, token=token) if member.accepts_token() else member.execute(local_result)
+        return local_result[self.name]
+
+    def execute_batch(self, results: list) -> list:
+        local_results = [collections.ChainMap({}, result) for result in results]
+        for member in self.members:
+            for local_result, outputs in zip(local_results, member.execute_batch(local_results)):
+                local_result[member.name] = outputs
+        return [local_result[self.name] for local_result in local_results]
+
+
+class ComponentFuser:
+    """
+    Build-time pass fusing chains and fan-ins of cheap components into FusedComponent units, so executors schedule
+    (and checkpoint, trace and hand off) one unit instead of every tiny component.
+
+    A component is cheap if it's marked `fusable: true` or its runner's recorded runtime is under the threshold.
+    A cheap component is fused into its consumer if the consumer is cheap, it is its only consumer and
+    it isn't a pipeline output. Components with when conditions or input defaults and source components are never fused.
+
+    ...
+
+    Methods
+    -------
+    is_cheap(component: Component)
+        returns if the component may be fused
+    fuse(components: dict, running_order: list, outputs: set)
+        returns components and running order with fused units
+    """
+
+    def __init__(self, runtime_history: typing.Optional[RuntimeHistory] = None, threshold: typing.Optional[float] = None):
+        """
+        Parameters
+        ----------
+        runtime_history : RuntimeHistory
+            recorded runtimes of runner classes
+        threshold : float
+            seconds under which components with recorded runtimes are fused
+        """
+
+        self.runtime_history = runtime_history
+        self.threshold = threshold
+
+    def is_cheap(self, component) -> bool:
+        if component.when is not None or component.defaults or component.source:
+            return False
+        if component.fusable:
+            return True
+
+        runner = component.runner
+        return self.threshold is not None and self.runtime_history is not None and runner in self.runtime_history \
+            and self.runtime_history.get(runner) <= self.threshold
+
+    def fuse(self, components: dict, running_order: list, outputs: set) -> typing.Tuple[dict, list]:
+        """Fuses cheap components
+
+        Parameters
+        ----------
+        components : dict
+            all components component_id -> component
+        running_order : list
+            component ids in topological order
+        outputs : set
+            pipeline outputs
+
+        Returns
+        -------
+        tuple
+            (components, running order), fused units replace their members under the id of the last member
+        """
+
+        output_ids = set(output.split(".")[0] for output in outputs if "." in output)
+        consumers = {component_id: set() for component_id in components}
+        for component_id, component in components.items():
+            for dependency in component.dependencies:
+                if dependency in consumers:
+                    consumers[dependency].add(component_id)
+
+        positions = {component_id: index for index, component_id in enumerate(running_order)}
+        groups = {}
+        for component_id in running_order:
+            group = [component_id]
+            if self.is_cheap(components[component_id]):
+                for dependency in sorted(components[component_id].dependencies & set(groups)):
+                    if self.is_cheap(components[dependency]) and consumers[dependency] == set([component_id]) and dependency not in output_ids:
+                        group.extend(groups.pop(dependency))
+            groups[component_id] = sorted(group, key=positions.get)
+
+        fused_components = {}
+        for component_id, group in groups.items():
+            if len(group) == 1:
+                fused_components[component_id] = components[component_id]
+            else:
+                fused_components[component_id] = FusedComponent(component_id, [components[member_id] for member_id in group])
+                L.info("Fused {} into {}".format(group, component_id))
+
+        return fused_components, [component_id for component_id in running_order if component_id in groups]
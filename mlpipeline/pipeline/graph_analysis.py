@@ -0,0 +1,208 @@
+import logging
+import typing
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class GraphAnalysis:
+    """
+    Critical path analysis of a dependency graph with component durations.
+
+    The span is the longest path through the graph (the latency with unlimited workers) and the work is
+    the sum of all durations (the latency with one worker). Slack of a component is how much it can be delayed
+    without delaying the pipeline, components on the critical path have none.
+
+    ...
+
+    Methods
+    -------
+    get_span()
+        returns duration of the critical path
+    get_work()
+        returns sum of all durations
+    get_critical_path()
+        returns components of the critical path
+    get_slack()
+        returns slack of every component
+    get_speedup(workers: int)
+        returns bounds of the speedup with the number of workers
+    get_best_target()
+        returns the component whose speedup cuts the most latency
+    to_dot()
+        returns DOT representation annotated with timings
+    get_report(workers: list)
+        returns a text report
+    """
+
+    PIPELINE_NODES = ("inputs", "outputs")
+
+    def __init__(self, graph: dict, durations: dict):
+        """
+        Parameters
+        ----------
+        graph : dict
+            dependency graph from GraphUtils.get_graph
+        durations : dict
+            component_id -> seconds, missing components take no time
+        """
+
+        self.graph = graph
+        self.durations = {node: float(durations.get(node, 0.0)) if node not in self.PIPELINE_NODES else 0.0 for node in graph}
+        self._predecessors = {node: set() for node in graph}
+        for node, successors in graph.items():
+            for successor in successors:
+                self._predecessors[successor].add(node)
+        self._order = self._get_order()
+        self._finishes = self._get_finishes(self.durations)
+
+    def _get_order(self) -> list:
+        remaining = {node: len(predecessors) for node, predecessors in self._predecessors.items()}
+        ready = sorted(node for node, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            node = ready.pop(0)
+            order.append(node)
+            for successor in sorted(self.graph[node]):
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    ready.append(successor)
+
+        if len(order) != len(self.graph):
+            L.error("Incorrect graph, shutting down")
+            raise RuntimeError("The component pipeline contains cycle")
+        return order
+
+    def _get_finishes(self, durations: dict) -> dict:
+        """Earliest finish of every node with unlimited workers
+        """
+
+        finishes = {}
+        for node in self._order:
+            finishes[node] = durations[node] + max((finishes[predecessor] for predecessor in self._predecessors[node]), default=0.0)
+        return finishes
+
+    def get_span(self) -> float:
+        return max(self._finishes.values(), default=0.0)
+
+    def get_work(self) -> float:
+        return sum(self.durations.values())
+
+    def get_critical_path(self) -> list:
+        """Components of the longest path in execution order
+        """
+
+        if not self._finishes:
+            return []
+
+        node = max(self._order, key=lambda node: (self._finishes[node], node in self.PIPELINE_NODES))
+        path = [node]
+        while self._predecessors[node]:
+            node = max(sorted(self._predecessors[node]), key=self._finishes.get)
+            path.append(node)
+
+        return [node for node in reversed(path) if node not in self.PIPELINE_NODES]
+
+    def get_slack(self) -> dict:
+        """Time every component can be delayed without delaying the pipeline
+
+        Returns
+        -------
+        dict
+            component_id -> seconds
+        """
+
+        span = self.get_span()
+        latest_finishes = {}
+        for node in reversed(self._order):
+            latest_finishes[node] = min((latest_finishes[successor] - self.durations[successor] for successor in self.graph[node]), default=span)
+        return {node: latest_finishes[node] - self._finishes[node] for node in self._order if node not in self.PIPELINE_NODES}
+
+    def get_speedup(self, workers: int) -> typing.Tuple[float, float]:
+        """Bounds of the speedup over one worker from the work/span analysis
+
+        Parameters
+        ----------
+        workers : int
+            number of workers
+
+        Returns
+        -------
+        tuple
+            (speedup guaranteed by a greedy scheduler (Brent's bound), upper bound min(workers, work / span))
+        """
+
+        work, span = self.get_work(), self.get_span()
+        if span == 0.0:
+            return 1.0, 1.0
+        return max(1.0, work / (work / workers + span)), min(float(workers), work / span)
+
+    def get_best_target(self) -> typing.Tuple[typing.Optional[str], float]:
+        """Finds the component whose removal shortens the critical path the most, only its components are candidates
+
+        Returns
+        -------
+        tuple
+            (component_id, seconds of latency saved if it took no time)
+        """
+
+        span = self.get_span()
+        best, best_saving = None, 0.0
+        for node in self.get_critical_path():
+            durations = dict(self.durations)
+            durations[node] = 0.0
+            saving = span - max(self._get_finishes(durations).values())
+            if saving > best_saving:
+                best, best_saving = node, saving
+        return best, best_saving
+
+    def to_dot(self, name: str = "pipeline") -> str:
+        """Graphviz representation, critical path in red, components labeled with duration and slack
+        """
+
+        critical_path = self.get_critical_path()
+        critical_nodes = set(critical_path)
+        critical_edges = set(zip(critical_path, critical_path[1:]))
+        slack = self.get_slack()
+
+        lines = ["digraph \"{}\" {{".format(name.replace("\"", "\\\"")), "  rankdir=LR;"]
+        for node in self._order:
+            if node in self.PIPELINE_NODES:
+                lines.append("  \"{}\" [shape=box, style=dashed];".format(node))
+                continue
+            attributes = "label=\"{}\\n{:.6f}s\\nslack {:.6f}s\"".format(node, self.durations[node], slack[node])
+            if node in critical_nodes:
+                attributes += ", color=red, penwidth=2"
+            lines.append("  \"{}\" [{}];".format(node, attributes))
+
+        for node in self._order:
+            for successor in sorted(self.graph[node]):
+                attributes = " [color=red, penwidth=2]" if (node, successor) in critical_edges else ""
+                lines.append("  \"{}\" -> \"{}\"{};".format(node, successor, attributes))
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def get_report(self, workers: typing.Optional[list] = None) -> str:
+        """Text report of the critical path, slack, speedups with the numbers of workers and the best optimization target
+        """
+
+        span, work = self.get_span(), self.get_work()
+        slack = self.get_slack()
+        lines = [
+            "Work: {:.6f}s, span: {:.6f}s, parallelism: {:.2f}".format(work, span, work / span if span else 1.0),
+            "Critical path: {}".format(" -> ".join(self.get_critical_path())),
+            "Slack:",
+        ]
+        for node in sorted(slack, key=lambda node: (slack[node], node)):
+            lines.append("  {}: {:.6f}s (duration {:.6f}s)".format(node, slack[node], self.durations[node]))
+
+        for count in workers or []:
+            lower, upper = self.get_speedup(count)
+            lines.append("Speedup with {} workers: {:.2f} - {:.2f}".format(count, lower, upper))
+
+        best, saving = self.get_best_target()
+        if best is not None:
+            lines.append("Best target: {}, saves up to {:.6f}s ({:.1f}% of latency)".format(best, saving, 100.0 * saving / span))
+        return "\n".join(lines)
@@ -16,6 +16,8 @@ class GraphUtils:
     -------
     get_running_order(components: dict, inputs: set, outputs: set)
         returns running order
+    get_graph(components: dict, inputs: set, outputs: set)
+        returns the verified dependency graph
     """
 
     def get_running_order(self, components: dict, inputs: set, outputs: set) -> list:
@@ -41,6 +43,27 @@ class GraphUtils:
         running_order = self._get_topological_order(graph)
         return running_order
 
+    def get_graph(self, components: dict, inputs: set, outputs: set) -> dict:
+        """Creates the verified dependency graph of components
+
+        Parameters
+        ----------
+        components : dict
+            The components info
+
+        inputs: set
+            The set of pipeline inputs
+        outputs: set
+            The set of pipeline outputs
+
+        Returns
+        -------
+        dict
+            component id -> ids of components depending on it, "inputs" and "outputs" stand for the pipeline inputs and outputs
+        """
+
+        return self._create_graph(components, inputs, outputs)
+
     def _create_graph(self, components: dict, inputs: set, outputs: set) -> dict:
         """Creates the dependency graph between components, where node is component id and edge represents the link between them.
 
@@ -76,12 +99,16 @@ class GraphUtils:
                 if dependency not in graph:
                     graph[dependency] = set()
 
-                if self._verify_edge(components, inputs, outputs, dependency, component_id):
-                    graph[dependency].add(component_id)
-                else:
+                if not self._verify_edge(components, inputs, outputs, dependency, component_id):
                     L.error("Incorrect graph, shutting down")
                     raise RuntimeError("Incorrect link from {} to {}, inputs don't match the outputs".format(dependency, component_id))
 
+                if not self._verify_edge_types(components, dependency, component_id):
+                    L.error("Incorrect graph, shutting down")
+                    raise RuntimeError("Incorrect link from {} to {}, input types don't match the output types".format(dependency, component_id))
+
+                graph[dependency].add(component_id)
+
         if len(outputs) > 0:
             graph["outputs"] = set()
 
@@ -227,14 +254,47 @@ class GraphUtils:
             if to_id not in components:
                 return False
 
-            inputs_to = components[to_id].inputs
+            inputs_to = components[to_id].inputs | components[to_id].get_condition_inputs()
 
         for inpt in inputs_to:
             split_inpt = inpt.split(".")
-            if (len(split_inpt) == 1) and (split_inpt[0] not in outputs_from):
+            if (len(split_inpt) == 1) and (from_id == "inputs") and (split_inpt[0] not in outputs_from):
                 return False
 
             if (len(split_inpt) == 2) and (split_inpt[0] == from_id) and (split_inpt[1] not in outputs_from):
                 return False
 
         return True
+
+    def _verify_edge_types(self, components: dict, from_id: str, to_id: str) -> bool:
+        """Checks if declared types of linked ports are compatible, ports without types match anything
+
+        Parameters
+        ----------
+        components : dict
+            All components
+        from_id : str
+            Id of previous component
+        to_id : str
+            Id of next component
+
+        Returns
+        -------
+        bool
+            if correct
+        """
+
+        if from_id not in components or to_id not in components:
+            return True
+
+        output_types = components[from_id].output_types
+        for input_key, input_type in components[to_id].input_types.items():
+            split_input = input_key.split(".")
+            if len(split_input) != 2 or split_input[0] != from_id or split_input[1] not in output_types:
+                continue
+
+            if not output_types[split_input[1]].is_compatible(input_type):
+                L.error("Output {} of {} is {}, but {} expects {}".format(split_input[1], from_id, output_types[split_input[1]], to_id, input_type))
+                return False
+
+        return True
@@ -1,5 +1,19 @@
+import asyncio
+import collections
+import concurrent.futures
+import functools
 import logging
-from ..utils import get_pipeline_message
+import threading
+import time
+import typing
+import uuid
+from ..utils import get_pipeline_message, get_inputs_hash
+from .concurrency_controller import ConcurrencyController
+from .condition import SKIPPED
+from .deadline import CancellationToken
+from .executor import SequentialExecutor
+from .frozen import freeze
+from .single_flight import SingleFlight
 
 ##
 L = logging.getLogger(__name__)
@@ -17,9 +31,30 @@ class Pipeline:
     -------
     execute(input: dict)
         obtains result
+
+    execute_batch(inputs_list: list)
+        obtains results for a batch of records
+
+    execute_stream(inputs_iterable: iterable)
+        obtains results record by record, prefetching source components
+
+    execute_component(component_id: str, result: dict)
+        executes a single component against a result dictionary
+
+    warm_up()
+        sets up lazy components in background
+
+    execute_coalesced(inputs: dict)
+        obtains the result, sharing it with concurrent calls with the same inputs
+
+    execute_async(inputs: dict)
+        obtains the result in the event loop, sharing it with concurrent coroutines with the same inputs
     """
 
-    def __init__(self, name: str, inputs: set, outputs: set, components: dict, running_order: list):
+    RUN_INPUTS_ID = "inputs"
+    RUN_INPUTS_HASH = "run"
+
+    def __init__(self, name: str, inputs: set, outputs: set, components: dict, running_order: list, executor=None, defaults: dict = None):
         """
         Parameters
         ----------
@@ -33,6 +68,10 @@ class Pipeline:
             all components component_id -> component
         running_order : list
             component ids in topological order
+        executor : ExecutorABC
+            schedules components, sequential by default
+        defaults : dict
+            output key -> value used when the component providing it is skipped
         """
 
         self.name = name
@@ -40,6 +79,9 @@ class Pipeline:
         self.outputs = outputs
         self.components = components
         self.running_order = running_order
+        self.executor = executor if executor is not None else SequentialExecutor()
+        self.defaults = defaults or {}
+        self.single_flight = SingleFlight()
 
     def _verify_inputs(self, inputs: dict) -> bool:
         """Verifies the input from cli if it matches the input expected in pipeline
@@ -61,13 +103,22 @@ class Pipeline:
 
         return True
 
-    def execute(self, inputs: dict) -> dict:
-        """Executes components one by one in topological order
+    def execute(self, inputs: dict, run_id: str = None, checkpoint_store=None, recorder=None,
+                token: typing.Optional[CancellationToken] = None) -> dict:
+        """Executes components in topological order using the executor
 
         Parameters
         ----------
         inputs : dict
             inputs from cli
+        run_id : str
+            checkpoint run id, generated if a store is given without one
+        checkpoint_store : CheckpointStore
+            optional store, outputs of components already stored for the run are loaded instead of computed
+        recorder : TraceRecorder
+            optional recorder of inputs, component outputs with timings and outputs
+        token : CancellationToken
+            optional deadline and cancellation, checked between components and passed to cancellable components
 
         Returns
         -------
@@ -78,6 +129,8 @@ class Pipeline:
         ------
         RuntimeError
             If inputs passed from cli don"t match the pipeline inputs
+        Cancelled
+            If the token is cancelled, DeadlineExceeded if it can't meet its deadline
         """
 
         if not self._verify_inputs(inputs):
@@ -89,14 +142,379 @@ class Pipeline:
         L.info("Starting the {}".format(self.name))
         L.info(get_pipeline_message(inputs, "inputs"))
 
+        if checkpoint_store is not None:
+            if run_id is None:
+                run_id = uuid.uuid4().hex
+            L.info("Checkpointing run {}".format(run_id))
+            checkpoint_store.save(run_id, self.RUN_INPUTS_ID, self.RUN_INPUTS_HASH, inputs)
+
+        record_id = recorder.start_record(inputs) if recorder is not None else None
+
+        def run_component(component_id: str) -> dict:
+            if recorder is not None:
+                start = recorder.get_offset(record_id)
+            result[component_id] = self._execute_component(component_id, result, run_id, checkpoint_store, token)
+            if recorder is not None:
+                recorder.record_component(record_id, component_id, result[component_id], start, recorder.get_offset(record_id) - start)
+            return result[component_id]
+
+        try:
+            if token is None:
+                self.executor.run(self.components, self.running_order, run_component)
+            else:
+                self.executor.run(self.components, self.running_order, run_component, token)
+            outputs = self._extract_outputs(result)
+        except BaseException as error:
+            if recorder is not None:
+                recorder.fail_record(record_id, error)
+            raise
+
+        if recorder is not None:
+            recorder.finish_record(record_id, outputs)
+        L.info(get_pipeline_message(outputs, "outputs"))
+        return outputs
+
+    def _get_coalescing_key(self, inputs: dict) -> str:
+        """Hash of the pipeline inputs, keys the pipeline doesn't use are ignored
+
+        Raises
+        ------
+        RuntimeError
+            If inputs don"t match the pipeline inputs
+        """
+
+        if not self._verify_inputs(inputs):
+            L.error("Incorrect inputs, shutting down")
+            raise RuntimeError("Inputs don't match specified inputs")
+        return get_inputs_hash({key: inputs[key] for key in self.inputs})
+
+    def execute_coalesced(self, inputs: dict) -> dict:
+        """Executes the pipeline unless an execution with the same inputs is in flight in another thread, then waits for its outputs.
+        Every caller gets its own outputs dictionary with read-only views of the shared values.
+
+        Parameters
+        ----------
+        inputs : dict
+            inputs of the record
+
+        Returns
+        -------
+        dict
+            outputs
+        """
+
+        outputs = self.single_flight.do(self._get_coalescing_key(inputs), self.execute, inputs)
+        return {key: freeze(value) for key, value in outputs.items()}
+
+    async def execute_async(self, inputs: dict) -> dict:
+        """Executes the pipeline in the default executor of the running event loop unless an execution with the same inputs
+        is in flight in the loop, then waits for its outputs
+
+        Parameters
+        ----------
+        inputs : dict
+            inputs of the record
+
+        Returns
+        -------
+        dict
+            outputs
+        """
+
+        loop = asyncio.get_running_loop()
+        outputs = await self.single_flight.do_async(self._get_coalescing_key(inputs), loop.run_in_executor, None, self.execute, inputs)
+        return {key: freeze(value) for key, value in outputs.items()}
+
+    def get_coalescing_metrics(self) -> dict:
+        """Calls coalesced by the pipeline and by components marked `coalesce: true`
+
+        Returns
+        -------
+        dict
+            {"pipeline": metrics, "components": {component_id: metrics}}
+        """
+
+        return {
+            "pipeline": self.single_flight.get_metrics(),
+            "components": {
+                component_id: component.single_flight.get_metrics()
+                for component_id, component in self.components.items() if getattr(component, "coalesce", False)
+            },
+        }
+
+    def execute_batch(self, inputs_list: list) -> list:
+        """Executes components in topological order, every component processes all records of the batch at once
+
+        Parameters
+        ----------
+        inputs_list : list
+            inputs of every record
+
+        Returns
+        -------
+        list
+            outputs of every record
+
+        Raises
+        ------
+        RuntimeError
+            If inputs of any record don"t match the pipeline inputs
+        """
+
+        for inputs in inputs_list:
+            if not self._verify_inputs(inputs):
+                L.error("Incorrect batch inputs, shutting down")
+                raise RuntimeError("Inputs of a record don't match specified inputs")
+
+        results = [dict(inputs) for inputs in inputs_list]
+        L.info("Starting the {} for a batch of {} records".format(self.name, len(results)))
+
+        def run_component(component_id: str) -> list:
+            component = self.components[component_id]
+            active = []
+            for result in results:
+                if self._is_skipped(component, result):
+                    result[component_id] = SKIPPED
+                else:
+                    active.append(result)
+
+            if not active:
+                return SKIPPED
+
+            outputs_list = component.execute_batch(active)
+            for result, outputs in zip(active, outputs_list):
+                result[component_id] = outputs
+            return outputs_list
+
+        self.executor.run(self.components, self.running_order, run_component)
+        return [self._extract_outputs(result) for result in results]
+
+    def execute_stream(self, inputs_iterable: typing.Iterable, prefetch: int = 4, io_workers: int = None,
+                       controller: typing.Optional[ConcurrencyController] = None) -> typing.Iterator[dict]:
+        """Executes records one after another. Source components (`source: true`) depending only on pipeline inputs
+        are executed in a thread pool for the next `prefetch` records while the current one is computed.
+        With a controller the number of records in flight per source runner class adapts to their latency,
+        the next record is only read from the inputs when every source runner has a free slot.
+
+        Parameters
+        ----------
+        inputs_iterable : iterable
+            inputs of every record
+        prefetch : int
+            number of records prefetched ahead of the current one
+        io_workers : int
+            number of prefetching threads, prefetch by default
+        controller : ConcurrencyController
+            optional adaptive limit of prefetched records per source runner class
+
+        Returns
+        -------
+        iterator
+            outputs of every record in order of inputs
+
+        Raises
+        ------
+        RuntimeError
+            If inputs of any record don"t match the pipeline inputs
+        """
+
+        sources = []
         for component_id in self.running_order:
-            component_result = self.components[component_id].execute(result)
-            result[component_id] = component_result
+            component = self.components[component_id]
+            if not component.source:
+                continue
+            if component.dependencies <= set(["inputs"]):
+                sources.append(component_id)
+            else:
+                L.warning("Source {} depends on other components, it won't be prefetched".format(component_id))
+        runners = sorted(set(self.components[component_id].runner for component_id in sources))
+
+        pool = concurrent.futures.ThreadPoolExecutor(io_workers or max(prefetch, 1), thread_name_prefix="prefetch")
+        records = iter(inputs_iterable)
+        buffer = collections.deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(buffer) <= prefetch:
+                    if controller is not None and not self._acquire_runners(controller, runners, blocking=not buffer):
+                        break
+                    try:
+                        inputs = next(records)
+                    except StopIteration:
+                        exhausted = True
+                        if controller is not None:
+                            for runner in runners:
+                                controller.release(runner)
+                        break
+                    buffer.append(self._prefetch(pool, sources, inputs, controller))
+
+                if not buffer:
+                    return
+
+                inputs, futures = buffer.popleft()
+                yield self._execute_prefetched(inputs, futures)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire_runners(self, controller: ConcurrencyController, runners: list, blocking: bool) -> bool:
+        """Takes a slot of every runner or none of them
+        """
+
+        acquired = []
+        for runner in runners:
+            if not controller.acquire(runner, blocking):
+                for acquired_runner in acquired:
+                    controller.release(acquired_runner)
+                return False
+            acquired.append(runner)
+        return True
+
+    def _prefetch(self, pool: concurrent.futures.ThreadPoolExecutor, sources: list, inputs: dict,
+                  controller: typing.Optional[ConcurrencyController] = None) -> typing.Tuple[dict, dict]:
+        if not self._verify_inputs(inputs):
+            L.error("Incorrect stream inputs, shutting down")
+            if controller is not None:
+                for runner in set(self.components[component_id].runner for component_id in sources):
+                    controller.release(runner)
+            raise RuntimeError("Inputs of a record don't match specified inputs")
+
+        source_result = dict(inputs)
+        futures = {component_id: pool.submit(self._execute_component, component_id, source_result, None, None) for component_id in sources}
+
+        if controller is not None:
+            pending = collections.Counter(self.components[component_id].runner for component_id in sources)
+            start = time.perf_counter()
+            lock = threading.Lock()
+
+            def release(runner: str, future: concurrent.futures.Future):
+                with lock:
+                    pending[runner] -= 1
+                    if pending[runner] > 0:
+                        return
+                finished = not future.cancelled() and future.exception() is None
+                controller.release(runner, time.perf_counter() - start if finished else None)
+
+            for component_id, future in futures.items():
+                future.add_done_callback(functools.partial(release, self.components[component_id].runner))
+
+        return inputs, futures
+
+    def _execute_prefetched(self, inputs: dict, futures: dict) -> dict:
+        """Waits for the prefetched sources of the record and executes the rest of the graph
+        """
+
+        result = dict(inputs)
+        L.info(get_pipeline_message(inputs, "inputs"))
+        for component_id, future in futures.items():
+            result[component_id] = future.result()
+
+        def run_component(component_id: str) -> dict:
+            result[component_id] = self._execute_component(component_id, result, None, None)
+            return result[component_id]
+
+        running_order = [component_id for component_id in self.running_order if component_id not in futures]
+        self.executor.run({component_id: self.components[component_id] for component_id in running_order}, running_order, run_component)
 
         outputs = self._extract_outputs(result)
         L.info(get_pipeline_message(outputs, "outputs"))
         return outputs
 
+    def warm_up(self) -> threading.Thread:
+        """Sets up components that weren't set up yet in a daemon thread, calls meanwhile wait only for the component they need
+
+        Returns
+        -------
+        threading.Thread
+            the warm-up thread
+        """
+
+        def set_up():
+            for component_id in self.running_order:
+                self.components[component_id].ensure_setup()
+            L.info("Pipeline {} warmed up".format(self.name))
+
+        thread = threading.Thread(target=set_up, name="pipeline-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def execute_component(self, component_id: str, result: dict, token: typing.Optional[CancellationToken] = None) -> dict:
+        """Executes a single component against a result dictionary, e.g. with upstream values from a trace.
+        The component is skipped if its when condition doesn't hold or a dependency it has no input defaults for was skipped.
+
+        Parameters
+        ----------
+        component_id : str
+            component to execute
+        result : dict
+            All inputs an outputs from processing, the component's outputs aren't stored in it
+        token : CancellationToken
+            optional token passed to the component
+
+        Returns
+        -------
+        dict
+            component outputs or SKIPPED
+        """
+
+        return self._execute_component(component_id, result, None, None, token)
+
+    def _execute_component(self, component_id: str, result: dict, run_id: str, checkpoint_store,
+                           token: typing.Optional[CancellationToken] = None) -> dict:
+        """Executes a single component or loads its outputs from the checkpoint store.
+        The component is skipped if its when condition doesn't hold or a dependency it has no input defaults for was skipped.
+
+        Parameters
+        ----------
+        component_id : str
+            component to execute
+        result : dict
+            All inputs an outputs from processing
+        run_id : str
+            checkpoint run id
+        checkpoint_store : CheckpointStore
+            optional store
+        token : CancellationToken
+            optional token passed to the component
+
+        Returns
+        -------
+        dict
+            component outputs or SKIPPED
+        """
+
+        component = self.components[component_id]
+        if self._is_skipped(component, result):
+            L.info("Skipping {}".format(component_id))
+            return SKIPPED
+
+        execute = functools.partial(component.execute, token=token) if token is not None and component.accepts_token() else component.execute
+        if checkpoint_store is None:
+            return execute(result)
+
+        input_hash = get_inputs_hash(component._extract_inputs(result))
+        if checkpoint_store.has(run_id, component_id, input_hash):
+            L.info("Loading {} from checkpoint".format(component_id))
+            return checkpoint_store.load(run_id, component_id, input_hash)
+
+        component_result = execute(result)
+        checkpoint_store.save(run_id, component_id, input_hash, component_result)
+        return component_result
+
+    def _is_skipped(self, component, result: dict) -> bool:
+        for dependency in component.required_dependencies:
+            if result.get(dependency) is SKIPPED:
+                return True
+
+        if component.when is None:
+            return False
+        return not component.when.evaluate(lambda key: self._get_value(result, key))
+
+    def _get_value(self, result: dict, key: str):
+        key_split = key.split(".")
+        if len(key_split) == 1:
+            return result[key]
+        return result[key_split[0]][key_split[1]]
+
     def _extract_outputs(self, result: dict) -> dict:
         """Extracts outputs from result dictionary
 
@@ -116,6 +534,8 @@ class Pipeline:
             output_key_split = output_key.split(".")
             if len(output_key_split) == 1:
                 outputs[output_key] = result[output_key]
+            elif result[output_key_split[0]] is SKIPPED:
+                outputs[output_key] = self.defaults.get(output_key)
             else:
                 outputs[output_key] = result[output_key_split[0]][output_key_split[1]]
         return outputs
@@ -1,8 +1,11 @@
+import concurrent.futures
 import logging
 
 from .pipeline import Pipeline
+from .component_abc import ComponentABC
 from .config_parser import ConfigParser
 from .graph_utils import GraphUtils
+from .fusion import ComponentFuser
 
 ##
 L = logging.getLogger(__name__)
@@ -20,35 +23,101 @@ class PipelineBuilder:
     -------
     build_pipeline(config_path: str)
         Creates pipeline from given config
+
+    get_sub_pipeline_paths()
+        Returns paths of embedded configs read so far
     """
 
-    def __init__(self, components_module: str):
+    def __init__(self, components_module: str, executor=None, check_rate: float = None, isolation: str = None, fuse: bool = False,
+                 fuse_threshold: float = None, build_workers: int = None, warm_up: bool = False):
         """
         Parameters
         ----------
         components_module : str
             A path where components are defined
+        executor : ExecutorABC
+            executor of built pipelines, sequential by default
+        check_rate : float
+            share of calls validated against port types, overrides check_rate of all components
+        isolation : str
+            "shared", "readonly" or "debug", overrides isolation of all components
+        fuse : bool
+            fuse chains of cheap components into single units
+        fuse_threshold : float
+            seconds of recorded runtime (in the executor's runtime history) under which components are cheap,
+            otherwise only components marked `fusable: true` are
+        build_workers : int
+            number of threads constructing and setting up components, ThreadPoolExecutor default if not given
+        warm_up : bool
+            set up lazy components of built pipelines in background
         """
 
         self._components_module = components_module
+        self._executor = executor
+        self._check_rate = check_rate
+        self._isolation = isolation
+        self._fuse = fuse
+        self._fuse_threshold = fuse_threshold
+        self._build_workers = build_workers
+        self._warm_up = warm_up
+        if isolation is not None and isolation not in ComponentABC.ISOLATION_MODES:
+            raise RuntimeError("Unknown isolation {}, should be one of {}".format(isolation, ComponentABC.ISOLATION_MODES))
+        self._sub_pipeline_cache = {}
 
-    def build_pipeline(self, config_path: str) -> Pipeline:
-        """Builds the pipeline from configuration
+    def build_pipeline(self, config_path: str, reusable_components: dict = None) -> Pipeline:
+        """Builds the pipeline from configuration. Components are constructed concurrently, set up of components
+        that aren't lazy runs concurrently with the graph validation.
 
         Parameters
         ----------
         config_path : str
             Path to config
+        reusable_components : dict
+            Components of a previous build, reused when their definition didn't change
 
         Returns
         -------
         Pipeline
             executable pipeline
         """
-        parser = ConfigParser()
-        name, inputs, outputs, components = parser.parse_config(config_path, self._components_module)
+        parser = ConfigParser(self._sub_pipeline_cache, self._build_workers)
+        name, inputs, outputs, components = parser.parse_config(config_path, self._components_module, reusable_components)
+        if self._check_rate is not None:
+            for component in components.values():
+                component.check_rate = self._check_rate
+        if self._isolation is not None:
+            for component in components.values():
+                component.isolation = self._isolation
+
+        pool = concurrent.futures.ThreadPoolExecutor(self._build_workers, thread_name_prefix="setup")
+        try:
+            setups = [pool.submit(component.ensure_setup) for component in components.values() if not component.lazy]
+            graph_utils = GraphUtils()
+            running_order = graph_utils.get_running_order(components, inputs, outputs)
+            for setup in setups:
+                setup.result()
+        except BaseException:
+            # the error isn't delayed by running setups, they finish in background and pending ones never start
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+        if self._fuse:
+            fuser = ComponentFuser(getattr(self._executor, "runtime_history", None), self._fuse_threshold)
+            components, running_order = fuser.fuse(components, running_order, outputs)
+
+        pipeline = Pipeline(name, inputs, outputs, components, running_order, self._executor, parser.defaults)
+        if self._warm_up:
+            pipeline.warm_up()
+        return pipeline
 
-        graph_utils = GraphUtils()
-        running_order = graph_utils.get_running_order(components, inputs, outputs)
+    def get_sub_pipeline_paths(self) -> list:
+        """Paths of the embedded sub-pipeline configs read so far
+
+        Returns
+        -------
+        list
+            config paths
+        """
 
-        return Pipeline(name, inputs, outputs, components, running_order)
+        return sorted(self._sub_pipeline_cache)
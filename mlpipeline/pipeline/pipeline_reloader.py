@@ -0,0 +1,245 @@
+import hashlib
+import importlib
+import inspect
+import logging
+import os
+import sys
+import threading
+import typing
+from .fusion import FusedComponent
+from .pipeline import Pipeline
+from .pipeline_builder import PipelineBuilder
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class PipelineReloader:
+    """
+    Keeps a pipeline up to date with its config and component code for long-running workers.
+
+    A background thread polls modification times of the config, embedded sub-pipeline configs and source files
+    of the components module. On a change the components module is reloaded and the pipeline is rebuilt,
+    reusing warm instances of components whose definition and runner source didn't change. The runner source covers
+    the user-defined classes of its MRO and the module-level functions and classes their methods reference.
+    Members of fused units are reused one by one and fused again. The new pipeline replaces the old one
+    in a single assignment, calls in flight finish on the pipeline they started with.
+
+    ...
+
+    Methods
+    -------
+    execute(inputs: dict)
+        executes the current pipeline
+    check()
+        reloads if any watched file changed
+    reload()
+        rebuilds changed parts of the pipeline
+    start()
+        starts watching in background
+    stop()
+        stops watching
+    """
+
+    def __init__(self, config_path: str, components_module: str, pipeline_builder: typing.Optional[PipelineBuilder] = None, interval: float = 1.0):
+        """
+        Parameters
+        ----------
+        config_path : str
+            Path to config
+        components_module : str
+            A path where components are defined
+        pipeline_builder : PipelineBuilder
+            builder of the pipelines, a default one for the components module if not given
+        interval : float
+            seconds between checks
+        """
+
+        self.config_path = config_path
+        self.interval = interval
+        self._components_module = components_module
+        self._builder = pipeline_builder if pipeline_builder is not None else PipelineBuilder(components_module)
+        self._reload_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self.pipeline = self._builder.build_pipeline(config_path)
+        self._sources = self._get_runner_sources(self.pipeline)
+        self._mtimes = self._get_mtimes()
+
+    def execute(self, inputs: dict, *args, **kwargs) -> dict:
+        """Executes the current pipeline, see Pipeline.execute
+        """
+
+        return self.pipeline.execute(inputs, *args, **kwargs)
+
+    def _get_module_files(self) -> list:
+        module = importlib.import_module(self._components_module)
+        if hasattr(module, "__path__"):
+            files = []
+            for directory in module.__path__:
+                files.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(".py"))
+            return files
+        return [module.__file__]
+
+    def _get_mtimes(self) -> dict:
+        files = [self.config_path] + self._builder.get_sub_pipeline_paths() + self._get_module_files()
+        mtimes = {}
+        for path in files:
+            if os.path.exists(path):
+                mtimes[os.path.abspath(path)] = os.path.getmtime(path)
+        return mtimes
+
+    def _get_components(self, pipeline: Pipeline) -> dict:
+        """Components of the pipeline with fused units replaced by their members
+        """
+
+        components = {}
+        for component_id, component in pipeline.components.items():
+            if isinstance(component, FusedComponent):
+                components.update((member.name, member) for member in component.members)
+            else:
+                components[component_id] = component
+        return components
+
+    def _get_runner_sources(self, pipeline: Pipeline) -> dict:
+        """Source hashes of runner classes defined in the components module, by class name
+        """
+
+        module = importlib.import_module(self._components_module)
+        sources = {}
+        for component in self._get_components(pipeline).values():
+            class_name = component.__class__.__name__
+            if class_name in sources or not hasattr(module, class_name):
+                continue
+            sources[class_name] = self._get_runner_source(getattr(module, class_name))
+        return sources
+
+    def _is_user_defined(self, obj) -> bool:
+        module = getattr(obj, "__module__", None) or ""
+        return module not in ("builtins", "abc") and module != __package__ and not module.startswith(__package__ + ".")
+
+    def _get_runner_source(self, runner_class: type) -> typing.Optional[str]:
+        """Hash of the source of the user-defined classes in the MRO of the runner and of the module-level functions
+        and classes referenced by their methods, None if any source isn't available
+        """
+
+        classes = [cls for cls in runner_class.__mro__ if self._is_user_defined(cls)]
+        objects = list(classes)
+        for cls in classes:
+            module = sys.modules.get(cls.__module__)
+            for name in sorted(self._get_referenced_names(cls)):
+                helper = getattr(module, name, None)
+                if (inspect.isfunction(helper) or inspect.isclass(helper)) and self._is_user_defined(helper) and helper not in objects:
+                    objects.append(helper)
+
+        digest = hashlib.sha256()
+        for obj in objects:
+            try:
+                digest.update(inspect.getsource(obj).encode())
+            except (OSError, TypeError):
+                return None
+        return digest.hexdigest()
+
+    def _get_referenced_names(self, cls: type) -> set:
+        """Global names used in the methods of a class, including nested functions
+        """
+
+        codes = []
+        for attribute in vars(cls).values():
+            if isinstance(attribute, (staticmethod, classmethod)):
+                attribute = attribute.__func__
+            if isinstance(attribute, property):
+                codes.extend(function.__code__ for function in (attribute.fget, attribute.fset, attribute.fdel) if function is not None)
+            elif hasattr(attribute, "__code__"):
+                codes.append(attribute.__code__)
+
+        names = set()
+        while codes:
+            code = codes.pop()
+            names.update(code.co_names)
+            codes.extend(const for const in code.co_consts if inspect.iscode(const))
+        return names
+
+    def _reload_modules(self, changed_files: set):
+        """Reloads modules loaded from changed files and then the components module, so it exports the new classes
+        """
+
+        for module in list(sys.modules.values()):
+            module_file = getattr(module, "__file__", None)
+            if module_file and os.path.abspath(module_file) in changed_files:
+                L.info("Reloading module {}".format(module.__name__))
+                importlib.reload(module)
+
+        importlib.reload(importlib.import_module(self._components_module))
+
+    def check(self) -> bool:
+        """Reloads if any watched file changed
+
+        Returns
+        -------
+        bool
+            if reloaded
+        """
+
+        if self._get_mtimes() == self._mtimes:
+            return False
+
+        try:
+            self.reload()
+        except Exception:
+            L.exception("Reloading {} failed, keeping the running pipeline".format(self.config_path))
+        return True
+
+    def reload(self):
+        """Rebuilds the pipeline, re-instantiating only components whose definition or runner code changed
+        """
+
+        with self._reload_lock:
+            mtimes = self._get_mtimes()
+            changed_files = set(path for path in mtimes if self._mtimes.get(path) != mtimes[path])
+            self._mtimes = mtimes
+
+            if any(path.endswith(".py") for path in changed_files):
+                self._reload_modules(changed_files)
+
+            module = importlib.import_module(self._components_module)
+            old_components = self._get_components(self.pipeline)
+            reusable_components = {}
+            for component_id, component in old_components.items():
+                class_name = component.__class__.__name__
+                if class_name in self._sources and hasattr(module, class_name):
+                    source = self._get_runner_source(getattr(module, class_name))
+                    if source is None or source != self._sources[class_name]:
+                        continue
+                reusable_components[component_id] = component
+
+            pipeline = self._builder.build_pipeline(self.config_path, reusable_components)
+            rebuilt = [
+                component_id for component_id, component in self._get_components(pipeline).items()
+                if old_components.get(component_id) is not component
+            ]
+
+            self._sources = self._get_runner_sources(pipeline)
+            self.pipeline = pipeline
+            L.info("Reloaded {}, rebuilt components: {}".format(self.config_path, rebuilt))
+
+    def start(self):
+        """Starts watching in a daemon thread
+        """
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._watch, name="pipeline-reloader", daemon=True)
+        self._thread.start()
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,118 @@
+import typing
+import numpy as np
+
+SCALAR_TYPES = {
+    "int": (int, np.integer),
+    "float": (float, np.floating),
+    "str": (str, np.str_),
+    "bool": (bool, np.bool_),
+}
+
+
+class PortType:
+    """
+    Optional type contract of a component input or output.
+
+    ...
+
+    Methods
+    -------
+    validate(value)
+        returns description of the mismatch or None
+    is_compatible(other: PortType)
+        if a value of this type can be passed to a port of the other type
+    """
+
+    KINDS = ("array", "bytes", "scalar") + tuple(SCALAR_TYPES)
+
+    def __init__(self, definition: dict):
+        """
+        Parameters
+        ----------
+        definition : dict
+            raw port info from config, e.g. {"dtype": "float32", "shape": [null, 3], "readonly": true} or {"type": "str"}
+        """
+
+        definition = definition or {}
+        self.kind = definition.get("type")
+        if self.kind is None:
+            self.kind = "array" if ("dtype" in definition or "shape" in definition or "readonly" in definition) else "scalar"
+        if self.kind not in self.KINDS:
+            raise RuntimeError("Unknown port type {}, should be one of {}".format(self.kind, self.KINDS))
+
+        self.dtype = np.dtype(definition["dtype"]) if definition.get("dtype") is not None else None
+        shape = definition.get("shape")
+        self.shape = tuple(shape) if shape is not None else None
+        self.readonly = bool(definition.get("readonly", False))
+
+    def validate(self, value) -> typing.Optional[str]:
+        if self.kind == "array":
+            if not isinstance(value, np.ndarray):
+                return "expected array, got {}".format(type(value).__name__)
+            if self.dtype is not None and value.dtype != self.dtype:
+                return "expected dtype {}, got {}".format(self.dtype, value.dtype)
+            if self.shape is not None and not self._shape_matches(value.shape):
+                return "expected shape {}, got {}".format(self.shape, value.shape)
+        elif self.kind == "bytes":
+            if not isinstance(value, (bytes, bytearray, memoryview)):
+                return "expected bytes, got {}".format(type(value).__name__)
+        elif self.kind == "scalar":
+            if not np.isscalar(value):
+                return "expected scalar, got {}".format(type(value).__name__)
+        elif not isinstance(value, SCALAR_TYPES[self.kind]) or (self.kind == "int" and isinstance(value, bool)):
+            return "expected {}, got {}".format(self.kind, type(value).__name__)
+        return None
+
+    def _shape_matches(self, shape: tuple) -> bool:
+        if len(shape) != len(self.shape):
+            return False
+        for expected, actual in zip(self.shape, shape):
+            if expected is not None and expected != actual:
+                return False
+        return True
+
+    def is_compatible(self, other: "PortType") -> bool:
+        if self.kind == "scalar" or other.kind == "scalar":
+            return self.kind not in ("array", "bytes") and other.kind not in ("array", "bytes")
+        if self.kind != other.kind:
+            return False
+        if self.kind != "array":
+            return True
+
+        if self.dtype is not None and other.dtype is not None and self.dtype != other.dtype:
+            return False
+        if self.shape is not None and other.shape is not None:
+            if len(self.shape) != len(other.shape):
+                return False
+            for first, second in zip(self.shape, other.shape):
+                if first is not None and second is not None and first != second:
+                    return False
+        return True
+
+    def __str__(self):
+        if self.kind == "array":
+            return "array(dtype={}, shape={}, readonly={})".format(self.dtype, self.shape, self.readonly)
+        return self.kind
+
+
+def parse_ports(ports_definition: list) -> typing.Tuple[set, dict]:
+    """Parses inputs or outputs from config, every port is either a name or a mapping of name to its type
+
+    Returns
+    -------
+    set
+        port names
+    dict
+        port name -> PortType for typed ports
+    """
+
+    names = set()
+    types = {}
+    for port in ports_definition or []:
+        if isinstance(port, dict):
+            for name, definition in port.items():
+                names.add(name)
+                types[name] = PortType(definition)
+        else:
+            names.add(port)
+    return names, types
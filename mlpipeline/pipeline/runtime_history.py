@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import threading
+import typing
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class RuntimeHistory:
+    """
+    Keeps exponentially weighted moving average of component durations per runner class.
+
+    ...
+
+    Methods
+    -------
+    update(runner: str, duration: float)
+        records a new duration
+    get(runner: str)
+        returns expected duration
+    save()
+        persists the history to its file
+    """
+
+    def __init__(self, path: typing.Optional[str] = None, alpha: float = 0.3, default: float = 1.0):
+        """
+        Parameters
+        ----------
+        path : str
+            optional json file, loaded if it exists
+        alpha : float
+            weight of the newest duration
+        default : float
+            expected duration of runners without history
+        """
+
+        self.path = path
+        self.alpha = alpha
+        self.default = default
+        self._durations = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path) as fp:
+                self._durations = json.load(fp)
+
+    def update(self, runner: str, duration: float):
+        with self._lock:
+            if runner in self._durations:
+                self._durations[runner] = self.alpha * duration + (1 - self.alpha) * self._durations[runner]
+            else:
+                self._durations[runner] = duration
+
+    def get(self, runner: str) -> float:
+        return self._durations.get(runner, self.default)
+
+    def save(self):
+        if not self.path:
+            return
+
+        with self._lock:
+            durations = dict(self._durations)
+        with open(self.path + ".tmp", "w") as fp:
+            json.dump(durations, fp, indent=2, sort_keys=True)
+        os.replace(self.path + ".tmp", self.path)
+
+    def __contains__(self, runner: str) -> bool:
+        return runner in self._durations
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import threading
+import typing
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller executes the function, callers arriving
+    while it runs wait and get its result (or exception). Nothing is kept after the call finishes.
+
+    ...
+
+    Methods
+    -------
+    do(key: str, function: callable, *args)
+        executes or joins the in-flight call of the key in threads
+    do_async(key: str, function: callable, *args)
+        executes or joins the in-flight call of the key in the running event loop, function returns an awaitable
+    get_metrics()
+        returns numbers of calls, executions and coalesced calls
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self._metrics = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def do(self, key: str, function: typing.Callable, *args):
+        """Executes function(*args) unless a call with the key is in flight, then waits for it and returns its result
+
+        Parameters
+        ----------
+        key : str
+            identifies identical calls, e.g. a hash of the inputs
+        function : callable
+            executed by the first caller only
+
+        Returns
+        -------
+        object
+            result shared by all coalesced callers
+        """
+
+        with self._lock:
+            self._metrics["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._metrics["executions"] += 1
+            else:
+                self._metrics["coalesced"] += 1
+
+        if leader:
+            try:
+                call.result = function(*args)
+            except BaseException as error:
+                call.error = error
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, key: str, function: typing.Callable, *args):
+        """Coroutine version of do, function(*args) returns an awaitable. A cancelled follower doesn't cancel the call,
+        a cancelled leader cancels it for its followers as well
+        """
+
+        loop = asyncio.get_running_loop()
+        async_key = (id(loop), key)
+        with self._lock:
+            self._metrics["calls"] += 1
+            future = self._async_calls.get(async_key)
+            leader = future is None
+            if leader:
+                future = self._async_calls[async_key] = loop.create_future()
+                self._metrics["executions"] += 1
+            else:
+                self._metrics["coalesced"] += 1
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await function(*args)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # retrieved here, so a leader without followers doesn't log "exception was never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._async_calls[async_key]
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["in_flight"] = len(self._calls) + len(self._async_calls)
+        return metrics
+
+    def __getstate__(self):
+        return {"_metrics": dict(self._metrics)}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self._metrics.update(state["_metrics"])
@@ -0,0 +1,259 @@
+import logging
+import os
+import typing
+import urllib.parse
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class ColumnarSink:
+    """
+    Gathers pipeline outputs of many records into columns and writes them in row groups of `row_group_size` records.
+
+    With pyarrow installed the "parquet" (default) and "arrow" (IPC file) formats write one file, every row group being
+    a Parquet row group or an Arrow record batch. Without it the "npz" format (default) writes every row group into
+    its own part-<n>.npz file of the output directory and "npy" into a part-<n> directory with a .npy file per column,
+    which read_columns can memory-map.
+
+    The Arrow schema is inferred from the values. While a column holds only None (e.g. outputs of a skipped component)
+    its type is unknown, so row groups are kept in memory until every column got a typed value or the sink is closed,
+    and their schemas are then unified.
+
+    ...
+
+    Methods
+    -------
+    write(outputs: dict)
+        adds outputs of one record
+    write_all(outputs_iterable: iterable)
+        adds outputs of all records, e.g. from Pipeline.execute_stream or execute_batch
+    flush()
+        writes buffered records as a row group
+    close()
+        flushes and closes the output
+    """
+
+    FORMATS = ("parquet", "arrow", "npz", "npy")
+    ARROW_FORMATS = ("parquet", "arrow")
+
+    def __init__(self, path: str, row_group_size: int = 65536, output_format: typing.Optional[str] = None):
+        """
+        Parameters
+        ----------
+        path : str
+            output file for parquet and arrow, output directory for npz and npy
+        row_group_size : int
+            number of records in a row group
+        output_format : str
+            one of FORMATS, parquet with pyarrow installed and npz otherwise by default
+
+        Raises
+        ------
+        RuntimeError
+            If the format is unknown or needs pyarrow which isn't installed
+        """
+
+        if output_format is None:
+            output_format = "parquet" if pyarrow is not None else "npz"
+        if output_format not in self.FORMATS:
+            raise RuntimeError("Unknown output format {}, should be one of {}".format(output_format, self.FORMATS))
+        if output_format in self.ARROW_FORMATS and pyarrow is None:
+            raise RuntimeError("Output format {} requires pyarrow".format(output_format))
+        if row_group_size < 1:
+            raise RuntimeError("Row group size should be positive")
+
+        self.path = path
+        self.row_group_size = row_group_size
+        self.output_format = output_format
+        self.rows = 0
+        self._columns = None
+        self._buffered = 0
+        self._parts = 0
+        self._writer = None
+        self._schema = None
+        self._pending = []
+
+        if output_format not in self.ARROW_FORMATS:
+            os.makedirs(path, exist_ok=True)
+
+    def write(self, outputs: dict):
+        if self._columns is None:
+            self._columns = {key: [] for key in sorted(outputs)}
+        if set(outputs) != set(self._columns):
+            raise RuntimeError("Outputs {} don't match the columns {}".format(sorted(outputs), list(self._columns)))
+
+        for key, column in self._columns.items():
+            column.append(outputs[key])
+        self._buffered += 1
+        if self._buffered >= self.row_group_size:
+            self.flush()
+
+    def write_all(self, outputs_iterable: typing.Iterable):
+        for outputs in outputs_iterable:
+            self.write(outputs)
+
+    def flush(self):
+        if not self._buffered:
+            return
+
+        if self.output_format in self.ARROW_FORMATS:
+            self._write_arrow()
+        else:
+            self._write_numpy()
+
+        L.info("Flushed row group {} of {} records to {}".format(self._parts, self._buffered, self.path))
+        self.rows += self._buffered
+        self._parts += 1
+        self._buffered = 0
+        for column in self._columns.values():
+            column.clear()
+
+    def _write_arrow(self):
+        table = pyarrow.Table.from_pydict(self._columns)
+        if self._writer is not None:
+            self._write_table(table.cast(self._schema))
+            return
+
+        self._pending.append(table)
+        self._write_pending(force=False)
+
+    def _write_pending(self, force: bool):
+        """Opens the writer with the unified schema of the pending row groups and writes them,
+        unless a column is still untyped (all None) and the sink isn't being closed
+        """
+
+        if not self._pending:
+            return
+
+        schemas = [table.schema for table in self._pending]
+        try:
+            schema = pyarrow.unify_schemas(schemas, promote_options="permissive")
+        except TypeError:
+            # pyarrow < 14 only promotes null fields
+            schema = pyarrow.unify_schemas(schemas)
+        if not force and any(pyarrow.types.is_null(field.type) for field in schema):
+            return
+
+        self._schema = schema
+        if self.output_format == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, self._schema)
+        else:
+            self._writer = pyarrow.ipc.new_file(self.path, self._schema)
+        for table in self._pending:
+            self._write_table(table.cast(self._schema))
+        self._pending = []
+
+    def _write_table(self, table):
+        if self.output_format == "parquet":
+            self._writer.write_table(table, row_group_size=table.num_rows)
+        else:
+            for batch in table.to_batches():
+                self._writer.write_batch(batch)
+
+    def _write_numpy(self):
+        arrays = {key: to_array(column) for key, column in self._columns.items()}
+        part_name = "part-{:05d}".format(self._parts)
+        if self.output_format == "npz":
+            np.savez(os.path.join(self.path, part_name + ".npz"), **arrays)
+            return
+
+        part_path = os.path.join(self.path, part_name)
+        os.makedirs(part_path, exist_ok=True)
+        for key, array in arrays.items():
+            np.save(os.path.join(part_path, urllib.parse.quote(key, safe="") + ".npy"), array)
+
+    def close(self):
+        self.flush()
+        if self.output_format in self.ARROW_FORMATS:
+            self._write_pending(force=True)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def to_array(values: list) -> np.ndarray:
+    """Stacks column values into an array, falling back to an object array for ragged or mixed values
+    """
+
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        array = None
+    if array is None or array.shape[:1] != (len(values), ):
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+    return array
+
+
+def load_array(path: str, mmap: bool) -> np.ndarray:
+    """Loads a .npy file, memory-mapped read-only if requested and the array doesn't hold Python objects
+    """
+
+    if mmap:
+        try:
+            return np.load(path, mmap_mode="r")
+        except ValueError:
+            pass
+    return np.load(path, allow_pickle=True)
+
+
+def read_columns(path: str, mmap: bool = False) -> dict:
+    """Reads columns written by ColumnarSink
+
+    Parameters
+    ----------
+    path : str
+        output file or directory of the sink
+    mmap : bool
+        memory-map the arrays of every row group of the npy format instead of reading and concatenating them
+
+    Returns
+    -------
+    dict
+        column -> array with all records, or a list of arrays (one per row group) when memory-mapped
+    """
+
+    if os.path.isfile(path):
+        if pyarrow is None:
+            raise RuntimeError("Reading {} requires pyarrow".format(path))
+        with open(path, "rb") as fp:
+            magic = fp.read(4)
+        if magic == b"PAR1":
+            table = pyarrow.parquet.read_table(path)
+        else:
+            with pyarrow.ipc.open_file(path) as reader:
+                table = reader.read_all()
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+
+    parts = {}
+    for part_name in sorted(os.listdir(path)):
+        part_path = os.path.join(path, part_name)
+        if part_name.endswith(".npz"):
+            with np.load(part_path, allow_pickle=True) as data:
+                for key in data.files:
+                    parts.setdefault(key, []).append(data[key])
+        elif os.path.isdir(part_path):
+            for file_name in sorted(os.listdir(part_path)):
+                key = urllib.parse.unquote(file_name[:-len(".npy")])
+                parts.setdefault(key, []).append(load_array(os.path.join(part_path, file_name), mmap))
+
+    if mmap:
+        return parts
+    return {key: np.concatenate(arrays) for key, arrays in parts.items()}
@@ -0,0 +1,245 @@
+import json
+import logging
+import os
+import threading
+import time
+import typing
+from .checkpoint import NumpySerializer, PickleSerializer
+from .condition import SKIPPED
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+
+class TraceRecorder:
+    """
+    Records pipeline executions into a trace directory: plain scalars inline in the index, other values in their own file
+    (NumPy arrays as .npy) and component start offsets and durations of every record.
+
+    ...
+
+    Methods
+    -------
+    start_record(inputs: dict)
+        starts a new record, returns its id
+    record_component(record_id: int, component_id: str, outputs: dict, start: float, duration: float)
+        stores outputs and timing of a finished component
+    finish_record(record_id: int, outputs: dict)
+        stores pipeline outputs and writes the index
+    fail_record(record_id: int, error: BaseException)
+        marks a record whose execution raised as failed and writes the index
+    """
+
+    INDEX_FILE = "index.json"
+    INLINE_TYPES = (str, int, float, bool)
+
+    def __init__(self, path: str, serializers: typing.Optional[list] = None):
+        """
+        Parameters
+        ----------
+        path : str
+            trace directory, records are appended if it already contains a trace
+        serializers : list
+            serializers in order of preference
+        """
+
+        self.path = path
+        self._serializers = serializers or [NumpySerializer(), PickleSerializer()]
+        self._lock = threading.Lock()
+        self._starts = {}
+
+        os.makedirs(path, exist_ok=True)
+        index_path = os.path.join(path, self.INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as fp:
+                self._index = json.load(fp)
+        else:
+            self._index = {"records": []}
+        self._files = sum(len(record["files"]) for record in self._index["records"])
+
+    def _save_values(self, record: dict, values: dict) -> dict:
+        entries = {}
+        for key, value in values.items():
+            if value is None or type(value) in self.INLINE_TYPES:
+                entries[key] = {"value": value}
+                continue
+
+            serializer = next(serializer for serializer in self._serializers if serializer.can_serialize(value))
+            file_name = "{}{}".format(self._files, serializer.suffix)
+            self._files += 1
+            serializer.save(value, os.path.join(self.path, file_name))
+            record["files"].append(file_name)
+            entries[key] = {"serializer": serializer.name, "file": file_name}
+        return entries
+
+    def start_record(self, inputs: dict) -> int:
+        with self._lock:
+            record = {"inputs": {}, "components": {}, "outputs": {}, "files": []}
+            record["inputs"] = self._save_values(record, inputs)
+            self._index["records"].append(record)
+            record_id = len(self._index["records"]) - 1
+            self._starts[record_id] = time.perf_counter()
+            return record_id
+
+    def get_offset(self, record_id: int) -> float:
+        """Seconds since the record started
+        """
+
+        return time.perf_counter() - self._starts[record_id]
+
+    def record_component(self, record_id: int, component_id: str, outputs: dict, start: float, duration: float):
+        with self._lock:
+            record = self._index["records"][record_id]
+            entry = {"start": start, "duration": duration}
+            if outputs is SKIPPED:
+                entry["skipped"] = True
+            else:
+                entry["outputs"] = self._save_values(record, outputs or {})
+            record["components"][component_id] = entry
+
+    def finish_record(self, record_id: int, outputs: dict):
+        with self._lock:
+            record = self._index["records"][record_id]
+            record["outputs"] = self._save_values(record, outputs)
+            record["duration"] = time.perf_counter() - self._starts.pop(record_id)
+            self._write_index()
+
+    def fail_record(self, record_id: int, error: BaseException):
+        """Marks the record as failed, components finished before the error stay recorded
+        """
+
+        with self._lock:
+            record = self._index["records"][record_id]
+            record["failed"] = "{}: {}".format(error.__class__.__name__, error)
+            record["duration"] = time.perf_counter() - self._starts.pop(record_id)
+            self._write_index()
+
+    def _write_index(self):
+        index_path = os.path.join(self.path, self.INDEX_FILE)
+        with open(index_path + ".tmp", "w") as fp:
+            json.dump(self._index, fp)
+        os.replace(index_path + ".tmp", index_path)
+
+
+class TraceReplayer:
+    """
+    Replays single components or subgraphs of a pipeline against values recorded by TraceRecorder.
+    Recorded arrays are memory-mapped read-only.
+
+    ...
+
+    Methods
+    -------
+    load_result(record_id: int)
+        returns recorded inputs and outputs of all components
+    get_durations(record_id: int)
+        returns recorded durations of components
+    replay(pipeline: Pipeline, component_ids: list, record_id: int, repeat: int)
+        executes the components with upstream values from the trace
+    """
+
+    def __init__(self, path: str, serializers: typing.Optional[list] = None):
+        """
+        Parameters
+        ----------
+        path : str
+            trace directory
+        serializers : list
+            serializers the trace was written with
+        """
+
+        self.path = path
+        serializers = serializers or [NumpySerializer(), PickleSerializer()]
+        self._serializers = {serializer.name: serializer for serializer in serializers}
+        with open(os.path.join(path, TraceRecorder.INDEX_FILE)) as fp:
+            self._index = json.load(fp)
+
+    def __len__(self):
+        return len(self._index["records"])
+
+    def _load_values(self, entries: dict) -> dict:
+        values = {}
+        for key, entry in entries.items():
+            if "value" in entry:
+                values[key] = entry["value"]
+                continue
+            values[key] = self._serializers[entry["serializer"]].load(os.path.join(self.path, entry["file"]))
+        return values
+
+    def load_result(self, record_id: int = 0) -> dict:
+        """Loads the record in the format of the pipeline result dictionary
+
+        Parameters
+        ----------
+        record_id : int
+            record to load
+
+        Returns
+        -------
+        dict
+            All inputs an outputs from processing
+        """
+
+        record = self._index["records"][record_id]
+        result = self._load_values(record["inputs"])
+        for component_id, entry in record["components"].items():
+            result[component_id] = SKIPPED if entry.get("skipped") else self._load_values(entry["outputs"])
+        return result
+
+    def get_durations(self, record_id: int = 0) -> dict:
+        return {component_id: entry["duration"] for component_id, entry in self._index["records"][record_id]["components"].items()}
+
+    def replay(self, pipeline, component_ids: list, record_id: int = 0, repeat: int = 1) -> dict:
+        """Executes the components in running order. Components outside of the given ones get their recorded outputs,
+        so the replayed subgraph sees the same upstream values as the recorded execution.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            pipeline with the components to replay, e.g. built from a changed config
+        component_ids : list
+            components to execute
+        record_id : int
+            record to replay
+        repeat : int
+            number of repetitions, the fastest one is reported
+
+        Returns
+        -------
+        dict
+            component_id -> {"outputs": outputs, "duration": seconds, "recorded_duration": seconds}
+
+        Raises
+        ------
+        RuntimeError
+            If a component is not in the pipeline or the record failed
+        """
+
+        unknown = set(component_ids) - set(pipeline.components)
+        if unknown:
+            raise RuntimeError("Components {} are not in the pipeline".format(sorted(unknown)))
+        if "failed" in self._index["records"][record_id]:
+            raise RuntimeError("Record {} failed: {}".format(record_id, self._index["records"][record_id]["failed"]))
+
+        recorded_durations = self.get_durations(record_id)
+        base_result = self.load_result(record_id)
+        replayed = {}
+        for _ in range(max(repeat, 1)):
+            result = dict(base_result)
+            for component_id in pipeline.running_order:
+                if component_id not in component_ids:
+                    continue
+
+                start = time.perf_counter()
+                result[component_id] = pipeline.execute_component(component_id, result)
+                duration = time.perf_counter() - start
+
+                if component_id not in replayed or duration < replayed[component_id]["duration"]:
+                    replayed[component_id] = {
+                        "outputs": result[component_id],
+                        "duration": duration,
+                        "recorded_duration": recorded_durations.get(component_id),
+                    }
+        return replayed
@@ -0,0 +1,153 @@
+import logging
+import multiprocessing
+import multiprocessing.pool
+import os
+import pickle
+import queue
+import time
+import traceback
+import typing
+from .pipeline import Pipeline
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
+
+PRELOAD_MODULES = ["yaml", "numpy", "mlpipeline.pipeline"]
+
+# pipeline of a worker process, never set in the parent
+_worker_pipeline = None
+_worker_error = None
+
+
+def _initialize_worker(pipeline: typing.Union[Pipeline, bytes], ready_queue):
+    """Sets the worker pipeline, inherited by fork or unpickled from the snapshot. Failures are reported
+    to the parent through the ready queue instead of raised, which would make the pool restart the worker forever
+    """
+
+    global _worker_pipeline, _worker_error
+    try:
+        _worker_pipeline = pickle.loads(pipeline) if isinstance(pipeline, bytes) else pipeline
+    except Exception:
+        _worker_error = traceback.format_exc()
+        ready_queue.put((os.getpid(), _worker_error))
+        return
+    ready_queue.put((os.getpid(), None))
+
+
+def _execute(inputs: dict) -> dict:
+    if _worker_pipeline is None:
+        raise RuntimeError("Worker pipeline isn't initialized: {}".format(_worker_error))
+    return _worker_pipeline.execute(inputs)
+
+
+class PipelineWorkerPool:
+    """
+    Process pool executing records on copies of a pipeline built once in the parent.
+
+    With the "fork" start method workers inherit the built pipeline (passed to the forked workers, not stored
+    in the parent) and all imported modules. With "forkserver"
+    the fork server preloads the heavy modules once, workers are forked from it and get the pipeline as a pickled
+    snapshot made once in the parent. "spawn" also uses the snapshot but imports everything in every worker.
+
+    ...
+
+    Methods
+    -------
+    wait_ready(timeout: float)
+        waits until all workers are initialized, raises if any failed
+    map(inputs_list: list)
+        executes records, returns their outputs
+    submit(inputs: dict)
+        executes a record asynchronously
+    close()
+        stops the workers
+    """
+
+    def __init__(self, pipeline: Pipeline, processes: typing.Optional[int] = None, start_method: typing.Optional[str] = None,
+                 preload_modules: typing.Optional[list] = None):
+        """
+        Parameters
+        ----------
+        pipeline : Pipeline
+            built pipeline, e.g. from PipelineBuilder
+        processes : int
+            number of workers, cpu count by default
+        start_method : str
+            "fork", "forkserver" or "spawn", forkserver when available by default
+        preload_modules : list
+            modules imported by the fork server, yaml, numpy, mlpipeline and the modules of the components by default
+        """
+
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.start_method = start_method
+        self.processes = processes or os.cpu_count() or 1
+        context = multiprocessing.get_context(start_method)
+
+        if preload_modules is None:
+            preload_modules = PRELOAD_MODULES + sorted(set(component.__class__.__module__ for component in pipeline.components.values()))
+        if start_method == "forkserver":
+            context.set_forkserver_preload(preload_modules)
+
+        self._start = time.perf_counter()
+        # forked workers get the initializer arguments without pickling
+        worker_pipeline = pipeline if start_method == "fork" else pickle.dumps(pipeline)
+
+        self._ready_queue = context.Queue()
+        self._ready_time = None
+        self._pool = context.Pool(self.processes, _initialize_worker, (worker_pipeline, self._ready_queue))
+
+    def wait_ready(self, timeout: typing.Optional[float] = 60.0) -> float:
+        """Waits until all workers have the pipeline
+
+        Parameters
+        ----------
+        timeout : float
+            seconds to wait for all workers, no limit if None
+
+        Returns
+        -------
+        float
+            seconds from creating the pool until the last worker was ready
+
+        Raises
+        ------
+        RuntimeError
+            If a worker failed to initialize or the workers weren't ready in time
+        """
+
+        if self._ready_time is None:
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            for _ in range(self.processes):
+                try:
+                    pid, error = self._ready_queue.get(timeout=max(deadline - time.monotonic(), 0.0) if deadline is not None else None)
+                except queue.Empty:
+                    raise RuntimeError("Workers weren't ready in {}s".format(timeout))
+                if error is not None:
+                    L.error("Worker {} failed to initialize, shutting down".format(pid))
+                    raise RuntimeError("Worker {} failed to initialize:\n{}".format(pid, error))
+            self._ready_time = time.perf_counter() - self._start
+            L.info("{} {} workers ready in {:.3f}s".format(self.processes, self.start_method, self._ready_time))
+        return self._ready_time
+
+    def map(self, inputs_list: list, chunksize: int = 1) -> list:
+        return self._pool.map(_execute, inputs_list, chunksize)
+
+    def submit(self, inputs: dict) -> multiprocessing.pool.AsyncResult:
+        return self._pool.apply_async(_execute, (inputs, ))
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._pool.terminate()
+            self._pool.join()
@@ -1,20 +1,221 @@
 import argparse
-from .pipeline import PipelineBuilder
+import json
+import logging
+import sys
+import uuid
+from .pipeline import Pipeline, PipelineBuilder, PipelineReloader, open_checkpoint_store, RuntimeHistory, SequentialExecutor, ParallelExecutor
+from .pipeline import TraceRecorder, TraceReplayer, PipelineWorkerPool, ConcurrencyController, GraphUtils, GraphAnalysis, ComponentABC, ColumnarSink
+from .pipeline import CancellationToken, Cancelled
+
+##
+L = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+##
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "analyze":
+        analyze(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="Should parse config file, read the input and run the pipeline")
     parser.add_argument("--file", type=str, required=True, help="Config file path")
     parser.add_argument("--inputs", type=str, help="Input parameters", nargs="+")
+    parser.add_argument("--checkpoint", type=str, help="Checkpoint directory or sqlite file (.db, .sqlite)")
+    parser.add_argument("--run-id", type=str, help="Run id for checkpoints, generated when missing")
+    parser.add_argument("--resume", type=str, metavar="RUN_ID", help="Resume a checkpointed run, completed components are reloaded")
+    parser.add_argument("--workers", type=int, help="Run independent components in parallel with this many threads")
+    parser.add_argument("--schedule", type=str, default="priority", choices=ParallelExecutor.POLICIES, help="Order of ready components")
+    parser.add_argument("--runtime-history", type=str, help="Json file with recorded component runtimes, updated after the run")
+    parser.add_argument("--check-rate", type=float, help="Share of component calls validated against declared port types")
+    parser.add_argument("--watch", action="store_true", help="Execute inputs from stdin lines, reloading changed config or components")
+    parser.add_argument("--record", type=str, metavar="TRACE_DIR", help="Record inputs, component outputs and timings into a trace")
+    parser.add_argument("--replay", type=str, metavar="TRACE_DIR", help="Replay components against upstream values from a trace")
+    parser.add_argument("--components", type=str, nargs="+", help="Components to replay, all by default")
+    parser.add_argument("--record-id", type=int, default=0, help="Trace record to replay")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of replay repetitions")
+    parser.add_argument("--inputs-file", type=str, help="File with inputs of one record (key=value pairs) per line")
+    parser.add_argument("--processes", type=int, help="Execute records of --inputs-file in this many worker processes")
+    parser.add_argument("--start-method", type=str, choices=["fork", "forkserver", "spawn"], help="Start method of worker processes")
+    parser.add_argument("--prefetch", type=int, help="Prefetch source components of this many next records of --inputs-file")
+    parser.add_argument("--isolation", type=str, choices=ComponentABC.ISOLATION_MODES, help="Isolation of components from upstream outputs")
+    parser.add_argument("--fuse", action="store_true", help="Fuse chains of components marked fusable into single units")
+    parser.add_argument("--fuse-threshold", type=float, help="Also fuse components with recorded runtime under this many seconds")
+    parser.add_argument("--build-workers", type=int, help="Number of threads constructing and setting up components")
+    parser.add_argument("--warm-up", action="store_true", help="Set up lazy components in background right after the build")
+    parser.add_argument("--output", type=str, help="Write outputs of --inputs-file records in columns to this file or directory")
+    parser.add_argument("--output-format", type=str, choices=ColumnarSink.FORMATS, help="Columnar format, parquet or npz by default")
+    parser.add_argument("--row-group-size", type=int, default=65536, help="Number of records written at once")
+    parser.add_argument("--adaptive", action="store_true", help="Adapt concurrency per runner class to latency, prints its metrics")
+    parser.add_argument("--timeout", type=float, help="Latency budget of a record in seconds, late records are abandoned or shed")
     args = parser.parse_args()
 
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+    if args.resume and args.run_id:
+        parser.error("--resume and --run-id can't be combined, the resumed run keeps its id")
+    if args.timeout is not None and (args.processes or args.prefetch or args.watch):
+        parser.error("--timeout can't be combined with --processes, --prefetch or --watch")
+
+    checkpoint_store = None
+    run_id = None
+    if args.checkpoint:
+        checkpoint_store = open_checkpoint_store(args.checkpoint)
+        run_id = args.resume or args.run_id or uuid.uuid4().hex
+
     inputs = {}
     if args.inputs:
         for arg in args.inputs:
             key, value = arg.split("=")
             inputs[key] = value
+    elif args.resume:
+        inputs = checkpoint_store.load(run_id, Pipeline.RUN_INPUTS_ID, Pipeline.RUN_INPUTS_HASH)
+
+    runtime_history = RuntimeHistory(args.runtime_history)
+    controller = ConcurrencyController() if args.adaptive else None
+    if args.workers:
+        executor = ParallelExecutor(args.workers, runtime_history=runtime_history, policy=args.schedule, controller=controller)
+    else:
+        executor = SequentialExecutor(runtime_history)
 
     config_path = args.file
-    pipeline_builder = PipelineBuilder("mlpipeline.custom")
+    pipeline_builder = PipelineBuilder(
+        "mlpipeline.custom", executor, args.check_rate, args.isolation, args.fuse, args.fuse_threshold, args.build_workers, args.warm_up
+    )
+    if args.watch:
+        watch(PipelineReloader(config_path, "mlpipeline.custom", pipeline_builder), runtime_history)
+        return
+
     pipeline = pipeline_builder.build_pipeline(config_path)
-    pipeline.execute(inputs)
+    if args.replay:
+        replay(pipeline, TraceReplayer(args.replay), args.components or pipeline.running_order, args.record_id, args.repeat)
+        return
+
+    if args.inputs_file:
+        sink = ColumnarSink(args.output, args.row_group_size, args.output_format) if args.output else None
+        execute_file(pipeline, args.inputs_file, args.processes, args.start_method, args.prefetch, controller, sink, args.timeout)
+        if controller is not None:
+            print(json.dumps(controller.get_metrics(), indent=2, sort_keys=True))
+        return
+
+    recorder = TraceRecorder(args.record) if args.record else None
+    token = CancellationToken(args.timeout) if args.timeout is not None else None
+    pipeline.execute(inputs, run_id, checkpoint_store, recorder, token)
+    runtime_history.save()
+
+
+def analyze(argv: list):
+    """Prints the critical path analysis of a pipeline with durations from a runtime history or a trace,
+    optionally exports the graph annotated with the durations
+    """
+
+    parser = argparse.ArgumentParser(prog="pipeline_cli analyze", description="Critical path analysis of a pipeline with measured durations")
+    parser.add_argument("--file", type=str, required=True, help="Config file path")
+    parser.add_argument("--runtime-history", type=str, help="Json file with recorded runtimes per runner class")
+    parser.add_argument("--trace", type=str, metavar="TRACE_DIR", help="Trace with recorded durations per component, averaged over records")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8], help="Numbers of workers to estimate speedup with")
+    parser.add_argument("--dot", type=str, help="Export the annotated graph to this Graphviz file")
+    args = parser.parse_args(argv)
+
+    if not args.runtime_history and not args.trace:
+        parser.error("--runtime-history or --trace is required")
+
+    pipeline = PipelineBuilder("mlpipeline.custom").build_pipeline(args.file)
+    if args.trace:
+        replayer = TraceReplayer(args.trace)
+        totals = {}
+        for record_id in range(len(replayer)):
+            for component_id, duration in replayer.get_durations(record_id).items():
+                totals.setdefault(component_id, []).append(duration)
+        durations = {component_id: sum(values) / len(values) for component_id, values in totals.items()}
+    else:
+        runtime_history = RuntimeHistory(args.runtime_history)
+        durations = {component_id: runtime_history.get(component.runner) for component_id, component in pipeline.components.items()}
+
+    graph = GraphUtils().get_graph(pipeline.components, pipeline.inputs, pipeline.outputs)
+    analysis = GraphAnalysis(graph, durations)
+    print(analysis.get_report(args.workers))
+
+    if args.dot:
+        with open(args.dot, "w") as fp:
+            fp.write(analysis.to_dot(pipeline.name))
+
+
+def execute_file(pipeline: Pipeline, inputs_path: str, processes: int, start_method: str, prefetch: int = None,
+                 controller: ConcurrencyController = None, sink: ColumnarSink = None, timeout: float = None):
+    """Executes every record of the inputs file, in worker processes forked from the built pipeline
+    or streamed with prefetching of source components if requested. Outputs are written to the sink if given.
+    With a timeout records missing their deadline are dropped and the number of records completed in time is printed
+    """
+
+    with open(inputs_path) as fp:
+        inputs_list = [dict(arg.split("=") for arg in line.split()) for line in fp if line.strip()]
+
+    if prefetch and not processes:
+        outputs_iterable = pipeline.execute_stream(inputs_list, prefetch, controller=controller)
+    elif timeout is not None:
+        outputs_iterable = execute_with_deadlines(pipeline, inputs_list, timeout)
+    elif not processes:
+        outputs_iterable = (pipeline.execute(inputs) for inputs in inputs_list)
+    else:
+        with PipelineWorkerPool(pipeline, processes, start_method) as pool:
+            pool.wait_ready()
+            outputs_iterable = pool.map(inputs_list)
+
+    try:
+        for outputs in outputs_iterable:
+            if sink is not None:
+                sink.write(outputs)
+    finally:
+        # the footer is written even if a record fails, so the records written so far stay readable
+        if sink is not None:
+            sink.close()
+
+
+def execute_with_deadlines(pipeline: Pipeline, inputs_list: list, timeout: float):
+    """Yields outputs of records completed within timeout seconds each
+    """
+
+    completed = 0
+    for inputs in inputs_list:
+        try:
+            outputs = pipeline.execute(inputs, token=CancellationToken(timeout))
+        except Cancelled as error:
+            L.warning("Dropped record {}: {}".format(inputs, error))
+            continue
+        completed += 1
+        yield outputs
+    L.info("Completed {} of {} records within {}s".format(completed, len(inputs_list), timeout))
+
+
+def replay(pipeline: Pipeline, replayer: TraceReplayer, component_ids: list, record_id: int, repeat: int):
+    """Prints replayed and recorded duration of every component
+    """
+
+    replayed = replayer.replay(pipeline, component_ids, record_id, repeat)
+    for component_id in pipeline.running_order:
+        if component_id in replayed:
+            print("{}: {:.6f}s (recorded {:.6f}s)".format(
+                component_id, replayed[component_id]["duration"], replayed[component_id]["recorded_duration"] or 0.0
+            ))
+
+
+def watch(reloader: PipelineReloader, runtime_history: RuntimeHistory):
+    """Executes inputs from every stdin line (key=value pairs) until the end of input,
+    malformed lines and failed executions are logged and skipped
+    """
+
+    reloader.start()
+    try:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            try:
+                inputs = dict(arg.split("=") for arg in line.split())
+                reloader.execute(inputs)
+            except Exception:
+                L.exception("Executing {!r} failed".format(line.strip()))
+                continue
+            runtime_history.save()
+    finally:
+        reloader.stop()
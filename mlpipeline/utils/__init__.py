@@ -1 +1,3 @@
-from .string_utils import get_keys_values, get_component_message, get_pipeline_message  # noqa: F401
+from .string_utils import get_keys_values, get_component_message, get_pipeline_message, get_batch_message  # noqa: F401
+from .hash_utils import get_inputs_hash  # noqa: F401
+from .resource_utils import parse_memory, parse_resources  # noqa: F401
@@ -0,0 +1,41 @@
+import collections.abc
+import hashlib
+import pickle
+import numpy as np
+
+
+def get_inputs_hash(inputs: dict) -> str:
+    """Stable hash of component or pipeline inputs
+
+    Keys are hashed in sorted order, NumPy arrays by dtype, shape and raw bytes,
+    everything else by the pickled form of its canonical version, so the hash doesn't depend on PYTHONHASHSEED.
+    """
+
+    digest = hashlib.sha256()
+    for key in sorted(inputs):
+        digest.update(str(key).encode())
+        value = inputs[key]
+        if isinstance(value, np.ndarray):
+            digest.update(str(value.dtype).encode())
+            digest.update(str(value.shape).encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            digest.update(pickle.dumps(canonicalize(value), protocol=4))
+    return digest.hexdigest()
+
+
+def canonicalize(value):
+    """Equivalent value with a deterministic pickled form: sets and dict items are sorted by the pickled form of their
+    canonical elements (their iteration order depends on string hashing), nested arrays are replaced by dtype, shape and bytes
+    """
+
+    if isinstance(value, np.ndarray):
+        return ("ndarray", str(value.dtype), value.shape, np.ascontiguousarray(value).tobytes())
+    if isinstance(value, collections.abc.Mapping):
+        items = [(canonicalize(key), canonicalize(item)) for key, item in value.items()]
+        return ("dict", sorted(items, key=lambda item: pickle.dumps(item[0], protocol=4)))
+    if isinstance(value, (set, frozenset)):
+        return ("set", sorted((canonicalize(item) for item in value), key=lambda item: pickle.dumps(item, protocol=4)))
+    if isinstance(value, (list, tuple)) or (isinstance(value, collections.abc.Sequence) and not isinstance(value, (str, bytes, bytearray))):
+        return (type(value).__name__, [canonicalize(item) for item in value])
+    return value
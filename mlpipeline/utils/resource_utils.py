@@ -0,0 +1,44 @@
+MEMORY_UNITS = {
+    "": 1,
+    "K": 1024,
+    "M": 1024 ** 2,
+    "G": 1024 ** 3,
+    "T": 1024 ** 4,
+}
+
+
+def parse_memory(value) -> int:
+    """Converts memory amount like 512M, 2G or 2Gi to bytes
+    """
+
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    text = str(value).strip().upper()
+    if text.endswith("IB"):
+        text = text[:-2]
+    elif text.endswith("I") or text.endswith("B"):
+        text = text[:-1]
+
+    unit = text[-1:] if text[-1:] in MEMORY_UNITS else ""
+    number = text[:len(text) - len(unit)]
+    try:
+        return int(float(number) * MEMORY_UNITS[unit])
+    except ValueError:
+        raise RuntimeError("Incorrect memory amount {}".format(value))
+
+
+def parse_resources(resources: dict) -> dict:
+    """Normalizes resource tags from config, memory is converted to bytes and the rest to floats
+    """
+
+    parsed = {}
+    for name, value in (resources or {}).items():
+        if name == "memory":
+            parsed[name] = parse_memory(value)
+        else:
+            try:
+                parsed[name] = float(value)
+            except (TypeError, ValueError):
+                raise RuntimeError("Incorrect amount of resource {}: {}".format(name, value))
+    return parsed
@@ -3,7 +3,7 @@ import time
 
 def get_keys_values(keys_values: dict) -> str:
     message = ""
-    for k, v in keys_values.items():
+    for k, v in (keys_values or {}).items():
         message += k + "=" + str(v) + " "
     return message
 
@@ -24,3 +24,10 @@ def get_pipeline_message(keys_values: dict, prefix: str) -> str:
     """
 
     return "{}: pipeline : {} - {}".format(int(time.time()), prefix, get_keys_values(keys_values))
+
+
+def get_batch_message(name, class_name, batch_size: int) -> str:
+    """Log message formatting for batches
+    """
+
+    return "{}: {} - {}: batch of {} records".format(int(time.time()), name, class_name, batch_size)
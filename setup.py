@@ -18,4 +18,7 @@ setup(
         "numpy",
         "importlib"
     ],
+    extras_require={
+        "arrow": ["pyarrow"]
+    },
 )
@@ -3,4 +3,21 @@ from .test_pipeline import TestPipeline  # noqa: F401
 from .test_pipeline_builder import TestPipelineBuilder  # noqa: F401
 from .test_config_parser import TestConfigParser  # noqa: F401
 from .test_graph_utils import TestGraphUtils  # noqa: F401
-
+from .test_checkpoint import TestCheckpoint  # noqa: F401
+from .test_executor import TestExecutor  # noqa: F401
+from .test_port_type import TestPortType  # noqa: F401
+from .test_sub_pipeline import TestSubPipeline  # noqa: F401
+from .test_condition import TestCondition  # noqa: F401
+from .test_user_components import TestUserComponents  # noqa: F401
+from .test_pipeline_reloader import TestPipelineReloader  # noqa: F401
+from .test_trace import TestTrace  # noqa: F401
+from .test_worker_pool import TestWorkerPool  # noqa: F401
+from .test_stream import TestStream  # noqa: F401
+from .test_concurrency_controller import TestConcurrencyController  # noqa: F401
+from .test_graph_analysis import TestGraphAnalysis  # noqa: F401
+from .test_isolation import TestIsolation  # noqa: F401
+from .test_fusion import TestFusion  # noqa: F401
+from .test_build import TestBuild  # noqa: F401
+from .test_sink import TestSink  # noqa: F401
+from .test_single_flight import TestSingleFlight  # noqa: F401
+from .test_deadline import TestDeadline  # noqa: F401
@@ -0,0 +1,40 @@
+import time
+import unittest
+from mlpipeline.pipeline import ConfigParser, PipelineBuilder
+
+
+class TestBuild(unittest.TestCase):
+    def test_parallel_setup(self):
+        start = time.perf_counter()
+        pipeline = PipelineBuilder("mlpipeline.custom").build_pipeline("data/models.yaml")
+        build_time = time.perf_counter() - start
+
+        # four eager models of 0.2s are set up concurrently, the four lazy ones are deferred
+        self.assertLess(build_time, 0.6)
+        self.assertTrue(all(pipeline.components["model_{}".format(i)].model == 0.2 for i in range(4)))
+        self.assertTrue(all(pipeline.components["model_{}".format(i)].model is None for i in range(4, 8)))
+
+        self.assertEqual(pipeline.execute({"document_id": "D0"}), {"merge.document_id": "D0"})
+        self.assertTrue(all(pipeline.components["model_{}".format(i)].model == 0.2 for i in range(8)))
+
+    def test_warm_up(self):
+        pipeline = PipelineBuilder("mlpipeline.custom", build_workers=8).build_pipeline("data/models.yaml")
+        pipeline.warm_up().join(timeout=10)
+        self.assertTrue(all(component._is_setup for component in pipeline.components.values()))
+
+        builder = PipelineBuilder("mlpipeline.custom", warm_up=True)
+        pipeline = builder.build_pipeline("data/models.yaml")
+        self.assertEqual(pipeline.execute({"document_id": "D1"}), {"merge.document_id": "D1"})
+
+    def test_failed_validation(self):
+        with self.assertRaises(RuntimeError):
+            PipelineBuilder("mlpipeline.custom", build_workers=4).build_pipeline("data/misspelled.yaml")
+
+    def test_failed_validation_with_slow_setup(self):
+        # components are parsed once and reused by the build, so their state can be checked after it fails
+        components = ConfigParser().parse_config("data/broken_models.yaml", "mlpipeline.custom")[3]
+        with self.assertRaises(RuntimeError):
+            PipelineBuilder("mlpipeline.custom", build_workers=1).build_pipeline("data/broken_models.yaml", components)
+        # the link error is raised while the first model is still loading, the second one is never set up
+        self.assertIsNone(components["model_0"].model)
+        self.assertFalse(components["model_1"]._is_setup)
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+from mlpipeline.pipeline import Component, Pipeline, DirectoryCheckpointStore, SqliteCheckpointStore, open_checkpoint_store
+from mlpipeline.utils import get_inputs_hash
+
+
+class TestCheckpoint(unittest.TestCase):
+    def test_directory_store(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = DirectoryCheckpointStore(root)
+            self.assertFalse(store.has("run", "a", "hash"))
+
+            store.save("run", "a", "hash", {"array": np.arange(4), "text": "A1"})
+            self.assertTrue(store.has("run", "a", "hash"))
+
+            outputs = store.load("run", "a", "hash")
+            self.assertIsInstance(outputs["array"], np.memmap)
+            self.assertEqual(outputs["array"].tolist(), [0, 1, 2, 3])
+            self.assertEqual(outputs["text"], "A1")
+
+    def test_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = open_checkpoint_store(os.path.join(root, "checkpoints.db"))
+            self.assertIsInstance(store, SqliteCheckpointStore)
+
+            store.save("run", "a", "hash", {"array": np.ones((2, 2)), "text": "A1"})
+            self.assertTrue(store.has("run", "a", "hash"))
+            self.assertFalse(store.has("other_run", "a", "hash"))
+
+            outputs = store.load("run", "a", "hash")
+            self.assertEqual(outputs["array"].tolist(), [[1.0, 1.0], [1.0, 1.0]])
+            self.assertEqual(outputs["text"], "A1")
+
+    def test_resume(self):
+        components = {
+            "a": CountingComponent("a", {"inputs": ["x"], "outputs": ["y"]}),
+            "b": FailingComponent("b", {"inputs": ["a.y"], "outputs": ["z"]}),
+        }
+        pipeline = Pipeline("test", set(["x"]), set(["b.z"]), components, ["a", "b"])
+
+        with tempfile.TemporaryDirectory() as root:
+            store = DirectoryCheckpointStore(root)
+            with self.assertRaises(ValueError):
+                pipeline.execute({"x": 1}, "run", store)
+            self.assertEqual(components["a"].calls, 1)
+
+            components["b"].fail = False
+            self.assertEqual(pipeline.execute({"x": 1}, "run", store), {"b.z": 3})
+            self.assertEqual(components["a"].calls, 1)
+
+            self.assertEqual(store.load("run", Pipeline.RUN_INPUTS_ID, Pipeline.RUN_INPUTS_HASH), {"x": 1})
+
+    def test_no_outputs(self):
+        components = {"a": Component("a", {"inputs": ["x"]})}
+        pipeline = Pipeline("test", set(["x"]), set(), components, ["a"])
+        with tempfile.TemporaryDirectory() as root:
+            for store in [DirectoryCheckpointStore(root), open_checkpoint_store(os.path.join(root, "checkpoints.db"))]:
+                self.assertEqual(pipeline.execute({"x": 1}, "run", store), {})
+                self.assertEqual(pipeline.execute({"x": 1}, "run", store), {})
+                self.assertTrue(store.has("run", "a", get_inputs_hash({"x": 1})))
+                self.assertIsNone(store.load("run", "a", get_inputs_hash({"x": 1})))
+
+    def test_inputs_hash_is_stable(self):
+        script = "from mlpipeline.utils import get_inputs_hash; " \
+            "print(get_inputs_hash({'tags': set('abcdefgh'), 'meta': {'b': frozenset(['x', 'y']), 'a': [1]}}))"
+        hashes = set()
+        for seed in ["1", "2", "3"]:
+            environment = dict(os.environ, PYTHONHASHSEED=seed)
+            hashes.add(subprocess.run([sys.executable, "-c", script], env=environment, capture_output=True, text=True, check=True).stdout)
+        self.assertEqual(len(hashes), 1)
+
+
+class CountingComponent(Component):
+    calls = 0
+
+    def process(self, inputs: dict) -> dict:
+        self.calls += 1
+        return {"y": inputs["x"] + 1}
+
+
+class FailingComponent(Component):
+    fail = True
+
+    def process(self, inputs: dict) -> dict:
+        if self.fail:
+            raise ValueError("failed")
+        return {"z": inputs["y"] + 1}
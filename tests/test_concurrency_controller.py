@@ -0,0 +1,52 @@
+import pickle
+import unittest
+from mlpipeline.pipeline import ConcurrencyController, ParallelExecutor, PipelineBuilder
+
+
+class TestConcurrencyController(unittest.TestCase):
+    def test_converges(self):
+        # simulated service with 4 slots, latency grows linearly once they are taken
+        controller = ConcurrencyController(tolerance=1.5, cpu_target=None)
+        limits = []
+        for _ in range(300):
+            limit = controller.get_limit("Service")
+            for _ in range(limit):
+                self.assertTrue(controller.acquire("Service", blocking=False))
+            self.assertFalse(controller.acquire("Service", blocking=False))
+            for _ in range(limit):
+                controller.release("Service", max(1.0, limit / 4.0))
+            limits.append(controller.get_limit("Service"))
+
+        self.assertTrue(all(3 <= limit <= 7 for limit in limits[-100:]))
+        metrics = controller.get_metrics()["runners"]["Service"]
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertGreater(metrics["increases"], 0)
+        self.assertGreater(metrics["decreases"], 0)
+        self.assertEqual(pickle.loads(pickle.dumps(controller)).get_limit("Service"), controller.get_limit("Service"))
+
+    def test_stream_backpressure(self):
+        controller = ConcurrencyController(cpu_target=None)
+        pipeline = PipelineBuilder("mlpipeline.custom").build_pipeline("data/stream.yaml")
+        consumed = []
+
+        def inputs_iterable():
+            for i in range(10):
+                consumed.append(i)
+                yield {"document_id": i}
+
+        stream = pipeline.execute_stream(inputs_iterable(), prefetch=4, controller=controller)
+        self.assertEqual(next(stream), {"model.document_id": 0})
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(list(stream), [{"model.document_id": i} for i in range(1, 10)])
+
+        metrics = controller.get_metrics()["runners"]["SleepComponent"]
+        self.assertGreater(metrics["limit"], 1)
+        self.assertEqual(metrics["in_flight"], 0)
+
+    def test_executor(self):
+        controller = ConcurrencyController(cpu_target=None)
+        pipeline_builder = PipelineBuilder("mlpipeline.custom", ParallelExecutor(4, controller=controller))
+        pipeline = pipeline_builder.build_pipeline("data/synthetic.yaml")
+        for i in range(3):
+            self.assertEqual(set(pipeline.execute({"document_id": i, "page_num": 0}).keys()), set(["merge.document_id"]))
+        self.assertTrue(all(metrics["in_flight"] == 0 for metrics in controller.get_metrics()["runners"].values()))
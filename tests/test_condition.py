@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+import yaml
+from mlpipeline.pipeline import Component, Condition, ConfigParser, Pipeline, PipelineBuilder, Router
+
+
+class TestCondition(unittest.TestCase):
+    def test_evaluate(self):
+        values = {"a.label": "A", "a.score": 0.7, "flag": False}
+        self.assertTrue(Condition("a.label").evaluate(values.get))
+        self.assertFalse(Condition("flag").evaluate(values.get))
+        self.assertTrue(Condition({"input": "a.label", "in": ["A", "B"]}).evaluate(values.get))
+        self.assertFalse(Condition([{"input": "a.label", "equals": "A"}, {"input": "a.score", "gt": 0.9}]).evaluate(values.get))
+        self.assertEqual(Condition([{"input": "a.label", "equals": "A"}, "flag"]).inputs, set(["a.label", "flag"]))
+
+        with self.assertRaises(RuntimeError):
+            Condition({"input": "a.label", "matches": "A"})
+        with self.assertRaises(RuntimeError):
+            Condition({"equals": "A"})
+
+    def test_dependencies(self):
+        component = Component("b", {"inputs": ["x"], "outputs": ["y"], "when": {"input": "a.label", "equals": "A"}})
+        self.assertEqual(component.dependencies, set(["inputs", "a"]))
+
+    def test_router(self):
+        router = Router("router", {"inputs": ["a.label"], "routes": {"extract": {"input": "label", "in": ["A"]}}, "default": "skip"})
+        self.assertEqual(router.outputs, set(["extract", "skip"]))
+        self.assertEqual(router.execute({"a": {"label": "A"}}), {"extract": True, "skip": False})
+        self.assertEqual(router.execute({"a": {"label": "C"}}), {"extract": False, "skip": True})
+
+        with self.assertRaises(RuntimeError):
+            Router("router", {"inputs": ["a.label"], "routes": {"extract": "score"}})
+
+    def test_skip(self):
+        components = {
+            "a": ConstantComponent("a", {"inputs": ["x"], "outputs": ["y"]}),
+            "b": ConstantComponent("b", {"inputs": ["a.y"], "outputs": ["y"], "when": {"input": "x", "gt": 1}}),
+            "c": ConstantComponent("c", {"inputs": ["b.y"], "outputs": ["y"]}),
+        }
+        pipeline = Pipeline("test", set(["x"]), set(["a.y", "c.y"]), components, ["a", "b", "c"], defaults={"c.y": -1})
+        self.assertEqual(pipeline.execute({"x": 2}), {"a.y": 1, "c.y": 1})
+        self.assertEqual(pipeline.execute({"x": 0}), {"a.y": 1, "c.y": -1})
+        self.assertEqual(ConstantComponent.calls, {"a": 2, "b": 1, "c": 1})
+
+    def test_execute(self):
+        pipeline_builder = PipelineBuilder("mlpipeline.custom")
+        pipeline = pipeline_builder.build_pipeline("data/conditional.yaml")
+        self.assertLess(pipeline.running_order.index("router"), pipeline.running_order.index("image_ocr"))
+        for _ in range(10):
+            outputs = pipeline.execute({"document_id": 0, "page_num": 1})
+            self.assertTrue((outputs["extractor.extractions"] == "none") != (outputs["fallback.fallback_extractions"] == "none"))
+
+    def test_missing_default(self):
+        with open("data/conditional.yaml") as fp:
+            config = yaml.safe_load(fp)
+        del config["pipeline"]["defaults"]["extractor.extractions"]
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "conditional.yaml")
+            with open(path, "w") as fp:
+                yaml.safe_dump(config, fp)
+            # the extractor depends on the conditional image_ocr, so its output may be skipped
+            with self.assertRaises(RuntimeError):
+                PipelineBuilder("mlpipeline.custom").build_pipeline(path)
+
+        config_parser = ConfigParser()
+        self.assertEqual(len(config_parser.parse_config("data/conditional.yaml", "mlpipeline.custom")), 4)
+        self.assertEqual(config_parser.defaults, {"extractor.extractions": "none", "fallback.fallback_extractions": "none"})
+
+
+class ConstantComponent(Component):
+    calls = {}
+
+    def process(self, inputs: dict) -> dict:
+        ConstantComponent.calls[self.name] = ConstantComponent.calls.get(self.name, 0) + 1
+        return {"y": 1}
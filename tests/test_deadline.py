@@ -0,0 +1,107 @@
+import threading
+import time
+import unittest
+from mlpipeline.pipeline import CancellationToken, Cancelled, Component, DeadlineExceeded, ParallelExecutor, PipelineBuilder, RuntimeHistory
+from mlpipeline.pipeline import ComponentABC, Pipeline, SequentialExecutor
+
+
+class BlockingComponent(Component):
+    def process(self, inputs: dict) -> dict:
+        time.sleep(0.3)
+        return {}
+
+
+class RawComponent(ComponentABC):
+    """Implements the execute(result) contract without the token
+    """
+
+    dependencies = set(["inputs"])
+    required_dependencies = dependencies
+
+    def execute(self, result: dict) -> dict:
+        return {"y": result["x"]}
+
+    def process(self, inputs: dict) -> dict:
+        return inputs
+
+
+class TestDeadline(unittest.TestCase):
+    def build(self, executor=None):
+        pipeline = PipelineBuilder("mlpipeline.custom", executor).build_pipeline("data/deadline.yaml")
+        self.executed = []
+        for component_id, component in pipeline.components.items():
+            component.execute = self.track(component_id, component.execute)
+        return pipeline
+
+    def track(self, component_id: str, execute):
+        def tracked(*args, **kwargs):
+            self.executed.append(component_id)
+            return execute(*args, **kwargs)
+        return tracked
+
+    def test_no_deadline(self):
+        pipeline = self.build()
+        self.assertEqual(pipeline.execute({"document_id": "D0"}, token=CancellationToken()), {"writer.document_id": "D0"})
+        self.assertEqual(self.executed, ["loader", "model", "writer"])
+
+    def test_deadline(self):
+        for executor in [SequentialExecutor(), ParallelExecutor(2)]:
+            pipeline = self.build(executor)
+            with self.assertRaises(DeadlineExceeded):
+                pipeline.execute({"document_id": "D0"}, token=CancellationToken(0.3))
+            # the spinning model is cancelled and the writer is never started
+            self.assertEqual(self.executed, ["loader", "model"])
+
+    def test_cancel(self):
+        pipeline = self.build()
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+        with self.assertRaises(Cancelled) as context:
+            pipeline.execute({"document_id": "D0"}, token=token)
+        self.assertNotIsInstance(context.exception, DeadlineExceeded)
+        self.assertNotIn("writer", self.executed)
+
+    def test_shedding(self):
+        runtime_history = RuntimeHistory()
+        runtime_history.update("SleepComponent", 0.2)
+        runtime_history.update("CpuSpinComponent", 0.3)
+        for executor in [SequentialExecutor(runtime_history), ParallelExecutor(2, runtime_history=runtime_history)]:
+            pipeline = self.build(executor)
+            with self.assertRaises(DeadlineExceeded):
+                pipeline.execute({"document_id": "D0"}, token=CancellationToken(0.5))
+            # the expected 0.6s don't fit into the budget, nothing is started
+            self.assertEqual(self.executed, [])
+
+            # without shedding the pipeline runs until the deadline
+            with self.assertRaises(DeadlineExceeded):
+                pipeline.execute({"document_id": "D0"}, token=CancellationToken(0.5, shed=False))
+            self.assertEqual(self.executed[0], "loader")
+
+    def test_overrun(self):
+        components = {"block": BlockingComponent("block", {"inputs": ["document_id"], "outputs": []})}
+        for executor in [SequentialExecutor(), ParallelExecutor(1)]:
+            token = CancellationToken(0.1)
+            # the last component isn't cancellable, the record still misses its deadline
+            with self.assertRaises(DeadlineExceeded):
+                executor.run(components, ["block"], lambda component_id: components[component_id].execute({"document_id": "D0"}), token)
+
+    def test_abandon(self):
+        components = {
+            "block": BlockingComponent("block", {"inputs": ["document_id"], "outputs": []}),
+            "next": BlockingComponent("next", {"inputs": ["block.x"], "outputs": []}),
+        }
+        started = []
+
+        def run_component(component_id: str) -> dict:
+            started.append(component_id)
+            return components[component_id].execute({"document_id": "D0", "block": {"x": 0}})
+
+        with self.assertRaises(DeadlineExceeded):
+            ParallelExecutor(2).run(components, ["block", "next"], run_component, CancellationToken(0.1))
+        # the non-cancellable component is left running in background, its successor is never started
+        self.assertEqual(started, ["block"])
+
+    def test_token_contract(self):
+        pipeline = Pipeline("raw", set(["x"]), set(["raw.y"]), {"raw": RawComponent("raw", {"inputs": ["x"], "outputs": ["y"]})}, ["raw"])
+        self.assertFalse(pipeline.components["raw"].accepts_token())
+        self.assertEqual(pipeline.execute({"x": 1}, token=CancellationToken(1.0)), {"raw.y": 1})
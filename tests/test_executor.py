@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from mlpipeline.pipeline import Component, Pipeline, PipelineBuilder, RuntimeHistory, ParallelExecutor
+
+
+class TestExecutor(unittest.TestCase):
+    def test_runtime_history(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "history.json")
+            history = RuntimeHistory(path, alpha=0.5, default=2.0)
+            self.assertEqual(history.get("A"), 2.0)
+
+            history.update("A", 1.0)
+            history.update("A", 3.0)
+            self.assertEqual(history.get("A"), 2.0)
+            history.save()
+
+            self.assertEqual(RuntimeHistory(path).get("A"), 2.0)
+
+    def test_get_priorities(self):
+        history = RuntimeHistory()
+        history.update("LongComponent", 3.0)
+        history.update("ShortComponent", 1.0)
+        components = {
+            "a": ShortComponent("a", {"inputs": ["x"], "outputs": ["y"]}),
+            "b": LongComponent("b", {"inputs": ["a.y"], "outputs": ["y"]}),
+            "c": ShortComponent("c", {"inputs": ["a.y"], "outputs": ["y"]}),
+            "d": ShortComponent("d", {"inputs": ["b.y", "c.y"], "outputs": ["y"]}),
+        }
+        executor = ParallelExecutor(2, runtime_history=history)
+        priorities = executor.get_priorities(components, ["a", "c", "b", "d"])
+        self.assertEqual(priorities, {"a": 5.0, "b": 4.0, "c": 2.0, "d": 1.0})
+
+    def test_execute(self):
+        pipeline_builder = PipelineBuilder("mlpipeline.custom", ParallelExecutor(4))
+        pipeline = pipeline_builder.build_pipeline("data/pipeline_2.yaml")
+        self.assertEqual(set(pipeline.execute({"document_id": 0, "page_num": 1}).keys()), set(["test_processor_5.output_5"]))
+
+    def test_resources(self):
+        components = {
+            name: LongComponent(name, {"inputs": ["x"], "outputs": ["y"], "resources": {"cpu": 2, "memory": "1G"}})
+            for name in ["a", "b", "c", "d"]
+        }
+        executor = ParallelExecutor(4, capacity={"cpu": 8, "memory": "2G"})
+        pipeline = Pipeline("test", set(["x"]), set(), components, ["a", "b", "c", "d"], executor)
+        LongComponent.running = 0
+        LongComponent.max_running = 0
+        pipeline.execute({"x": 0.01})
+        self.assertEqual(LongComponent.max_running, 2)
+
+    def test_start_order(self):
+        components = {
+            "short_0": ShortComponent("short_0", {"inputs": ["x"], "outputs": ["y"]}),
+            "short_1": ShortComponent("short_1", {"inputs": ["x"], "outputs": ["y"]}),
+            "short_2": ShortComponent("short_2", {"inputs": ["x"], "outputs": ["y"]}),
+            "chain_0": LongComponent("chain_0", {"inputs": ["x"], "outputs": ["y"]}),
+            "chain_1": LongComponent("chain_1", {"inputs": ["chain_0.y"], "outputs": ["y"]}),
+            "chain_2": LongComponent("chain_2", {"inputs": ["chain_1.y"], "outputs": ["y"]}),
+        }
+        running_order = ["short_0", "short_1", "short_2", "chain_0", "chain_1", "chain_2"]
+
+        starts = {}
+        for policy in ParallelExecutor.POLICIES:
+            history = RuntimeHistory()
+            history.update("ShortComponent", 0.1)
+            history.update("LongComponent", 0.1)
+            executor = ParallelExecutor(2, capacity={"cpu": 2}, runtime_history=history, policy=policy)
+            lock = threading.Lock()
+            starts[policy] = []
+            result = {"x": 0.01}
+
+            def run_component(component_id: str) -> dict:
+                with lock:
+                    starts[policy].append(component_id)
+                result[component_id] = components[component_id].execute(result)
+                return result[component_id]
+
+            executor.run(components, running_order, run_component)
+            self.assertEqual(sorted(starts[policy]), sorted(running_order))
+
+        # the head of the critical path is started in the first round of the two workers only with priorities
+        self.assertIn("chain_0", starts["priority"][:2])
+        self.assertEqual(set(starts["fifo"][:2]), set(["short_0", "short_1"]))
+
+
+class ShortComponent(Component):
+    def process(self, inputs: dict) -> dict:
+        time.sleep(0.01)
+        return {"y": 0.01}
+
+
+class LongComponent(Component):
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def process(self, inputs: dict) -> dict:
+        with self.lock:
+            LongComponent.running += 1
+            LongComponent.max_running = max(LongComponent.max_running, LongComponent.running)
+        time.sleep(list(inputs.values())[0])
+        with self.lock:
+            LongComponent.running -= 1
+        return {"y": list(inputs.values())[0]}
@@ -0,0 +1,94 @@
+import logging
+import time
+import unittest
+from mlpipeline.pipeline import Component, ComponentFuser, FusedComponent, ParallelExecutor, Pipeline, PipelineBuilder, RuntimeHistory
+
+
+class TestFusion(unittest.TestCase):
+    def test_fuse_chain(self):
+        components, running_order = build_chain(4)
+        components["c4"] = Increment("c4", {"inputs": ["c1.y"], "outputs": ["y"], "fusable": True})
+        fused, fused_order = ComponentFuser().fuse(components, running_order + ["c4"], set(["c3.y", "c4.y"]))
+
+        # c1 has two consumers, so the chain is cut after it
+        self.assertEqual(fused_order, ["c1", "c3", "c4"])
+        self.assertIsInstance(fused["c1"], FusedComponent)
+        self.assertEqual([member.name for member in fused["c1"].members], ["c0", "c1"])
+        self.assertEqual(fused["c1"].inputs, set(["y"]))
+        self.assertEqual([member.name for member in fused["c3"].members], ["c2", "c3"])
+        self.assertEqual(fused["c3"].dependencies, set(["c1"]))
+        self.assertIs(fused["c4"], components["c4"])
+
+        pipeline = Pipeline("test", set(["y"]), set(["c3.y", "c4.y"]), fused, fused_order)
+        self.assertEqual(pipeline.execute({"y": 0}), {"c3.y": 4, "c4.y": 3})
+        self.assertEqual(pipeline.execute_batch([{"y": 0}, {"y": 10}]), [{"c3.y": 4, "c4.y": 3}, {"c3.y": 14, "c4.y": 13}])
+
+    def test_fused_runner_and_resources(self):
+        components = {
+            "a": Increment("a", {"inputs": ["y"], "outputs": ["y"], "fusable": True, "resources": {"gpu": 1, "cpu": 2}}),
+            "b": Increment("b", {"inputs": ["a.y"], "outputs": ["y"], "fusable": True, "resources": {"cpu": 4}}),
+            "c": Component("c", {"inputs": ["b.y"], "outputs": ["y"]}),
+            "d": Component("d", {"inputs": ["c.y"], "outputs": ["y"], "fusable": True}),
+            "e": Increment("e", {"inputs": ["d.y"], "outputs": ["y"], "fusable": True}),
+        }
+        fused, fused_order = ComponentFuser().fuse(components, ["a", "b", "c", "d", "e"], set(["e.y"]))
+        self.assertEqual(fused_order, ["b", "c", "e"])
+        self.assertEqual(fused["b"].resources, {"gpu": 1, "cpu": 4})
+        # units are keyed by their members, not by the FusedComponent class
+        self.assertEqual(fused["b"].runner, "Increment+Increment")
+        self.assertEqual(fused["e"].runner, "Component+Increment")
+        self.assertEqual(fused["c"].runner, "Component")
+
+    def test_fuse_fan_in(self):
+        components = {
+            "a": Increment("a", {"inputs": ["y"], "outputs": ["y"], "fusable": True}),
+            "b": Increment("b", {"inputs": ["y"], "outputs": ["y"]}),
+            "c": Component("c", {"inputs": ["a.y", "b.y"], "outputs": ["y"], "fusable": True}),
+            "d": Increment("d", {"inputs": ["c.y"], "outputs": ["y"], "fusable": True, "when": "c.y"}),
+        }
+        history = RuntimeHistory()
+        history.update("Increment", 0.0001)
+        fused, fused_order = ComponentFuser(history, 0.001).fuse(components, ["a", "b", "c", "d"], set(["d.y"]))
+        self.assertEqual(fused_order, ["c", "d"])
+        self.assertEqual([member.name for member in fused["c"].members], ["a", "b", "c"])
+
+        fused, fused_order = ComponentFuser().fuse(components, ["a", "b", "c", "d"], set(["d.y"]))
+        self.assertEqual(fused_order, ["b", "c", "d"])
+
+    def test_overhead(self):
+        logging.disable(logging.INFO)
+        try:
+            durations = []
+            for fuse in [False, True]:
+                components, running_order = build_chain(100)
+                if fuse:
+                    components, running_order = ComponentFuser().fuse(components, running_order, set(["c99.y"]))
+                pipeline = Pipeline("test", set(["y"]), set(["c99.y"]), components, running_order, ParallelExecutor(2))
+
+                start = time.perf_counter()
+                for _ in range(5):
+                    self.assertEqual(pipeline.execute({"y": 0}), {"c99.y": 100})
+                durations.append(time.perf_counter() - start)
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertLess(durations[1], durations[0])
+
+    def test_builder(self):
+        executor = ParallelExecutor(2)
+        executor.runtime_history.update("ImagePreprocessor", 0.0001)
+        executor.runtime_history.update("OCRModel2", 0.0001)
+        pipeline = PipelineBuilder("mlpipeline.custom", executor, fuse=True, fuse_threshold=0.001).build_pipeline("data/pipeline_0.yaml")
+        self.assertEqual(pipeline.running_order, ["image_ocr", "extractor"])
+        self.assertEqual(set(pipeline.execute({"document_id": 0, "page_num": 1}).keys()), set(["extractor.extractions"]))
+
+
+def build_chain(length: int):
+    components = {"c0": Increment("c0", {"inputs": ["y"], "outputs": ["y"], "fusable": True})}
+    for index in range(1, length):
+        components["c{}".format(index)] = Increment("c{}".format(index), {"inputs": ["c{}.y".format(index - 1)], "outputs": ["y"], "fusable": True})
+    return components, ["c{}".format(index) for index in range(length)]
+
+
+class Increment(Component):
+    def process(self, inputs):
+        return {"y": inputs["y"] + 1}
@@ -0,0 +1,40 @@
+import unittest
+from mlpipeline.pipeline import Component, GraphUtils, GraphAnalysis
+
+
+class TestGraphAnalysis(unittest.TestCase):
+    def setUp(self):
+        components = {
+            "a": Component("a", {"inputs": ["x"], "outputs": ["y"]}),
+            "b": Component("b", {"inputs": ["a.y"], "outputs": ["y"]}),
+            "c": Component("c", {"inputs": ["a.y"], "outputs": ["y"]}),
+            "d": Component("d", {"inputs": ["b.y", "c.y"], "outputs": ["y"]}),
+        }
+        graph = GraphUtils().get_graph(components, set(["x"]), set(["d.y"]))
+        self.analysis = GraphAnalysis(graph, {"a": 1.0, "b": 3.0, "c": 2.0, "d": 1.0})
+
+    def test_critical_path(self):
+        self.assertEqual(self.analysis.get_span(), 5.0)
+        self.assertEqual(self.analysis.get_work(), 7.0)
+        self.assertEqual(self.analysis.get_critical_path(), ["a", "b", "d"])
+        self.assertEqual(self.analysis.get_slack(), {"a": 0.0, "b": 0.0, "c": 1.0, "d": 0.0})
+
+    def test_speedup(self):
+        self.assertEqual(self.analysis.get_speedup(1), (1.0, 1.0))
+        lower, upper = self.analysis.get_speedup(2)
+        self.assertAlmostEqual(upper, 1.4)
+        self.assertEqual(lower, 1.0)
+        self.assertAlmostEqual(self.analysis.get_speedup(100)[0], 7.0 / 5.07)
+
+    def test_best_target(self):
+        # b only saves until c becomes critical, a and d save their full duration
+        self.assertEqual(self.analysis.get_best_target(), ("a", 1.0))
+        analysis = GraphAnalysis(self.analysis.graph, {"a": 0.5, "b": 4.0, "c": 1.0, "d": 0.5})
+        self.assertEqual(analysis.get_best_target(), ("b", 3.0))
+
+    def test_dot(self):
+        dot = self.analysis.to_dot("test")
+        self.assertTrue(dot.startswith("digraph \"test\" {"))
+        self.assertIn("\"a\" -> \"b\" [color=red, penwidth=2];", dot)
+        self.assertIn("\"a\" -> \"c\";", dot)
+        self.assertIn("slack 1.000000s", dot)
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+from mlpipeline.pipeline import Component, Pipeline, PipelineBuilder, FrozenDict, FrozenList, freeze, thaw
+
+
+class TestIsolation(unittest.TestCase):
+    def test_freeze(self):
+        array = np.zeros(3)
+        frozen = freeze({"array": array, "items": [1, [2]], "tags": {"a"}})
+        self.assertIsInstance(frozen, FrozenDict)
+        self.assertIsInstance(frozen["items"], FrozenList)
+        self.assertIsInstance(frozen["items"][1], FrozenList)
+        self.assertEqual(frozen["tags"], frozenset(["a"]))
+        self.assertTrue(np.shares_memory(frozen["array"], array))
+        with self.assertRaises(ValueError):
+            frozen["array"][0] = 1
+        with self.assertRaises(TypeError):
+            frozen["array"] = None
+
+        copy = thaw(frozen)
+        copy["array"] = thaw(copy["array"])
+        copy["array"][0] = 1
+        self.assertEqual(array[0], 0)
+        self.assertEqual(thaw(frozen["items"]), [1, [2]])
+
+    def test_readonly(self):
+        components = {
+            "a": Producer("a", {"inputs": ["x"], "outputs": ["y"]}),
+            "b": Mutator("b", {"inputs": ["a.y"], "outputs": ["y"], "isolation": "readonly"}),
+            "c": CopyOnWrite("c", {"inputs": ["a.y"], "outputs": ["y"], "isolation": "readonly"}),
+        }
+        pipeline = Pipeline("test", set(["x"]), set(["c.y"]), components, ["a", "b", "c"])
+        with self.assertRaises(ValueError):
+            pipeline.execute({"x": 1})
+
+        del components["b"]
+        pipeline = Pipeline("test", set(["x"]), set(["c.y"]), components, ["a", "c"])
+        result = pipeline.execute({"x": 1})
+        self.assertEqual(result["c.y"]["values"].tolist(), [1.0, 0.0])
+
+    def test_debug(self):
+        components = {
+            "a": Producer("a", {"inputs": ["x"], "outputs": ["y"]}),
+            "b": AttributeMutator("b", {"inputs": ["a.y"], "outputs": ["y"], "isolation": "debug"}),
+        }
+        pipeline = Pipeline("test", set(["x"]), set(["b.y"]), components, ["a", "b"])
+        with self.assertRaisesRegex(RuntimeError, "mutated input a.y"):
+            pipeline.execute({"x": 1})
+
+        components["b"].isolation = "shared"
+        self.assertEqual(pipeline.execute({"x": 1}), {"b.y": 2})
+
+    def test_builder(self):
+        pipeline = PipelineBuilder("mlpipeline.custom", isolation="debug").build_pipeline("data/pipeline_2.yaml")
+        self.assertTrue(all(component.isolation == "debug" for component in pipeline.components.values()))
+        self.assertEqual(set(pipeline.execute({"document_id": 0, "page_num": 1}).keys()), set(["test_processor_5.output_5"]))
+
+        with self.assertRaises(RuntimeError):
+            PipelineBuilder("mlpipeline.custom", isolation="private")
+
+
+class Counter:
+    def __init__(self):
+        self.count = 1
+
+    def __eq__(self, other):
+        return isinstance(other, Counter) and self.count == other.count
+
+
+class Producer(Component):
+    def process(self, inputs):
+        return {"y": {"values": np.zeros(2), "counter": Counter()}}
+
+
+class Mutator(Component):
+    def process(self, inputs):
+        inputs["y"]["values"][0] = 1
+        return {"y": inputs["y"]}
+
+
+class CopyOnWrite(Component):
+    def process(self, inputs):
+        y = {"values": thaw(inputs["y"]["values"])}
+        y["values"][0] = 1
+        return {"y": y}
+
+
+class AttributeMutator(Component):
+    def process(self, inputs):
+        inputs["y"]["counter"].count += 1
+        return {"y": inputs["y"]["counter"].count}
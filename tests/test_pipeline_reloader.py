@@ -0,0 +1,160 @@
+import os
+import sys
+import tempfile
+import unittest
+from mlpipeline.pipeline import PipelineBuilder, PipelineReloader
+
+CONFIG = """
+pipeline:
+  name: "reloaded pipeline"
+  inputs:
+    - x
+  outputs:
+    - b.y
+  components:
+    a:
+      runner: Constant
+      value: {a_value}
+      inputs:
+        - x
+      outputs:
+        - y
+    b:
+      runner: Increment
+      inputs:
+        - a.y
+      outputs:
+        - y
+"""
+
+MODULE = """
+from mlpipeline.pipeline import Component
+
+
+class Constant(Component):
+    def __init__(self, component_id, component_definition):
+        super().__init__(component_id, component_definition)
+        self.value = component_definition["value"]
+
+    def process(self, inputs):
+        return {{"y": self.value}}
+
+
+class Increment(Component):
+    def process(self, inputs):
+        return {{"y": inputs["y"] + {increment}}}
+"""
+
+
+HELPER_MODULE = """
+from mlpipeline.pipeline import Component
+
+
+def offset():
+    return {offset}
+
+
+class Base(Component):
+    def scale(self, value):
+        return value * {scale}
+
+
+class Constant(Base):
+    def __init__(self, component_id, component_definition):
+        super().__init__(component_id, component_definition)
+        self.value = component_definition["value"]
+
+    def process(self, inputs):
+        return {{"y": self.scale(self.value)}}
+
+
+class Increment(Component):
+    def process(self, inputs):
+        return {{"y": inputs["y"] + offset()}}
+"""
+
+
+class TestPipelineReloader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.directory.name, "config.yaml")
+        self.module_path = os.path.join(self.directory.name, "reloaded_components.py")
+        self._write(self.config_path, CONFIG.format(a_value=1))
+        self._write(self.module_path, MODULE.format(increment=1))
+        sys.path.insert(0, self.directory.name)
+
+    def tearDown(self):
+        sys.path.remove(self.directory.name)
+        sys.modules.pop("reloaded_components", None)
+        self.directory.cleanup()
+
+    def _write(self, path: str, content: str):
+        mtime = os.path.getmtime(path) + 10 if os.path.exists(path) else None
+        with open(path, "w") as fp:
+            fp.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_reload_config(self):
+        reloader = PipelineReloader(self.config_path, "reloaded_components")
+        self.assertEqual(reloader.execute({"x": 0}), {"b.y": 2})
+        self.assertFalse(reloader.check())
+
+        old_pipeline = reloader.pipeline
+        self._write(self.config_path, CONFIG.format(a_value=5))
+        self.assertTrue(reloader.check())
+
+        self.assertIsNot(reloader.pipeline.components["a"], old_pipeline.components["a"])
+        self.assertIs(reloader.pipeline.components["b"], old_pipeline.components["b"])
+        self.assertEqual(reloader.execute({"x": 0}), {"b.y": 6})
+        self.assertEqual(old_pipeline.execute({"x": 0}), {"b.y": 2})
+
+    def test_reload_code(self):
+        reloader = PipelineReloader(self.config_path, "reloaded_components")
+        old_pipeline = reloader.pipeline
+
+        self._write(self.module_path, MODULE.format(increment=10))
+        self.assertTrue(reloader.check())
+
+        self.assertIs(reloader.pipeline.components["a"], old_pipeline.components["a"])
+        self.assertIsNot(reloader.pipeline.components["b"], old_pipeline.components["b"])
+        self.assertEqual(reloader.execute({"x": 0}), {"b.y": 11})
+
+    def test_reload_base_class_and_helper(self):
+        self._write(self.module_path, HELPER_MODULE.format(offset=1, scale=1))
+        reloader = PipelineReloader(self.config_path, "reloaded_components")
+        self.assertEqual(reloader.execute({"x": 0}), {"b.y": 2})
+
+        old_pipeline = reloader.pipeline
+        self._write(self.module_path, HELPER_MODULE.format(offset=1, scale=3))
+        self.assertTrue(reloader.check())
+        self.assertIsNot(reloader.pipeline.components["a"], old_pipeline.components["a"])
+        self.assertIs(reloader.pipeline.components["b"], old_pipeline.components["b"])
+        self.assertEqual(reloader.execute({"x": 0}), {"b.y": 4})
+
+        old_pipeline = reloader.pipeline
+        self._write(self.module_path, HELPER_MODULE.format(offset=10, scale=3))
+        self.assertTrue(reloader.check())
+        self.assertIs(reloader.pipeline.components["a"], old_pipeline.components["a"])
+        self.assertIsNot(reloader.pipeline.components["b"], old_pipeline.components["b"])
+        self.assertEqual(reloader.execute({"x": 0}), {"b.y": 13})
+
+    def test_reload_fused(self):
+        self._write(self.config_path, CONFIG.format(a_value=1).replace("outputs:\n        - y", "outputs:\n        - y\n      fusable: true"))
+        reloader = PipelineReloader(self.config_path, "reloaded_components", PipelineBuilder("reloaded_components", fuse=True))
+        members = reloader.pipeline.components["b"].members
+
+        self._write(self.module_path, MODULE.format(increment=10))
+        self.assertTrue(reloader.check())
+        # members are reused one by one, only the changed one is rebuilt
+        self.assertIs(reloader.pipeline.components["b"].members[0], members[0])
+        self.assertIsNot(reloader.pipeline.components["b"].members[1], members[1])
+        self.assertEqual(reloader.execute({"x": 0}), {"b.y": 11})
+
+    def test_failed_reload(self):
+        reloader = PipelineReloader(self.config_path, "reloaded_components")
+        old_pipeline = reloader.pipeline
+
+        self._write(self.config_path, CONFIG.format(a_value=1).replace("a.y", "c.y"))
+        self.assertTrue(reloader.check())
+        self.assertIs(reloader.pipeline, old_pipeline)
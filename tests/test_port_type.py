@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+from mlpipeline.pipeline import Component, GraphUtils, PortType, parse_ports
+
+
+class TestPortType(unittest.TestCase):
+    def test_parse_ports(self):
+        names, types = parse_ports(["a", {"b.image": {"dtype": "uint8", "shape": [None, 3], "readonly": True}}, {"label": {"type": "str"}}])
+        self.assertEqual(names, set(["a", "b.image", "label"]))
+        self.assertEqual(types["b.image"].kind, "array")
+        self.assertTrue(types["b.image"].readonly)
+        self.assertEqual(types["label"].kind, "str")
+
+        with self.assertRaises(RuntimeError):
+            parse_ports([{"a": {"type": "matrix"}}])
+
+    def test_validate(self):
+        port_type = PortType({"dtype": "float32", "shape": [None, 3]})
+        self.assertIsNone(port_type.validate(np.zeros((5, 3), dtype=np.float32)))
+        self.assertIsNotNone(port_type.validate(np.zeros((5, 3))))
+        self.assertIsNotNone(port_type.validate(np.zeros((5, 2), dtype=np.float32)))
+        self.assertIsNotNone(port_type.validate([1.0, 2.0, 3.0]))
+
+        self.assertIsNone(PortType({"type": "bytes"}).validate(b"abc"))
+        self.assertIsNone(PortType({"type": "int"}).validate(np.int64(1)))
+        self.assertIsNotNone(PortType({"type": "int"}).validate(True))
+        self.assertIsNone(PortType({}).validate("A"))
+
+    def test_is_compatible(self):
+        self.assertTrue(PortType({"dtype": "uint8", "shape": [None, 3]}).is_compatible(PortType({"shape": [10, None]})))
+        self.assertFalse(PortType({"dtype": "uint8"}).is_compatible(PortType({"dtype": "float32"})))
+        self.assertFalse(PortType({"shape": [3]}).is_compatible(PortType({"shape": [3, 3]})))
+        self.assertFalse(PortType({"type": "bytes"}).is_compatible(PortType({"type": "str"})))
+        self.assertTrue(PortType({"type": "str"}).is_compatible(PortType({})))
+
+    def test_verify_edge_types(self):
+        graph_utils = GraphUtils()
+        components = {
+            "a": Component("a", {"inputs": [], "outputs": [{"image": {"dtype": "uint8"}}]}),
+            "b": Component("b", {"inputs": [{"a.image": {"dtype": "uint8", "readonly": True}}], "outputs": []}),
+        }
+        self.assertTrue(graph_utils._verify_edge_types(components, "a", "b"))
+
+        components["b"] = Component("b", {"inputs": [{"a.image": {"dtype": "float32"}}], "outputs": []})
+        self.assertFalse(graph_utils._verify_edge_types(components, "a", "b"))
+        with self.assertRaises(RuntimeError):
+            graph_utils._create_graph(components, set(), set())
+
+    def test_readonly_views(self):
+        producer = ArrayComponent("a", {"inputs": [], "outputs": [{"image": {"dtype": "float64", "readonly": True}}]})
+        result = {"a": producer.execute({})}
+        self.assertFalse(result["a"]["image"].flags.writeable)
+
+        reader = Component("b", {"inputs": [{"a.image": {"readonly": True}}], "outputs": []})
+        image = reader._extract_inputs(result)["image"]
+        self.assertTrue(np.shares_memory(image, result["a"]["image"]))
+        self.assertFalse(image.flags.writeable)
+
+        writer = Component("c", {"inputs": [{"a.image": {"dtype": "float64"}}], "outputs": []})
+        image = writer._extract_inputs(result)["image"]
+        self.assertFalse(np.shares_memory(image, result["a"]["image"]))
+        self.assertTrue(image.flags.writeable)
+
+    def test_check_contracts(self):
+        component = ArrayComponent("a", {"inputs": [], "outputs": [{"image": {"dtype": "float32"}}]})
+        with self.assertRaises(RuntimeError):
+            component.execute({})
+
+        component = ArrayComponent("a", {"inputs": [], "outputs": [{"image": {"dtype": "float32"}}], "check_rate": 0.25})
+        checked = [component._should_check_contracts() for _ in range(8)]
+        self.assertEqual(checked, [True, False, False, False, True, False, False, False])
+
+
+class ArrayComponent(Component):
+    def process(self, inputs: dict) -> dict:
+        return {"image": np.zeros((2, 2))}
@@ -0,0 +1,85 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+import unittest
+import numpy as np
+from mlpipeline.pipeline import Component, FrozenList, PipelineBuilder, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = PipelineBuilder("mlpipeline.custom").build_pipeline("data/coalesce.yaml")
+
+    def test_threads(self):
+        inputs = [{"document_id": "D{}".format(i % 2), "page_num": i} for i in range(8)]
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            outputs = list(pool.map(self.pipeline.execute_coalesced, inputs))
+        self.assertLess(time.perf_counter() - start, 0.7)
+        self.assertEqual(outputs, [{"model.document_id": "D{}".format(i % 2)} for i in range(8)])
+        # every caller gets its own dictionary
+        self.assertIsNot(outputs[0], outputs[2])
+
+        metrics = self.pipeline.get_coalescing_metrics()
+        self.assertEqual(metrics["pipeline"], {"calls": 8, "executions": 2, "coalesced": 6, "in_flight": 0})
+        self.assertEqual(metrics["components"]["model"]["executions"], 2)
+
+    def test_component(self):
+        results = [{"loader": {"document_id": "D0"}} for _ in range(4)]
+        model = self.pipeline.components["model"]
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            outputs = list(pool.map(model.execute, results))
+        self.assertEqual(outputs, [{"document_id": "D0"}] * 4)
+        self.assertEqual(model.single_flight.get_metrics()["coalesced"], 3)
+        self.assertNotIn("loader", self.pipeline.get_coalescing_metrics()["components"])
+
+    def test_component_outputs_read_only(self):
+        component = ArrayComponent("a", {"inputs": ["x"], "outputs": ["array", "items"], "coalesce": True})
+        results = [{"x": 0} for _ in range(4)]
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            outputs = list(pool.map(component.execute, results))
+
+        # under shared isolation records still can't change outputs shared with other records
+        self.assertIsInstance(outputs[0]["items"], FrozenList)
+        with self.assertRaises(ValueError):
+            outputs[0]["array"][0] = 1.0
+        self.assertEqual(outputs[1]["array"].tolist(), [0.0, 0.0])
+
+    def test_async(self):
+        async def run():
+            return await asyncio.gather(*[self.pipeline.execute_async({"document_id": "D0"}) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(run()), [{"model.document_id": "D0"}] * 5)
+        self.assertEqual(self.pipeline.single_flight.get_metrics()["executions"], 1)
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(self.pipeline.execute_async({"page_num": 0}))
+
+    def test_errors(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("failed")
+
+        def join():
+            started.wait()
+            return single_flight.do("key", fail)
+
+        with concurrent.futures.ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(single_flight.do, "key", fail), pool.submit(join)]
+        for future in futures:
+            self.assertIsInstance(future.exception(), ValueError)
+        self.assertEqual(single_flight.get_metrics()["coalesced"], 1)
+
+        # nothing is kept after the call finishes
+        self.assertEqual(single_flight.do("key", lambda: 1), 1)
+
+
+class ArrayComponent(Component):
+    def process(self, inputs: dict) -> dict:
+        time.sleep(0.1)
+        return {"array": np.zeros(2), "items": [inputs["x"]]}
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from mlpipeline.pipeline import ColumnarSink, PipelineBuilder, read_columns
+from mlpipeline.pipeline import sink as sink_module
+
+
+class TestSink(unittest.TestCase):
+    def setUp(self):
+        self.records = [{"a.id": "D{}".format(i), "a.score": float(i), "b.vector": np.full(3, i, dtype=np.int32)} for i in range(10)]
+
+    def test_numpy(self):
+        with tempfile.TemporaryDirectory() as root:
+            for output_format in ["npz", "npy"]:
+                path = os.path.join(root, output_format)
+                with ColumnarSink(path, 4, output_format) as sink:
+                    sink.write_all(self.records)
+                self.assertEqual(sink.rows, 10)
+                self.assertEqual(len(os.listdir(path)), 3)
+
+                columns = read_columns(path)
+                self.assertEqual(columns["a.id"].tolist(), ["D{}".format(i) for i in range(10)])
+                self.assertEqual(columns["a.score"].dtype, np.float64)
+                self.assertEqual(columns["b.vector"].shape, (10, 3))
+
+            parts = read_columns(os.path.join(root, "npy"), mmap=True)
+            self.assertIsInstance(parts["b.vector"][0], np.memmap)
+            self.assertEqual([len(part) for part in parts["b.vector"]], [4, 4, 2])
+
+    def test_mixed_values(self):
+        with tempfile.TemporaryDirectory() as root:
+            with ColumnarSink(root, 2, "npz") as sink:
+                sink.write_all([{"a": None}, {"a": [1, 2]}, {"a": 3}])
+            self.assertEqual(read_columns(root)["a"].tolist(), [None, [1, 2], 3])
+
+            with self.assertRaises(RuntimeError):
+                sink.write({"b": 1})
+
+    @unittest.skipIf(sink_module.pyarrow is None, "pyarrow is not installed")
+    def test_arrow(self):
+        with tempfile.TemporaryDirectory() as root:
+            for output_format in ["parquet", "arrow"]:
+                path = os.path.join(root, "outputs." + output_format)
+                with ColumnarSink(path, 4, output_format) as sink:
+                    sink.write_all(self.records)
+
+                columns = read_columns(path)
+                self.assertEqual(columns["a.id"].tolist(), ["D{}".format(i) for i in range(10)])
+                self.assertEqual(columns["a.score"].tolist(), [float(i) for i in range(10)])
+                self.assertEqual(columns["b.vector"][9].tolist(), [9, 9, 9])
+
+            import pyarrow.parquet
+            self.assertEqual(pyarrow.parquet.ParquetFile(os.path.join(root, "outputs.parquet")).num_row_groups, 3)
+
+    @unittest.skipIf(sink_module.pyarrow is None, "pyarrow is not installed")
+    def test_untyped_first_row_group(self):
+        records = [{"a": None, "b": 1}, {"a": None, "b": 2}, {"a": "x", "b": 3.5}, {"a": None, "b": 4}, {"a": "y", "b": 5}]
+        with tempfile.TemporaryDirectory() as root:
+            for output_format in ["parquet", "arrow"]:
+                path = os.path.join(root, "outputs." + output_format)
+                with ColumnarSink(path, 2, output_format) as sink:
+                    sink.write_all(records)
+
+                columns = read_columns(path)
+                self.assertEqual(columns["a"].tolist(), [None, None, "x", None, "y"])
+                self.assertEqual(columns["b"].tolist(), [1.0, 2.0, 3.5, 4.0, 5.0])
+
+                # a column without any typed value is written as null
+                with ColumnarSink(path, 2, output_format) as sink:
+                    sink.write_all([{"a": None}] * 3)
+                self.assertEqual(read_columns(path)["a"].tolist(), [None] * 3)
+
+    def test_pipeline(self):
+        pipeline = PipelineBuilder("mlpipeline.custom").build_pipeline("data/pipeline_2.yaml")
+        with tempfile.TemporaryDirectory() as root:
+            with ColumnarSink(root, 3, "npz") as sink:
+                sink.write_all(pipeline.execute_stream({"document_id": i, "page_num": 0} for i in range(5)))
+            self.assertEqual(len(read_columns(root)["test_processor_5.output_5"]), 5)
@@ -0,0 +1,42 @@
+import time
+import unittest
+from mlpipeline.pipeline import PipelineBuilder
+
+
+class TestStream(unittest.TestCase):
+    def test_execute_stream(self):
+        pipeline_builder = PipelineBuilder("mlpipeline.custom")
+        pipeline = pipeline_builder.build_pipeline("data/stream.yaml")
+        self.assertTrue(pipeline.components["loader"].source)
+        self.assertFalse(pipeline.components["model"].source)
+        inputs_list = [{"document_id": i} for i in range(8)]
+
+        start = time.perf_counter()
+        expected = [pipeline.execute(inputs) for inputs in inputs_list]
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        outputs = list(pipeline.execute_stream(inputs_list, prefetch=2))
+        stream_time = time.perf_counter() - start
+
+        self.assertEqual(outputs, expected)
+        self.assertEqual(outputs, [{"model.document_id": i} for i in range(8)])
+        self.assertLess(stream_time, sequential_time * 0.8)
+
+    def test_bounded_prefetch(self):
+        pipeline_builder = PipelineBuilder("mlpipeline.custom")
+        pipeline = pipeline_builder.build_pipeline("data/stream.yaml")
+        consumed = []
+
+        def inputs_iterable():
+            for i in range(10):
+                consumed.append(i)
+                yield {"document_id": i}
+
+        stream = pipeline.execute_stream(inputs_iterable(), prefetch=3)
+        self.assertEqual(next(stream), {"model.document_id": 0})
+        self.assertEqual(len(consumed), 4)
+        stream.close()
+
+        with self.assertRaises(RuntimeError):
+            list(pipeline.execute_stream([{"page_num": 0}]))
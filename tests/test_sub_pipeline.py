@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+import yaml
+from mlpipeline.pipeline import SKIPPED, ConfigParser, PipelineBuilder, Router, SubPipelineOutputs
+from mlpipeline.custom import ImagePreprocessor, OCRModel2
+
+
+class TestSubPipeline(unittest.TestCase):
+    def test_expand_sub_pipelines(self):
+        config_parser = ConfigParser()
+        name, inputs, outputs, components = config_parser.parse_config("data/composite.yaml", "mlpipeline.custom")
+        self.assertEqual(set(components.keys()), set([
+            "front_page", "front_page/image_preprocessing", "front_page/image_ocr",
+            "back_page", "back_page/image_preprocessing", "back_page/image_ocr",
+            "front_extractor", "back_extractor"
+        ]))
+        self.assertIsInstance(components["front_page/image_preprocessing"], ImagePreprocessor)
+        self.assertIsInstance(components["front_page/image_ocr"], OCRModel2)
+        self.assertIsInstance(components["front_page"], SubPipelineOutputs)
+        self.assertEqual(components["front_page/image_preprocessing"].inputs, set(["document_id", "page_num"]))
+        self.assertEqual(components["front_page/image_ocr"].inputs, set(["front_page/image_preprocessing.page_id"]))
+        self.assertEqual(components["front_page"].inputs, set(["front_page/image_ocr.page_id"]))
+        self.assertEqual(components["front_page"].outputs, set(["page_id"]))
+
+    def test_sub_pipeline_cache(self):
+        cache = {}
+        config_parser = ConfigParser(cache)
+        config_parser.parse_config("data/composite.yaml", "mlpipeline.custom")
+        self.assertEqual(len(cache), 1)
+
+        cached = list(cache.values())[0]
+        ConfigParser(cache).parse_config("data/composite.yaml", "mlpipeline.custom")
+        self.assertIs(list(cache.values())[0], cached)
+
+    def test_nested_sub_pipeline_cache(self):
+        with tempfile.TemporaryDirectory() as root:
+            def write(name: str, components: dict, outputs: list):
+                path = os.path.join(root, name)
+                mtime = os.path.getmtime(path) + 10 if os.path.exists(path) else None
+                with open(path, "w") as fp:
+                    yaml.safe_dump({"pipeline": {"name": name, "inputs": ["x"], "outputs": outputs, "components": components}}, fp)
+                if mtime is not None:
+                    os.utime(path, (mtime, mtime))
+                return path
+
+            def leaf(outputs: list) -> dict:
+                return {"leaf": {"runner": "ImagePreprocessor", "inputs": ["x"], "outputs": outputs}}
+
+            write("leaf.yaml", leaf(["page_id"]), ["leaf.page_id"])
+            write("middle.yaml", {"inner": {"runner": "SubPipeline", "config": "leaf.yaml", "inputs": ["x"]}}, ["inner.page_id"])
+            top = write("top.yaml", {"outer": {"runner": "SubPipeline", "config": "middle.yaml", "inputs": ["x"]}}, ["outer.page_id"])
+
+            cache = {}
+            components = ConfigParser(cache).parse_config(top, "mlpipeline.custom")[3]
+            self.assertEqual(components["outer/inner/leaf"].outputs, set(["page_id"]))
+
+            # a change two levels down invalidates the expansion of the middle config as well
+            write("leaf.yaml", leaf(["page_id", "label"]), ["leaf.page_id"])
+            components = ConfigParser(cache).parse_config(top, "mlpipeline.custom")[3]
+            self.assertEqual(components["outer/inner/leaf"].outputs, set(["page_id", "label"]))
+
+    def test_execute(self):
+        pipeline_builder = PipelineBuilder("mlpipeline.custom")
+        pipeline = pipeline_builder.build_pipeline("data/composite.yaml")
+        self.assertLess(pipeline.running_order.index("front_page/image_ocr"), pipeline.running_order.index("front_page"))
+        outputs = pipeline.execute({"document_id": 0, "page_num": 1})
+        self.assertEqual(set(outputs.keys()), set(["front_extractor.extractions", "back_extractor.extractions"]))
+
+    def test_embedded_router(self):
+        components = ConfigParser().parse_config("data/conditional_block.yaml", "mlpipeline.custom")[3]
+        self.assertIsInstance(components["block/router"], Router)
+        self.assertEqual(components["block/router"].outputs, set(["extract", "skip"]))
+        self.assertEqual(components["block/image_ocr"].dependencies, set(["inputs", "block/router"]))
+
+    def test_embedded_defaults(self):
+        pipeline = PipelineBuilder("mlpipeline.custom").build_pipeline("data/conditional_block.yaml")
+        defaults = {"block/extractor.extractions": "none", "block/fallback.fallback_extractions": "none"}
+        self.assertEqual(pipeline.components["block"].defaults, defaults)
+        for _ in range(10):
+            # one branch of the embedded pipeline is always skipped, its output takes the embedded default
+            outputs = pipeline.execute({"document_id": 0, "page_num": 1})
+            self.assertNotIn("parent-default", outputs.values())
+            self.assertTrue((outputs["block.extractions"] == "none") != (outputs["block.fallback_extractions"] == "none"))
+
+    def test_when(self):
+        pipeline = PipelineBuilder("mlpipeline.custom").build_pipeline("data/gated_block.yaml")
+        self.assertEqual(pipeline.components["block/image_ocr"].when.inputs, set(["gate.label"]))
+        self.assertEqual(pipeline.execute({"document_id": 0, "page_num": 1}), {"block.page_id": "parent-default"})
+
+        result = {"document_id": 0, "page_num": 1, "gate": {"label": "A"}}
+        for component_id in ["block/image_preprocessing", "block/image_ocr", "block"]:
+            self.assertIs(pipeline.execute_component(component_id, result), SKIPPED)
+
+        with open("data/gated_block.yaml") as fp:
+            config = yaml.safe_load(fp)
+        del config["pipeline"]["defaults"]
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "gated_block.yaml")
+            with open(path, "w") as fp:
+                yaml.safe_dump(config, fp)
+            with open(os.path.join(root, "ocr_block.yaml"), "w") as fp, open("data/ocr_block.yaml") as source:
+                fp.write(source.read())
+            with self.assertRaises(RuntimeError):
+                ConfigParser().parse_config(path, "mlpipeline.custom")
+
+    def test_circular_sub_pipeline(self):
+        config_parser = ConfigParser()
+        with self.assertRaises(RuntimeError):
+            config_parser.parse_config("data/circular_sub_pipeline.yaml", "mlpipeline.custom")
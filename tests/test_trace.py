@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+import numpy as np
+from mlpipeline.pipeline import Component, Pipeline, PipelineBuilder, TraceRecorder, TraceReplayer
+
+
+class TestTrace(unittest.TestCase):
+    def test_record_and_replay(self):
+        pipeline_builder = PipelineBuilder("mlpipeline.custom")
+        pipeline = pipeline_builder.build_pipeline("data/pipeline_2.yaml")
+
+        with tempfile.TemporaryDirectory() as path:
+            recorder = TraceRecorder(path)
+            outputs = [pipeline.execute({"document_id": i, "page_num": 0}, recorder=recorder) for i in range(2)]
+
+            replayer = TraceReplayer(path)
+            self.assertEqual(len(replayer), 2)
+
+            result = replayer.load_result(1)
+            self.assertEqual(result["document_id"], 1)
+            self.assertEqual(result["test_processor_5"]["output_5"], outputs[1]["test_processor_5.output_5"])
+            self.assertEqual(set(replayer.get_durations(1)), set(pipeline.running_order))
+
+            replayed = replayer.replay(pipeline, ["test_processor_2", "test_processor_5"], 1, repeat=3)
+            self.assertEqual(set(replayed), set(["test_processor_2", "test_processor_5"]))
+            self.assertIn(replayed["test_processor_5"]["outputs"]["output_5"], ["A1", "A2", "A3"])
+            self.assertGreaterEqual(replayed["test_processor_5"]["recorded_duration"], 0.0)
+
+            with self.assertRaises(RuntimeError):
+                replayer.replay(pipeline, ["unknown"])
+
+    def test_replay_arrays(self):
+        components = {
+            "a": ScaleComponent("a", {"inputs": ["x"], "outputs": ["x"]}),
+            "b": ScaleComponent("b", {"inputs": ["a.x"], "outputs": ["x"]}),
+        }
+        pipeline = Pipeline("test", set(["x"]), set(["b.x"]), components, ["a", "b"])
+
+        with tempfile.TemporaryDirectory() as path:
+            pipeline.execute({"x": np.ones(3)}, recorder=TraceRecorder(path))
+
+            replayer = TraceReplayer(path)
+            self.assertIsInstance(replayer.load_result()["a"]["x"], np.memmap)
+
+            components["a"].factor = 100
+            replayed = replayer.replay(pipeline, ["b"])
+            self.assertEqual(replayed["b"]["outputs"]["x"].tolist(), [4.0, 4.0, 4.0])
+
+    def test_failed_record(self):
+        components = {
+            "a": ScaleComponent("a", {"inputs": ["x"], "outputs": ["x"]}),
+            "b": ScaleComponent("b", {"inputs": ["a.x"], "outputs": ["x"]}),
+        }
+        pipeline = Pipeline("test", set(["x"]), set(["b.x"]), components, ["a", "b"])
+
+        with tempfile.TemporaryDirectory() as path:
+            recorder = TraceRecorder(path)
+            with self.assertRaises(TypeError):
+                pipeline.execute({"x": None}, recorder=recorder)
+            self.assertEqual(recorder._starts, {})
+            pipeline.execute({"x": 1}, recorder=recorder)
+
+            replayer = TraceReplayer(path)
+            self.assertEqual(len(replayer), 2)
+            with self.assertRaises(RuntimeError):
+                replayer.replay(pipeline, ["b"], 0)
+            self.assertEqual(replayer.replay(pipeline, ["b"], 1)["b"]["outputs"], {"x": 4})
+
+
+class ScaleComponent(Component):
+    factor = 2
+
+    def process(self, inputs: dict) -> dict:
+        return {"x": inputs["x"] * self.factor}
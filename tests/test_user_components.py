@@ -0,0 +1,55 @@
+import unittest
+from mlpipeline.pipeline import Pipeline, PipelineBuilder, RuntimeHistory, SequentialExecutor
+from mlpipeline.custom import ImagePreprocessor, ExtractionModel, SleepComponent, CpuSpinComponent, AllocateComponent, MatmulComponent
+from mlpipeline.custom.synthetic_components import SyntheticComponent
+
+
+class TestUserComponents(unittest.TestCase):
+    def test_seeded(self):
+        definition = {"inputs": ["document_id"], "outputs": ["a", "b"], "seed": 42}
+        first = ImagePreprocessor("test", definition).process_batch([{"document_id": i} for i in range(20)])
+        second = ImagePreprocessor("test", definition).process_batch([{"document_id": i} for i in range(20)])
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 20)
+        self.assertTrue(all(value in ImagePreprocessor.RANDOM_VALUES for outputs in first for value in outputs.values()))
+
+        outputs = ExtractionModel("test", {"inputs": ["page_id"], "outputs": ["extractions"]}).process({"page_id": "A"})
+        self.assertIn(outputs["extractions"], ["A1", "A2", "A3"])
+
+    def test_synthetic_components(self):
+        definition = {"inputs": ["document_id"], "outputs": ["document_id", "value"]}
+        for component_class, parameters in [
+            (SleepComponent, {"duration": 0.001}),
+            (CpuSpinComponent, {"duration": 0.001}),
+            (AllocateComponent, {"megabytes": 1}),
+            (MatmulComponent, {"size": 8, "repeat": 2}),
+        ]:
+            component = component_class("test", dict(definition, **parameters))
+            outputs = component.process({"document_id": "D0"})
+            self.assertEqual(outputs["document_id"], "D0")
+            self.assertIn("value", outputs)
+
+    def test_synthetic_load_is_abstract(self):
+        class NoLoadComponent(SyntheticComponent):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoLoadComponent("test", {"inputs": ["document_id"], "outputs": ["value"]})
+
+    def test_batch_runtime_per_record(self):
+        history = RuntimeHistory()
+        component = SleepComponent("sleep", {"inputs": ["x"], "outputs": ["value"], "duration": 0.02})
+        pipeline = Pipeline("test", set(["x"]), set(["sleep.value"]), {"sleep": component}, ["sleep"], SequentialExecutor(history))
+        pipeline.execute_batch([{"x": i} for i in range(10)])
+        # the batch took ten sleeps, the history expects the duration of one record
+        self.assertLess(history.get("SleepComponent"), 0.1)
+
+    def test_execute_batch(self):
+        pipeline_builder = PipelineBuilder("mlpipeline.custom")
+        pipeline = pipeline_builder.build_pipeline("data/pipeline_2.yaml")
+        outputs = pipeline.execute_batch([{"document_id": i, "page_num": 0} for i in range(5)])
+        self.assertEqual(len(outputs), 5)
+        self.assertTrue(all(set(record.keys()) == set(["test_processor_5.output_5"]) for record in outputs))
+
+        with self.assertRaises(RuntimeError):
+            pipeline.execute_batch([{"document_id": 0}])
@@ -0,0 +1,55 @@
+import os
+import unittest
+from mlpipeline.pipeline import Component, Pipeline, PipelineBuilder, PipelineWorkerPool, ParallelExecutor
+from mlpipeline.pipeline import worker_pool
+
+
+class TestWorkerPool(unittest.TestCase):
+    def test_map(self):
+        pipeline_builder = PipelineBuilder("mlpipeline.custom", ParallelExecutor(2))
+        pipeline = pipeline_builder.build_pipeline("data/pipeline_2.yaml")
+        inputs_list = [{"document_id": i, "page_num": 0} for i in range(6)]
+
+        for start_method in ["fork", "forkserver"]:
+            with PipelineWorkerPool(pipeline, 2, start_method) as pool:
+                pool.wait_ready()
+                outputs = pool.map(inputs_list)
+                self.assertEqual(len(outputs), 6)
+                self.assertTrue(all(set(record.keys()) == set(["test_processor_5.output_5"]) for record in outputs))
+                self.assertEqual(set(pool.submit(inputs_list[0]).get(timeout=30).keys()), set(["test_processor_5.output_5"]))
+            # the parent doesn't keep the pipeline of the workers
+            self.assertIsNone(worker_pool._worker_pipeline)
+
+    def test_snapshot(self):
+        component = WorkerComponent("worker", {"inputs": ["x"], "outputs": ["pid", "value"]})
+        pipeline = Pipeline("test", set(["x"]), set(["worker.pid", "worker.value"]), {"worker": component}, ["worker"])
+        # state set after the build reaches the workers with the pipeline
+        component.value = 42
+
+        for start_method in ["fork", "forkserver"]:
+            with PipelineWorkerPool(pipeline, 2, start_method) as pool:
+                pool.wait_ready()
+                outputs = pool.map([{"x": i} for i in range(4)])
+            self.assertTrue(all(record["worker.value"] == 42 for record in outputs))
+            self.assertNotIn(os.getpid(), set(record["worker.pid"] for record in outputs))
+
+    def test_failed_initializer(self):
+        component = BrokenComponent("broken", {"inputs": ["x"], "outputs": ["pid", "value"]})
+        pipeline = Pipeline("test", set(["x"]), set(["broken.value"]), {"broken": component}, ["broken"])
+        with PipelineWorkerPool(pipeline, 1, "forkserver") as pool:
+            with self.assertRaises(RuntimeError):
+                pool.wait_ready(timeout=30)
+            with self.assertRaises(RuntimeError):
+                pool.map([{"x": 0}])
+
+
+class WorkerComponent(Component):
+    value = None
+
+    def process(self, inputs: dict) -> dict:
+        return {"pid": os.getpid(), "value": self.value}
+
+
+class BrokenComponent(WorkerComponent):
+    def __setstate__(self, state):
+        raise ValueError("snapshot can't be restored")